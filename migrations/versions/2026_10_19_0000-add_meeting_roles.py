@@ -0,0 +1,82 @@
+"""add mentor_id/student_id to meetings
+
+Revision ID: add_meeting_roles
+Revises: add_meeting_survey, add_calls
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_meeting_roles"
+down_revision: Union[str, Sequence[str], None] = ("add_meeting_survey", "add_calls")
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "meetings",
+        sa.Column(
+            "mentor_id",
+            sa.BigInteger(),
+            sa.ForeignKey("users.telegram_id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "meetings",
+        sa.Column(
+            "student_id",
+            sa.BigInteger(),
+            sa.ForeignKey("users.telegram_id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+
+    # backfill from participants: by role first, then "the other participant" as the student
+    op.execute(
+        """
+        UPDATE meetings AS m
+        SET mentor_id = mu.user_id
+        FROM meeting_users AS mu
+        JOIN users AS u ON u.telegram_id = mu.user_id
+        WHERE mu.meeting_id = m.id AND u.role = 'mentor'
+        """
+    )
+    op.execute(
+        """
+        UPDATE meetings AS m
+        SET student_id = mu.user_id
+        FROM meeting_users AS mu
+        JOIN users AS u ON u.telegram_id = mu.user_id
+        WHERE mu.meeting_id = m.id AND u.role = 'student'
+        """
+    )
+    op.execute(
+        """
+        UPDATE meetings AS m
+        SET student_id = mu.user_id
+        FROM meeting_users AS mu
+        WHERE mu.meeting_id = m.id
+          AND m.student_id IS NULL
+          AND m.mentor_id IS NOT NULL
+          AND mu.user_id <> m.mentor_id
+        """
+    )
+
+    op.create_index("ix_meetings_mentor_id", "meetings", ["mentor_id"])
+    op.create_index("ix_meetings_student_id", "meetings", ["student_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_meetings_student_id", table_name="meetings")
+    op.drop_index("ix_meetings_mentor_id", table_name="meetings")
+    op.drop_column("meetings", "student_id")
+    op.drop_column("meetings", "mentor_id")
@@ -0,0 +1,35 @@
+"""index meetings by owner and scheduled_at
+
+Revision ID: add_meeting_schedule_indexes
+Revises: add_meeting_roles
+Create Date: 2026-10-19 01:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_meeting_schedule_indexes"
+down_revision: Union[str, Sequence[str], None] = "add_meeting_roles"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # composite indexes cover the owner filter, the scheduled_at range and the keyset order
+    op.drop_index("ix_meetings_mentor_id", table_name="meetings")
+    op.drop_index("ix_meetings_student_id", table_name="meetings")
+    op.create_index("ix_meetings_mentor_schedule", "meetings", ["mentor_id", "scheduled_at", "id"])
+    op.create_index("ix_meetings_student_schedule", "meetings", ["student_id", "scheduled_at", "id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_meetings_student_schedule", table_name="meetings")
+    op.drop_index("ix_meetings_mentor_schedule", table_name="meetings")
+    op.create_index("ix_meetings_mentor_id", "meetings", ["mentor_id"])
+    op.create_index("ix_meetings_student_id", "meetings", ["student_id"])
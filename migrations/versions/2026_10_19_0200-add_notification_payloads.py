@@ -0,0 +1,54 @@
+"""store broadcast texts once in notification_payloads
+
+Revision ID: add_notification_payloads
+Revises: add_meeting_schedule_indexes
+Create Date: 2026-10-19 02:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_notification_payloads"
+down_revision: Union[str, Sequence[str], None] = "add_meeting_schedule_indexes"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "notification_payloads",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("content_hash", sa.String(length=64), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("content_hash"),
+    )
+    op.add_column("notifications", sa.Column("payload_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "notifications_payload_id_fkey", "notifications", "notification_payloads", ["payload_id"], ["id"],
+    )
+    op.create_index("ix_notifications_payload_id", "notifications", ["payload_id"])
+    op.alter_column("notifications", "text", existing_type=sa.Text(), nullable=True)
+    op.create_check_constraint(
+        "ck_notifications_text_or_payload", "notifications", "text IS NOT NULL OR payload_id IS NOT NULL",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        "UPDATE notifications n SET text = p.text "
+        "FROM notification_payloads p WHERE n.payload_id = p.id AND n.text IS NULL"
+    )
+    op.drop_constraint("ck_notifications_text_or_payload", "notifications", type_="check")
+    op.alter_column("notifications", "text", existing_type=sa.Text(), nullable=False)
+    op.drop_index("ix_notifications_payload_id", table_name="notifications")
+    op.drop_constraint("notifications_payload_id_fkey", "notifications", type_="foreignkey")
+    op.drop_column("notifications", "payload_id")
+    op.drop_table("notification_payloads")
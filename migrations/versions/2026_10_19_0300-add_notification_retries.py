@@ -0,0 +1,53 @@
+"""notification retries, dead letters and user reachability
+
+Revision ID: add_notification_retries
+Revises: add_notification_payloads
+Create Date: 2026-10-19 03:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_notification_retries"
+down_revision: Union[str, Sequence[str], None] = "add_notification_payloads"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("notifications", sa.Column("attempts", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("notifications", sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("notifications", sa.Column("last_error", sa.Text(), nullable=True))
+
+    op.create_table(
+        "notification_dead_letters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("notification_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("scheduled_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("failed_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_notification_dead_letters_user_id", "notification_dead_letters", ["user_id"],
+    )
+
+    op.add_column("users", sa.Column("is_reachable", sa.Boolean(), server_default="true", nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "is_reachable")
+    op.drop_index("ix_notification_dead_letters_user_id", table_name="notification_dead_letters")
+    op.drop_table("notification_dead_letters")
+    op.drop_column("notifications", "last_error")
+    op.drop_column("notifications", "next_attempt_at")
+    op.drop_column("notifications", "attempts")
@@ -0,0 +1,42 @@
+"""user reachability reason and partial indexes
+
+Revision ID: add_user_reachability
+Revises: add_notification_retries
+Create Date: 2026-10-19 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_user_reachability"
+down_revision: Union[str, Sequence[str], None] = "add_notification_retries"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("unreachable_reason", sa.String(length=32), nullable=True))
+    op.add_column("users", sa.Column("reachability_changed_at", sa.DateTime(timezone=True), nullable=True))
+    op.create_index(
+        "ix_users_cohort_reachable", "users", ["cohort_id"], postgresql_where=sa.text("is_reachable"),
+    )
+    op.create_index(
+        "ix_users_state_reachable", "users", ["state", "state_changed_at"], postgresql_where=sa.text("is_reachable"),
+    )
+    op.create_index(
+        "ix_users_unreachable", "users", ["telegram_id"], postgresql_where=sa.text("NOT is_reachable"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_users_unreachable", table_name="users")
+    op.drop_index("ix_users_state_reachable", table_name="users")
+    op.drop_index("ix_users_cohort_reachable", table_name="users")
+    op.drop_column("users", "reachability_changed_at")
+    op.drop_column("users", "unreachable_reason")
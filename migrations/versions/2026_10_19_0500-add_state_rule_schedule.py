@@ -0,0 +1,80 @@
+"""state-rule notifications scheduled per user on state transitions
+
+Revision ID: add_state_rule_schedule
+Revises: add_user_reachability
+Create Date: 2026-10-19 05:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_state_rule_schedule"
+down_revision: Union[str, Sequence[str], None] = "add_user_reachability"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "notifications",
+        sa.Column(
+            "state_rule_id",
+            sa.Integer(),
+            sa.ForeignKey("state_rules.id", ondelete="CASCADE"),
+            nullable=True,
+        ),
+    )
+    op.create_index("ix_notifications_state_rule_id", "notifications", ["state_rule_id"])
+    op.create_index(
+        "ix_notifications_user_state_rule",
+        "notifications",
+        ["user_id"],
+        postgresql_where=sa.text("state_rule_id IS NOT NULL"),
+    )
+
+    # the tick no longer scans users by state: schedule the next run of every rule for
+    # the users already in its state, where the old throttle would have fired it
+    op.execute(
+        """
+        INSERT INTO notification_payloads (content_hash, text)
+        SELECT DISTINCT encode(sha256(convert_to(text, 'UTF8')), 'hex'), text
+        FROM state_rules
+        ON CONFLICT (content_hash) DO NOTHING
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO notifications (user_id, payload_id, state_rule_id, scheduled_at)
+        SELECT
+            u.telegram_id,
+            p.id,
+            r.id,
+            greatest(
+                u.state_changed_at + make_interval(days => coalesce(r.offset_days, 0)),
+                r.last_sent_at + CASE r.regularity
+                    WHEN 'day' THEN interval '1 day'
+                    WHEN 'week' THEN interval '7 days'
+                    WHEN 'fortnight' THEN interval '14 days'
+                    WHEN 'month' THEN interval '30 days'
+                END,
+                now()
+            )
+        FROM state_rules r
+        JOIN notification_payloads p ON p.content_hash = encode(sha256(convert_to(r.text, 'UTF8')), 'hex')
+        JOIN users u ON u.state = r.user_state
+        WHERE u.state_changed_at IS NOT NULL AND u.is_reachable
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM notifications WHERE state_rule_id IS NOT NULL")
+    op.drop_index("ix_notifications_user_state_rule", table_name="notifications")
+    op.drop_index("ix_notifications_state_rule_id", table_name="notifications")
+    op.drop_column("notifications", "state_rule_id")
@@ -0,0 +1,69 @@
+"""notification priority lanes
+
+Revision ID: add_notification_priority
+Revises: add_state_rule_schedule
+Create Date: 2026-10-19 06:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_notification_priority"
+down_revision: Union[str, Sequence[str], None] = "add_state_rule_schedule"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    priority_enum = postgresql.ENUM(
+        "transactional",
+        "bulk",
+        name="notification_priority_enum",
+        create_type=False,
+    )
+    priority_enum.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "notifications",
+        sa.Column(
+            "priority",
+            priority_enum,
+            server_default="bulk",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "notification_dead_letters",
+        sa.Column(
+            "priority",
+            priority_enum,
+            server_default="bulk",
+            nullable=False,
+        ),
+    )
+    # survey prompts are the only transactional rows written so far
+    op.execute(
+        """
+        UPDATE notifications SET priority = 'transactional'
+        WHERE text LIKE '<b>Созвон завершён.</b>%'
+        """
+    )
+    op.create_index(
+        "ix_notifications_transactional_due",
+        "notifications",
+        ["scheduled_at"],
+        postgresql_where=sa.text("priority = 'transactional'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_notifications_transactional_due", table_name="notifications")
+    op.drop_column("notification_dead_letters", "priority")
+    op.drop_column("notifications", "priority")
+    op.execute("DROP TYPE IF EXISTS notification_priority_enum")
@@ -0,0 +1,40 @@
+"""cohort rule delivery window and quiet hours
+
+Revision ID: add_cohort_rule_delivery_window
+Revises: add_notification_priority
+Create Date: 2026-10-19 07:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_cohort_rule_delivery_window"
+down_revision: Union[str, Sequence[str], None] = "add_notification_priority"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("cohort_rules", sa.Column("delivery_window_minutes", sa.Integer(), nullable=True))
+    op.add_column("cohort_rules", sa.Column("quiet_hours_start", sa.SmallInteger(), nullable=True))
+    op.add_column("cohort_rules", sa.Column("quiet_hours_end", sa.SmallInteger(), nullable=True))
+    op.create_check_constraint(
+        "ck_cohort_rules_quiet_hours",
+        "cohort_rules",
+        "(quiet_hours_start IS NULL) = (quiet_hours_end IS NULL)"
+        " AND quiet_hours_start BETWEEN 0 AND 23 AND quiet_hours_end BETWEEN 0 AND 23"
+        " AND quiet_hours_start <> quiet_hours_end",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint("ck_cohort_rules_quiet_hours", "cohort_rules", type_="check")
+    op.drop_column("cohort_rules", "quiet_hours_end")
+    op.drop_column("cohort_rules", "quiet_hours_start")
+    op.drop_column("cohort_rules", "delivery_window_minutes")
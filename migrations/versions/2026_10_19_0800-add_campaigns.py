@@ -0,0 +1,86 @@
+"""one-off broadcast campaigns
+
+Revision ID: add_campaigns
+Revises: add_cohort_rule_delivery_window
+Create Date: 2026-10-19 08:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "add_campaigns"
+down_revision: Union[str, Sequence[str], None] = "add_cohort_rule_delivery_window"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    status_enum = postgresql.ENUM(
+        "running",
+        "finished",
+        "cancelled",
+        name="campaign_status_enum",
+        create_type=False,
+    )
+    status_enum.create(op.get_bind(), checkfirst=True)
+    op.create_table(
+        "campaigns",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=True),
+        sa.Column("text", sa.Text(), nullable=False),
+        sa.Column("cohort_id", sa.BigInteger(), nullable=True),
+        sa.Column("author_id", sa.BigInteger(), nullable=True),
+        sa.Column("status", status_enum, server_default="running", nullable=False),
+        sa.Column("recipients", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("queued", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("sent", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("failed", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("blocked", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("dropped", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("progress_chat_id", sa.BigInteger(), nullable=True),
+        sa.Column("progress_message_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["cohort_id"], ["cohorts.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["author_id"], ["users.telegram_id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.add_column("notifications", sa.Column("campaign_id", sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        "notifications_campaign_id_fkey",
+        "notifications",
+        "campaigns",
+        ["campaign_id"],
+        ["id"],
+        ondelete="CASCADE",
+    )
+    op.create_index(
+        "ix_notifications_campaign",
+        "notifications",
+        ["campaign_id"],
+        postgresql_where=sa.text("campaign_id IS NOT NULL"),
+    )
+    op.add_column("notification_dead_letters", sa.Column("campaign_id", sa.Integer(), nullable=True))
+    op.create_index(
+        "ix_notification_dead_letters_campaign",
+        "notification_dead_letters",
+        ["campaign_id"],
+        postgresql_where=sa.text("campaign_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_notification_dead_letters_campaign", table_name="notification_dead_letters")
+    op.drop_column("notification_dead_letters", "campaign_id")
+    op.drop_index("ix_notifications_campaign", table_name="notifications")
+    op.drop_constraint("notifications_campaign_id_fkey", "notifications", type_="foreignkey")
+    op.drop_column("notifications", "campaign_id")
+    op.drop_table("campaigns")
+    op.execute("DROP TYPE IF EXISTS campaign_status_enum")
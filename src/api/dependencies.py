@@ -1,5 +1,19 @@
+from typing import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import async_session_maker
 from src.services.survey import SurveyService
 
+# SurveyService is stateless, one instance is shared by all requests.
+survey_service = SurveyService()
+
 
 async def get_survey_service() -> SurveyService:
-    return SurveyService()
+    return survey_service
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """One session per request; routes that write commit it themselves."""
+    async with async_session_maker() as session:
+        yield session
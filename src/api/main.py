@@ -1,6 +1,43 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
+from src.api.routes.health import router as health_router
 from src.api.routes.survey import router as survey_router
+from src.core.config import settings
+from src.core.database import engine, warm_up_pool
+
+logger = logging.getLogger(__name__)
+
+WARMUP_RETRY_SECONDS = 5
+
+
+async def _warm_up_until_ready(app: FastAPI) -> None:
+    while True:
+        try:
+            warmed = await warm_up_pool(engine, settings.DB_POOL_WARMUP)
+        except Exception:  # noqa: BLE001
+            logger.exception("DB pool warm-up failed, retrying in %ss", WARMUP_RETRY_SECONDS)
+            await asyncio.sleep(WARMUP_RETRY_SECONDS)
+            continue
+        app.state.db_ready = True
+        logger.info("DB pool warmed up: connections=%s", warmed)
+        return
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.db_ready = False
+    warmup = asyncio.create_task(_warm_up_until_ready(app))
+    try:
+        yield
+    finally:
+        warmup.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup
+        await engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -8,8 +45,11 @@ def create_app() -> FastAPI:
         title="Golubator Backend API",
         version="0.1.0",
         description="API для опроса после завершения созвона",
+        lifespan=lifespan,
     )
+    app.state.db_ready = False
     app.include_router(survey_router)
+    app.include_router(health_router)
     return app
 
 
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, HTTPException, Request, status
+
+from src.api.schemas.health import PoolStatsResponse, ProbeResponse
+from src.core.database import engine, pool_status
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live", response_model=ProbeResponse)
+async def liveness() -> ProbeResponse:
+    return ProbeResponse(status="ok")
+
+
+@router.get("/ready", response_model=ProbeResponse)
+async def readiness(request: Request) -> ProbeResponse:
+    if not getattr(request.app.state, "db_ready", False):
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Пул БД ещё не прогрет")
+    return ProbeResponse(status="ready")
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+async def get_pool_stats() -> PoolStatsResponse:
+    return PoolStatsResponse(**pool_status(engine))
@@ -3,11 +3,14 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, Path, status
 from sqlalchemy.exc import DataError, OperationalError, ProgrammingError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.dependencies import get_survey_service
+from src.api.dependencies import get_db_session, get_survey_service
 from src.api.schemas.survey import (
     SurveyAnswer,
     SurveyStateResponse,
+    SurveyStatusBatchRequest,
+    SurveyStatusBatchResponse,
     SurveySubmitRequest,
     SurveySubmitResponse,
 )
@@ -40,9 +43,10 @@ else:
 async def get_call_survey(
     call_id: CallIdPath,
     service: SurveyService = Depends(get_survey_service),
+    session: AsyncSession = Depends(get_db_session),
 ) -> SurveyStateResponse:
     try:
-        state, response = await service.get_survey_state(call_id)
+        state, response = await service.get_survey_state(call_id, session=session)
     except CallNotFoundError as exc:
         logger.info("Survey call not found: call_id=%s", call_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Созвон не найден") from exc
@@ -69,9 +73,15 @@ async def submit_call_survey(
     call_id: CallIdPath,
     payload: SurveySubmitRequest,
     service: SurveyService = Depends(get_survey_service),
+    session: AsyncSession = Depends(get_db_session),
 ) -> SurveySubmitResponse:
     try:
-        response, already_submitted = await service.submit_survey(call_id=call_id, payload=payload)
+        response, already_submitted = await service.submit_survey(
+            call_id=call_id,
+            payload=payload,
+            session=session,
+        )
+        await session.commit()
     except CallNotFoundError as exc:
         logger.info("Survey submit call not found: call_id=%s", call_id)
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Созвон не найден") from exc
@@ -102,3 +112,25 @@ async def submit_call_survey(
         already_submitted=already_submitted,
         response=SurveyAnswer.model_validate(response),
     )
+
+
+@router.post("/survey-status:batch", response_model=SurveyStatusBatchResponse)
+async def get_call_survey_statuses(
+    payload: SurveyStatusBatchRequest,
+    service: SurveyService = Depends(get_survey_service),
+    session: AsyncSession = Depends(get_db_session),
+) -> SurveyStatusBatchResponse:
+    call_ids = list(dict.fromkeys(payload.call_ids))
+    try:
+        statuses = await service.get_survey_statuses(call_ids, session=session)
+    except DB_ERRORS as exc:
+        logger.exception("Survey batch status DB error: count=%s", len(call_ids))
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Сервис временно недоступен",
+        ) from exc
+
+    return SurveyStatusBatchResponse(
+        statuses=statuses,
+        not_found=[call_id for call_id in call_ids if call_id not in statuses],
+    )
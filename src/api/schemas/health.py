@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+
+
+class PoolStatsResponse(BaseModel):
+    size: int
+    max_overflow: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+
+
+class ProbeResponse(BaseModel):
+    status: str
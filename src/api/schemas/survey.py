@@ -1,11 +1,13 @@
 from datetime import datetime
 from enum import Enum
-from typing import Literal, Optional
+from typing import Annotated, Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
 from src.survey.constants import DurationOption
 
+MAX_BATCH_CALL_IDS = 100
+
 
 class SurveyStatus(str, Enum):
     not_available = "not_available"
@@ -60,3 +62,15 @@ class SurveySubmitResponse(BaseModel):
     call_id: int
     already_submitted: bool
     response: SurveyAnswer
+
+
+class SurveyStatusBatchRequest(BaseModel):
+    call_ids: list[Annotated[int, Field(ge=1, le=2147483647)]] = Field(
+        min_length=1,
+        max_length=MAX_BATCH_CALL_IDS,
+    )
+
+
+class SurveyStatusBatchResponse(BaseModel):
+    statuses: dict[int, SurveyStatus]
+    not_found: list[int]
@@ -0,0 +1,144 @@
+from dataclasses import dataclass
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# bench users live far above real Telegram ids handed out so far
+BASE_ID = 9_000_000_000
+
+TABLES = (
+    "notification_dead_letters",
+    "notifications",
+    "notification_payloads",
+    "meeting_users",
+    "meetings",
+    "user_rules",
+    "state_rules",
+    "cohort_rules",
+    "users",
+    "cohorts",
+)
+
+
+@dataclass(frozen=True)
+class Dataset:
+    users: int
+    cohorts: int
+    user_rules: int
+    meetings_per_user: int = 2
+    students_per_mentor: int = 20
+    unreachable_ratio: float = 0.01
+
+    @property
+    def mentors(self) -> int:
+        return max(1, self.users // self.students_per_mentor)
+
+
+PRESETS = {
+    "1k": Dataset(users=1_000, cohorts=5, user_rules=100),
+    "10k": Dataset(users=10_000, cohorts=20, user_rules=1_000),
+    "100k": Dataset(users=100_000, cohorts=50, user_rules=10_000),
+}
+
+
+async def seed(session: AsyncSession, dataset: Dataset) -> None:
+    """
+    Wipe the bot tables and fill them server-side with generate_series.
+    Students are spread over states, cohorts and mentors round-robin; half of the
+    meetings are in the past and not completed, so the stale cleanup has work to do.
+    """
+    params = {
+        "base": BASE_ID,
+        "mentors": dataset.mentors,
+        "users": dataset.users,
+        "cohorts": dataset.cohorts,
+        "user_rules": dataset.user_rules,
+        "meetings": dataset.meetings_per_user,
+        "unreachable": int(dataset.unreachable_ratio * 1000),
+    }
+
+    await session.execute(text(f"TRUNCATE {', '.join(TABLES)} RESTART IDENTITY CASCADE"))
+
+    await session.execute(text(
+        "INSERT INTO cohorts (name) SELECT 'bench-' || g FROM generate_series(1, :cohorts) g"
+    ), params)
+
+    await session.execute(text(
+        """
+        INSERT INTO users (telegram_id, username, name, role, state, registered_at)
+        VALUES (:base, 'bench_admin', 'Bench Admin', 'admin', NULL, now())
+        """
+    ), params)
+    await session.execute(text(
+        """
+        INSERT INTO users (telegram_id, username, name, role, state, registered_at)
+        SELECT :base + g, 'bench_mentor_' || g, 'Mentor ' || g, 'mentor', NULL, now()
+        FROM generate_series(1, :mentors) g
+        """
+    ), params)
+    await session.execute(text(
+        """
+        INSERT INTO users (
+            telegram_id, username, name, role, state, state_changed_at,
+            cohort_id, mentor_id, registered_at, is_reachable
+        )
+        SELECT
+            :base + :mentors + g,
+            'bench_student_' || g,
+            'Student ' || g,
+            'student',
+            (enum_range(NULL::state_enum))[1 + g % 5],
+            now() - make_interval(days => g % 30),
+            1 + g % :cohorts,
+            :base + 1 + g % :mentors,
+            now() - make_interval(days => g % 90),
+            g % 1000 >= :unreachable
+        FROM generate_series(1, :users) g
+        """
+    ), params)
+
+    await session.execute(text(
+        """
+        INSERT INTO user_rules (user_id, name, text, regularity, author_id)
+        SELECT :base + :mentors + g, 'bench', 'Personal reminder #' || g, 'day', :base
+        FROM generate_series(1, least(:user_rules, :users)) g
+        """
+    ), params)
+    await session.execute(text(
+        """
+        INSERT INTO state_rules (user_state, name, text, regularity, author_id, offset_days)
+        SELECT s, 'bench', 'State reminder: ' || s, 'day', :base, 7
+        FROM unnest(enum_range(NULL::state_enum)) s
+        """
+    ), params)
+    await session.execute(text(
+        """
+        INSERT INTO cohort_rules (cohort_id, name, text, regularity, author_id)
+        SELECT c.id, 'bench', 'Cohort news for ' || c.name, 'day', :base
+        FROM cohorts c
+        """
+    ), params)
+
+    await session.execute(text(
+        """
+        INSERT INTO meetings (description, scheduled_at, mentor_id, student_id)
+        SELECT
+            'Bench meeting',
+            now() + make_interval(days => CASE WHEN k % 2 = 0 THEN k ELSE -k END),
+            u.mentor_id,
+            u.telegram_id
+        FROM users u
+        CROSS JOIN generate_series(1, :meetings) k
+        WHERE u.role = 'student'
+        """
+    ), params)
+    await session.execute(text(
+        """
+        INSERT INTO meeting_users (meeting_id, user_id)
+        SELECT id, mentor_id FROM meetings
+        UNION ALL
+        SELECT id, student_id FROM meetings
+        """
+    ))
+
+    await session.execute(text(f"ANALYZE {', '.join(TABLES)}"))
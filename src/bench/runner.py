@@ -0,0 +1,154 @@
+import math
+import random
+import resource
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from sqlalchemy import text
+
+from src.core.database import async_session_maker
+from src.core.query_stats import track_queries
+from src.dao.meeting import MeetingDAO
+from src.dao.notification import NotificationDAO
+from src.tasks.meeting import _cleanup_stale_async
+from src.tasks.notification import _generate_notifications, _send_due_notifications
+from src.utils.transport import RecordingTransport, TelegramTransport, set_transport_factory
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def peak_rss_kb() -> int:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def summarize(name: str, durations: list[float], queries: list[int], rows: list[int]) -> dict:
+    total_seconds = sum(durations)
+    return {
+        "name": name,
+        "samples": len(durations),
+        "p50_ms": round(percentile(durations, 50) * 1000, 3),
+        "p99_ms": round(percentile(durations, 99) * 1000, 3),
+        "mean_ms": round(total_seconds / len(durations) * 1000, 3) if durations else 0.0,
+        "queries": round(sum(queries) / len(queries), 1) if queries else 0,
+        "rows": sum(rows),
+        "rows_per_sec": round(sum(rows) / total_seconds, 1) if total_seconds else 0.0,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+async def _execute(*statements: str) -> None:
+    # asyncpg prepares every statement, so they go one by one
+    async with async_session_maker() as session:
+        for sql in statements:
+            await session.execute(text(sql))
+        await session.commit()
+
+
+async def _scalar(sql: str) -> int:
+    async with async_session_maker() as session:
+        return (await session.execute(text(sql))).scalar_one()
+
+
+async def _scalars(sql: str) -> list:
+    async with async_session_maker() as session:
+        return list((await session.execute(text(sql))).scalars().all())
+
+
+async def _measure(
+    name: str,
+    iterations: int,
+    setup: Callable[[], Awaitable[None]],
+    run: Callable[[], Awaitable[None]],
+    count: Callable[[], Awaitable[int]],
+) -> dict:
+    """Time `run` after an untimed `setup`; `count` before/after gives the rows it processed."""
+    durations, queries, rows = [], [], []
+    for _ in range(iterations):
+        await setup()
+        before = await count()
+        with track_queries() as stats:
+            started = time.perf_counter()
+            await run()
+            durations.append(time.perf_counter() - started)
+        queries.append(stats.queries)
+        rows.append(abs(await count() - before))
+    return summarize(name, durations, queries, rows)
+
+
+async def _reset_notifications() -> None:
+    await _execute(
+        "UPDATE user_rules SET last_sent_at = NULL",
+        "UPDATE cohort_rules SET last_sent_at = NULL",
+        "TRUNCATE notification_dead_letters, notifications, notification_payloads",
+    )
+    # state-rule notifications are scheduled on transitions, not by the tick: put them back
+    async with async_session_maker() as session:
+        await NotificationDAO.schedule_state_rules(now=datetime.now(timezone.utc), session=session)
+        await session.commit()
+
+
+async def _count_notifications() -> int:
+    return await _scalar("SELECT count(*) FROM notifications")
+
+
+async def bench_generate(iterations: int) -> dict:
+    return await _measure(
+        "generate_notifications", iterations, _reset_notifications, _generate_notifications, _count_notifications,
+    )
+
+
+async def bench_send(iterations: int, api_url: str | None = None) -> dict:
+    async def setup() -> None:
+        await _reset_notifications()
+        await _generate_notifications()
+
+    if api_url:
+        set_transport_factory(lambda: TelegramTransport(api_url=api_url))
+    else:
+        set_transport_factory(RecordingTransport)
+    try:
+        return await _measure("send_due_notifications", iterations, setup, _send_due_notifications, _count_notifications)
+    finally:
+        set_transport_factory(None)
+
+
+async def bench_cleanup(iterations: int) -> dict:
+    async def setup() -> None:
+        await _execute(
+            "UPDATE meetings SET completed_at = NULL, survey_available_at = NULL WHERE scheduled_at <= now()",
+            "TRUNCATE notifications",
+        )
+
+    async def count() -> int:
+        return await _scalar("SELECT count(*) FROM meetings WHERE completed_at IS NULL")
+
+    return await _measure("cleanup_stale_meetings", iterations, setup, _cleanup_stale_async, count)
+
+
+async def bench_meetings_for_user(lookups: int, seed: int = 0) -> dict:
+    """One sample per lookup: a random mentor or student's full meeting list."""
+    user_ids = await _scalars("SELECT telegram_id FROM users WHERE role IN ('mentor', 'student')")
+    rng = random.Random(seed)
+    durations, queries, rows = [], [], []
+    async with async_session_maker() as session:
+        for user_id in rng.choices(user_ids, k=lookups if user_ids else 0):
+            with track_queries() as stats:
+                started = time.perf_counter()
+                meetings = await MeetingDAO.get_for_user(user_id, session=session)
+                durations.append(time.perf_counter() - started)
+            queries.append(stats.queries)
+            rows.append(len(meetings))
+            session.expunge_all()
+    return summarize("meeting_get_for_user", durations, queries, rows)
+
+
+SCENARIOS = ("generate", "send", "cleanup", "meetings")
@@ -4,3 +4,8 @@ from aiogram.filters.callback_data import CallbackData
 class DeleteCohortCB(CallbackData, prefix="cohort_del"):
     cohort_id: int
 
+
+
+class CohortMembersCB(CallbackData, prefix="cohort_members"):
+    cohort_id: int
+    after_id: int = 0  # telegram_id of the last member shown, 0 for the first page
@@ -23,3 +23,9 @@ class NavigateMeetingMonthCB(CallbackData, prefix="meeting_nav"):
 
 class ChooseMeetingTimeCB(CallbackData, prefix="meeting_time"):
     t: str  # HHMM
+
+
+class MeetingsPageCB(CallbackData, prefix="meetings_page"):
+    as_mentor: bool
+    after_us: int  # scheduled_at of the last shown meeting, microseconds since epoch
+    after_id: int
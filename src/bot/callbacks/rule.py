@@ -24,6 +24,10 @@ class ChooseRegularityCB(CallbackData, prefix="mail_reg"):
     regularity: Regularity
 
 
+class ChooseDeliveryWindowCB(CallbackData, prefix="mail_window"):
+    minutes: int  # 0: as fast as the send budget allows
+
+
 class MailingFinishUsersCB(CallbackData, prefix="mail_finish_users"):
     done: bool
 
@@ -50,3 +54,11 @@ class ToggleDeleteCohortRuleCB(CallbackData, prefix="mail_del_cohort"):
 
 class DeleteMailingsFinishCB(CallbackData, prefix="mail_del_finish"):
     done: bool
+
+
+class CampaignCohortCB(CallbackData, prefix="campaign_cohort"):
+    cohort_id: int
+
+
+class CampaignCancelCB(CallbackData, prefix="campaign_cancel"):
+    campaign_id: int
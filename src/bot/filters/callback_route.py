@@ -0,0 +1,98 @@
+import operator
+from collections import defaultdict
+from typing import Iterable
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.filters import Filter
+from aiogram.filters.callback_data import CallbackQueryFilter
+from aiogram.types import CallbackQuery
+from magic_filter.operations import ComparatorOperation, GetAttributeOperation
+
+
+def _handler_key(handler: HandlerObject) -> tuple[str, str] | None:
+    """
+    ("", value) for F.data == value, (separator, prefix) for SomeCB.filter(),
+    None when the handler may accept any callback data.
+    """
+    for filter_object in handler.filters or ():
+        if isinstance(filter_object.callback, CallbackQueryFilter):
+            callback_data = filter_object.callback.callback_data
+            return callback_data.__separator__, callback_data.__prefix__
+        magic = filter_object.magic
+        if magic is None:
+            continue
+        operations = magic._operations
+        if (
+            len(operations) == 2
+            and isinstance(operations[0], GetAttributeOperation)
+            and operations[0].name == "data"
+            and isinstance(operations[1], ComparatorOperation)
+            and operations[1].comparator is operator.eq
+            and isinstance(operations[1].right, str)
+        ):
+            return "", operations[1].right
+    return None
+
+
+class CallbackRouteIndex:
+    """
+    Maps static callback data and CallbackData prefixes to the routers whose handlers
+    (their own or a nested router's) can accept them. Routers with a handler
+    that matches arbitrary data are owners of everything.
+    """
+
+    def __init__(self) -> None:
+        self.data: dict[str, set[Router]] = defaultdict(set)
+        # separator -> prefix -> routers
+        self.prefixes: dict[str, dict[str, set[Router]]] = defaultdict(lambda: defaultdict(set))
+        self.any: set[Router] = set()
+        self.routers: set[Router] = set()
+
+    def build(self, routers: Iterable[Router]) -> None:
+        self.data.clear()
+        self.prefixes.clear()
+        self.any.clear()
+        self.routers = set(routers)
+        for router in self.routers:
+            for nested in router.chain_tail:
+                for handler in nested.callback_query.handlers:
+                    key = _handler_key(handler)
+                    if key is None:
+                        self.any.add(router)
+                        continue
+                    separator, value = key
+                    if separator:
+                        self.prefixes[separator][value].add(router)
+                    else:
+                        self.data[value].add(router)
+
+    def owns(self, router: Router, data: str | None) -> bool:
+        if router not in self.routers or router in self.any:
+            return True
+        if data is None:
+            return False
+        if router in self.data.get(data, ()):
+            return True
+        for separator, owners in self.prefixes.items():
+            # a CallbackData without fields packs to the bare prefix
+            if router in owners.get(data.partition(separator)[0], ()):
+                return True
+        return False
+
+
+callback_routes = CallbackRouteIndex()
+
+
+class CallbackRouteFilter(Filter):
+    """
+    Router-level gate, registered before RoleFilter: a callback only enters the routers
+    that own its data, so the role lookup of every earlier router is skipped.
+    """
+
+    def __init__(self, router: Router, index: CallbackRouteIndex = callback_routes):
+        self.router = router
+        self.index = index
+
+    async def __call__(self, callback: CallbackQuery) -> bool:
+        return self.index.owns(self.router, callback.data)
@@ -1,6 +1,7 @@
 from typing import Sequence
 from aiogram.filters import BaseFilter
 from aiogram.types import Message, CallbackQuery
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.utils.auth import get_user_role
 from src.models.user import Role
@@ -10,9 +11,9 @@ class RoleFilter(BaseFilter):
     def __init__(self, allowed: Sequence[Role]):
         self.allowed = set(allowed)
 
-    async def __call__(self, event: Message | CallbackQuery) -> bool:
+    async def __call__(self, event: Message | CallbackQuery, session: AsyncSession | None = None) -> bool:
         user = event.from_user
 
-        role = await get_user_role(user.id)
+        role = await get_user_role(user.id, session)
 
         return role in self.allowed
@@ -2,7 +2,9 @@ from aiogram import F, Router
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.bot.filters.callback_route import CallbackRouteFilter
 from src.bot.filters.role import RoleFilter
 from src.bot.keyboards.cohort import cohort_cancel_keyboard
 from src.bot.keyboards.menu import back_to_menu_keyboard
@@ -13,7 +15,7 @@ from src.models.user import Role
 
 router = Router(name="cohort-create")
 router.message.filter(RoleFilter([Role.admin]))
-router.callback_query.filter(RoleFilter([Role.admin]))
+router.callback_query.filter(CallbackRouteFilter(router), RoleFilter([Role.admin]))
 
 
 @router.callback_query(F.data == "cohort_create")
@@ -27,7 +29,7 @@ async def start_create_cohort(callback: CallbackQuery, state: FSMContext):
 
 
 @router.message(StateFilter(CreateCohortFSM.waiting_name))
-async def process_cohort_name(message: Message, state: FSMContext):
+async def process_cohort_name(message: Message, state: FSMContext, session: AsyncSession):
     name = message.text.strip() if message.text else ""
 
     if not name:
@@ -37,7 +39,7 @@ async def process_cohort_name(message: Message, state: FSMContext):
         )
         return
 
-    cohort = await CohortDAO.add(name=name)
+    cohort = await CohortDAO.add(name=name, session=session)
     await state.clear()
 
     await message.answer(
@@ -1,7 +1,9 @@
 from aiogram import F, Router
 from aiogram.types import CallbackQuery
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.callbacks.cohort import DeleteCohortCB
+from src.bot.filters.callback_route import CallbackRouteFilter
 from src.bot.filters.role import RoleFilter
 from src.bot.keyboards.cohort import cohort_delete_keyboard
 from src.bot.keyboards.menu import back_to_menu_keyboard
@@ -10,14 +12,14 @@ from src.models.user import Role
 
 
 router = Router(name="cohort-delete")
-router.callback_query.filter(RoleFilter([Role.admin]))
+router.callback_query.filter(CallbackRouteFilter(router), RoleFilter([Role.admin]))
 
 
 @router.callback_query(F.data == "cohort_delete")
-async def start_delete_cohort(callback: CallbackQuery):
+async def start_delete_cohort(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
 
-    cohorts = await CohortDAO.get_all()
+    cohorts = await CohortDAO.get_summaries(session=session)
 
     if not cohorts:
         await callback.message.edit_text(
@@ -33,10 +35,10 @@ async def start_delete_cohort(callback: CallbackQuery):
 
 
 @router.callback_query(DeleteCohortCB.filter())
-async def delete_cohort(callback: CallbackQuery, callback_data: DeleteCohortCB):
+async def delete_cohort(callback: CallbackQuery, callback_data: DeleteCohortCB, session: AsyncSession):
     await callback.answer()
 
-    cohort = await CohortDAO.find_one_or_none(id=callback_data.cohort_id)
+    cohort = await CohortDAO.find_one_or_none(id=callback_data.cohort_id, session=session)
 
     if not cohort:
         await callback.message.edit_text(
@@ -45,7 +47,7 @@ async def delete_cohort(callback: CallbackQuery, callback_data: DeleteCohortCB):
         )
         return
 
-    await CohortDAO.delete(id=cohort.id)
+    await CohortDAO.delete(id=cohort.id, session=session)
 
     await callback.message.edit_text(
         f'Когорта "{cohort.name}" удалена.',
@@ -1,21 +1,26 @@
 from aiogram import F, Router
 from aiogram.types import CallbackQuery
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.bot.callbacks.cohort import CohortMembersCB
+from src.bot.filters.callback_route import CallbackRouteFilter
 from src.bot.filters.role import RoleFilter
+from src.bot.keyboards.cohort import cohort_list_keyboard, cohort_members_keyboard
 from src.bot.keyboards.menu import back_to_menu_keyboard
 from src.dao.cohort import CohortDAO
 from src.models.user import Role
 
+MEMBERS_PAGE_SIZE = 20
 
 router = Router(name="cohort-list")
-router.callback_query.filter(RoleFilter([Role.admin]))
+router.callback_query.filter(CallbackRouteFilter(router), RoleFilter([Role.admin]))
 
 
 @router.callback_query(F.data == "cohort_list")
-async def show_cohort_list(callback: CallbackQuery):
+async def show_cohort_list(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
 
-    cohorts = await CohortDAO.get_all()
+    cohorts = await CohortDAO.get_summaries(session=session)
 
     if not cohorts:
         await callback.message.edit_text(
@@ -26,10 +31,39 @@ async def show_cohort_list(callback: CallbackQuery):
 
     lines = ["<b>Список когорт:</b>", ""]
     for cohort in cohorts:
-        lines.append(f"• {cohort.name}")
+        lines.append(
+            f"• {cohort.name} — участников: {cohort.members}, "
+            f"активных студентов: {cohort.active_students}"
+        )
 
     await callback.message.edit_text(
         "\n".join(lines),
-        reply_markup=back_to_menu_keyboard(),
+        reply_markup=cohort_list_keyboard(cohorts),
     )
 
+
+@router.callback_query(CohortMembersCB.filter())
+async def show_cohort_members(callback: CallbackQuery, callback_data: CohortMembersCB, session: AsyncSession):
+    await callback.answer()
+
+    members = await CohortDAO.get_members(
+        callback_data.cohort_id,
+        after=callback_data.after_id or None,
+        limit=MEMBERS_PAGE_SIZE + 1,
+        session=session,
+    )
+    page = members[:MEMBERS_PAGE_SIZE]
+    next_page = None
+    if len(members) > MEMBERS_PAGE_SIZE:
+        next_page = CohortMembersCB(cohort_id=callback_data.cohort_id, after_id=page[-1].telegram_id)
+
+    if not page:
+        text = "В когорте нет участников."
+    else:
+        lines = ["<b>Участники когорты:</b>", ""]
+        for user in page:
+            state = user.state.value if user.state else "—"
+            lines.append(f"• {user.name} @{user.username} — {user.role.value}, {state}")
+        text = "\n".join(lines)
+
+    await callback.message.edit_text(text, reply_markup=cohort_members_keyboard(next_page))
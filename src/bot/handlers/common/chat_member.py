@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+from aiogram import F, Router
+from aiogram.filters import JOIN_TRANSITION, LEAVE_TRANSITION, ChatMemberUpdatedFilter
+from aiogram.types import ChatMemberUpdated
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dao.user import UserDAO
+
+router = Router(name="chat-member")
+router.my_chat_member.filter(F.chat.type == "private")
+
+
+@router.my_chat_member(ChatMemberUpdatedFilter(member_status_changed=LEAVE_TRANSITION))
+async def on_bot_blocked(event: ChatMemberUpdated, session: AsyncSession):
+    await UserDAO.mark_unreachable(
+        {event.from_user.id: "blocked"},
+        changed_at=event.date or datetime.now(timezone.utc),
+        session=session,
+    )
+
+
+@router.my_chat_member(ChatMemberUpdatedFilter(member_status_changed=JOIN_TRANSITION))
+async def on_bot_unblocked(event: ChatMemberUpdated, session: AsyncSession):
+    await UserDAO.mark_reachable(
+        event.from_user.id,
+        changed_at=event.date or datetime.now(timezone.utc),
+        session=session,
+    )
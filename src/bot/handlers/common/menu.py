@@ -3,7 +3,9 @@ from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.utils.keyboard import InlineKeyboardBuilder
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.bot.filters.callback_route import CallbackRouteFilter
 from src.bot.filters.role import RoleFilter
 from src.bot.keyboards.menu import menu_keyboard
 from src.bot.keyboards.mailings import mailings_menu_keyboard
@@ -17,7 +19,7 @@ from src.dao.call import CallDAO
 
 router = Router(name="menu")
 router.message.filter(RoleFilter([Role.admin, Role.mentor, Role.student]))
-router.callback_query.filter(RoleFilter([Role.admin, Role.mentor, Role.student]))
+router.callback_query.filter(CallbackRouteFilter(router), RoleFilter([Role.admin, Role.mentor, Role.student]))
 
 
 async def _render_menu(message_or_callback, role: Role):
@@ -35,8 +37,8 @@ async def _render_menu(message_or_callback, role: Role):
 
 
 @router.message(Command("menu"))
-async def cmd_menu(message: Message):
-    role = await get_user_role(message.from_user.id)
+async def cmd_menu(message: Message, session: AsyncSession):
+    role = await get_user_role(message.from_user.id, session)
     if not role:
         await message.answer("Доступ запрещен.")
         return
@@ -45,10 +47,10 @@ async def cmd_menu(message: Message):
 
 
 @router.callback_query(F.data == "back_to_menu")
-async def cb_menu(callback: CallbackQuery):
+async def cb_menu(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
 
-    role = await get_user_role(callback.from_user.id)
+    role = await get_user_role(callback.from_user.id, session)
     if not role:
         await callback.message.edit_text("Доступ запрещен.")
         return
@@ -57,7 +59,7 @@ async def cb_menu(callback: CallbackQuery):
 
 
 # ==== ADMIN ====
-@router.callback_query(RoleFilter([Role.admin]), F.data == "menu_users")
+@router.callback_query(F.data == "menu_users", RoleFilter([Role.admin]))
 async def cb_menu_users(callback: CallbackQuery):
     await callback.answer()
     try:
@@ -69,7 +71,7 @@ async def cb_menu_users(callback: CallbackQuery):
             raise
 
 
-@router.callback_query(RoleFilter([Role.admin]), F.data == "menu_cohorts")
+@router.callback_query(F.data == "menu_cohorts", RoleFilter([Role.admin]))
 async def cb_menu_cohorts(callback: CallbackQuery):
     await callback.answer()
     try:
@@ -81,7 +83,7 @@ async def cb_menu_cohorts(callback: CallbackQuery):
             raise
 
 
-@router.callback_query(RoleFilter([Role.admin]), F.data == "menu_mailings")
+@router.callback_query(F.data == "menu_mailings", RoleFilter([Role.admin]))
 async def cb_menu_mailings(callback: CallbackQuery):
     await callback.answer()
     try:
@@ -115,7 +117,7 @@ def _mentor_meetings_menu_kb():
     return kb.as_markup()
 
 
-@router.callback_query(RoleFilter([Role.mentor]), F.data == "mentor_students_menu")
+@router.callback_query(F.data == "mentor_students_menu", RoleFilter([Role.mentor]))
 async def cb_mentor_students_menu(callback: CallbackQuery):
     await callback.answer()
     try:
@@ -128,11 +130,11 @@ async def cb_mentor_students_menu(callback: CallbackQuery):
             raise
 
 
-@router.callback_query(RoleFilter([Role.mentor]), F.data == "mentor_students_list")
-async def cb_mentor_students_list(callback: CallbackQuery):
+@router.callback_query(F.data == "mentor_students_list", RoleFilter([Role.mentor]))
+async def cb_mentor_students_list(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
 
-    students = await UserDAO.get_all(mentor_id=callback.from_user.id)
+    students = await UserDAO.get_all(mentor_id=callback.from_user.id, session=session)
     if not students:
         try:
             await callback.message.edit_text(
@@ -164,7 +166,7 @@ async def cb_mentor_students_list(callback: CallbackQuery):
             raise
 
 
-@router.callback_query(RoleFilter([Role.mentor]), F.data == "mentor_students_add")
+@router.callback_query(F.data == "mentor_students_add", RoleFilter([Role.mentor]))
 async def cb_mentor_students_add(callback: CallbackQuery):
     await callback.answer()
     await callback.message.edit_text(
@@ -173,7 +175,7 @@ async def cb_mentor_students_add(callback: CallbackQuery):
     )
 
 
-@router.callback_query(RoleFilter([Role.mentor]), F.data == "mentor_meetings_menu")
+@router.callback_query(F.data == "mentor_meetings_menu", RoleFilter([Role.mentor]))
 async def cb_mentor_meetings_menu(callback: CallbackQuery):
     await callback.answer()
     await callback.message.edit_text(
@@ -182,11 +184,11 @@ async def cb_mentor_meetings_menu(callback: CallbackQuery):
     )
 
 
-@router.callback_query(RoleFilter([Role.mentor]), F.data == "mentor_end_call")
-async def cb_mentor_end_call(callback: CallbackQuery):
+@router.callback_query(F.data == "mentor_end_call", RoleFilter([Role.mentor]))
+async def cb_mentor_end_call(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
 
-    call = await CallDAO.get_active_for_mentor(callback.from_user.id)
+    call = await CallDAO.get_active_for_mentor(callback.from_user.id, session=session)
     if not call:
         try:
             await callback.message.edit_text(
@@ -198,7 +200,7 @@ async def cb_mentor_end_call(callback: CallbackQuery):
                 raise
         return
 
-    finished = await CallDAO.finish_call(call.id, callback.from_user.id)
+    finished = await CallDAO.finish_call(call.id, callback.from_user.id, session=session)
     if not finished:
         try:
             await callback.message.edit_text(
@@ -223,11 +225,11 @@ async def cb_mentor_end_call(callback: CallbackQuery):
             raise
 
 
-@router.callback_query(RoleFilter([Role.mentor]), F.data == "mentor_me_info")
-async def cb_mentor_me_info(callback: CallbackQuery):
+@router.callback_query(F.data == "mentor_me_info", RoleFilter([Role.mentor]))
+async def cb_mentor_me_info(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
 
-    mentors = await UserDAO.get_all(telegram_id=callback.from_user.id)
+    mentors = await UserDAO.get_all(telegram_id=callback.from_user.id, session=session)
     mentor = mentors[0] if mentors else None
     if not mentor:
         await callback.message.edit_text(
@@ -251,11 +253,11 @@ async def cb_mentor_me_info(callback: CallbackQuery):
 
 
 # ==== STUDENT ====
-@router.callback_query(RoleFilter([Role.student]), F.data == "student_me_info")
-async def cb_student_me_info(callback: CallbackQuery):
+@router.callback_query(F.data == "student_me_info", RoleFilter([Role.student]))
+async def cb_student_me_info(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
 
-    students = await UserDAO.get_all(telegram_id=callback.from_user.id)
+    students = await UserDAO.get_all(telegram_id=callback.from_user.id, session=session)
     student = students[0] if students else None
     if not student:
         await callback.message.edit_text(
@@ -1,13 +1,13 @@
 from aiogram import Router
 from aiogram.types import Message
 from aiogram.filters import CommandStart
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.dao.user import UserDAO
-from src.models.user import State, Role
 from datetime import datetime, timezone
 
 from src.core.config import settings
-from src.utils.onboarding import schedule_onboarding_notifications
+from src.utils.onboarding import STUDENT_ONBOARDING
 
 router = Router()
 
@@ -22,7 +22,7 @@ WELCOME_TEXT = (
 
 
 @router.message(CommandStart())
-async def cmd_start(message: Message):
+async def cmd_start(message: Message, session: AsyncSession):
     user = message.from_user
 
     user_id = user.id
@@ -31,22 +31,15 @@ async def cmd_start(message: Message):
 
     is_admin_username = username.lower() in settings.admin_usernames if username else False
 
-    existing_user = await UserDAO.find_one_or_none(telegram_id=user_id)
-
-    if not existing_user:
-        created_user = await UserDAO.add(
-            telegram_id=user_id,
-            username=user.username,
-            name=user.full_name,
-            role=Role.admin if is_admin_username else Role.student,
-            state=State.greeting,
-            registered_at=reg_time,
-        )
-        if created_user:
-            await schedule_onboarding_notifications(created_user, base_time=reg_time)
-    else:
-        # keep admin role in sync with env setting
-        if is_admin_username and existing_user.role != Role.admin:
-            await UserDAO.update(telegram_id=user_id, role=Role.admin)
+    # single round-trip: create the user with onboarding, or keep admin role in sync with env setting
+    await UserDAO.register(
+        telegram_id=user_id,
+        username=user.username,
+        name=user.full_name,
+        is_admin=is_admin_username,
+        registered_at=reg_time,
+        onboarding=STUDENT_ONBOARDING,
+        session=session,
+    )
 
     await message.answer(WELCOME_TEXT)
@@ -1,9 +1,13 @@
+from datetime import datetime, timezone
+
 from aiogram import Router, F
 from aiogram.filters import StateFilter
 from aiogram.types import CallbackQuery, Message
 from aiogram.exceptions import TelegramBadRequest
 from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.bot.filters.callback_route import CallbackRouteFilter
 from src.bot.filters.role import RoleFilter
 from src.bot.keyboards.mailings import (
     mailings_menu_keyboard,
@@ -12,7 +16,12 @@ from src.bot.keyboards.mailings import (
     select_states_keyboard,
     select_cohorts_keyboard,
     regularity_keyboard,
+    delivery_window_keyboard,
+    DELIVERY_WINDOWS,
     delete_mailings_keyboard,
+    campaign_cohorts_keyboard,
+    campaign_confirm_keyboard,
+    campaign_progress_keyboard,
 )
 from src.bot.keyboards.menu import back_to_menu_keyboard
 from src.bot.callbacks.rule import (
@@ -21,6 +30,7 @@ from src.bot.callbacks.rule import (
     ToggleStateCB,
     ToggleCohortCB,
     ChooseRegularityCB,
+    ChooseDeliveryWindowCB,
     MailingFinishUsersCB,
     MailingFinishStatesCB,
     MailingFinishCohortsCB,
@@ -28,18 +38,28 @@ from src.bot.callbacks.rule import (
     ToggleDeleteStateRuleCB,
     ToggleDeleteCohortRuleCB,
     DeleteMailingsFinishCB,
+    CampaignCohortCB,
+    CampaignCancelCB,
 )
 from src.bot.states.mailings import MailingFSM
+from src.core.config import settings
+from src.core.query_stats import query_budget
 from src.dao.user import UserDAO
 from src.dao.rule import RuleDAO
 from src.dao.cohort import CohortDAO
+from src.dao.campaign import CampaignDAO
+from src.models.campaign import CampaignStatus
 from src.models.user import Role, State
 from src.models.rule import Regularity
+from src.services.campaign import CampaignCounters, render_progress, stored_counts
 
 router = Router(name="mailings")
 router.message.filter(RoleFilter([Role.admin]))
-router.callback_query.filter(RoleFilter([Role.admin]))
+router.callback_query.filter(CallbackRouteFilter(router), RoleFilter([Role.admin]))
+
 
+# live campaign counters; closed by main() on shutdown
+campaign_counters = CampaignCounters.from_url(settings.REDIS_URL)
 
 REGULARITY_TO_OFFSET = {
     Regularity.day: 1,
@@ -49,28 +69,35 @@ REGULARITY_TO_OFFSET = {
 }
 
 
-@router.callback_query(RoleFilter([Role.admin]), F.data == "menu_mailings")
+def _quiet_hours() -> tuple[int, int] | None:
+    if settings.NOTIFY_QUIET_HOURS_START is None or settings.NOTIFY_QUIET_HOURS_END is None:
+        return None
+    return settings.NOTIFY_QUIET_HOURS_START, settings.NOTIFY_QUIET_HOURS_END
+
+
+@router.callback_query(F.data == "menu_mailings", RoleFilter([Role.admin]))
 async def cb_menu_mailings(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await callback.answer()
     await callback.message.edit_text("👥 Меню Рассылок", reply_markup=mailings_menu_keyboard())
 
 
-@router.callback_query(RoleFilter([Role.admin]), F.data == "mailings_menu")
+@router.callback_query(F.data == "mailings_menu", RoleFilter([Role.admin]))
 async def cb_mailings_menu(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await callback.answer()
     await callback.message.edit_text("👥 Меню Рассылок", reply_markup=mailings_menu_keyboard())
 
 
-@router.callback_query(RoleFilter([Role.admin]), F.data == "mailings_list")
-async def cb_mailings_list(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(F.data == "mailings_list", RoleFilter([Role.admin]))
+@query_budget(3)
+async def cb_mailings_list(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     await state.clear()
     await callback.answer()
 
-    user_rules = await RuleDAO.list_user_rules()
-    state_rules = await RuleDAO.list_state_rules()
-    cohort_rules = await RuleDAO.list_cohort_rules()
+    user_rules = await RuleDAO.list_user_rules(session=session)
+    state_rules = await RuleDAO.list_state_rules(session=session)
+    cohort_rules = await RuleDAO.list_cohort_rules(session=session)
 
     parts = ["<b>Список рассылок:</b>", ""]
     if user_rules:
@@ -97,10 +124,12 @@ async def cb_mailings_list(callback: CallbackQuery, state: FSMContext):
         parts.append("<b>По когортам:</b>")
         for rule in cohort_rules:
             cohort_name = rule.cohort.name if rule.cohort else f"id={rule.cohort_id}"
+            window = DELIVERY_WINDOWS.get(rule.delivery_window_minutes or 0, f"{rule.delivery_window_minutes} мин")
             parts.append(
                 f"• Название: {rule.name or '—'}\n"
                 f"  Когорта: {cohort_name}\n"
                 f"  Регулярность: {rule.regularity.value}\n"
+                f"  Доставка: {window}\n"
                 f"  Текст: {rule.text or '—'}"
             )
 
@@ -110,7 +139,7 @@ async def cb_mailings_list(callback: CallbackQuery, state: FSMContext):
     await callback.message.edit_text("\n".join(parts), reply_markup=mailings_menu_keyboard())
 
 
-@router.callback_query(RoleFilter([Role.admin]), F.data == "mailings_add")
+@router.callback_query(F.data == "mailings_add", RoleFilter([Role.admin]))
 async def cb_mailings_add(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await state.set_state(MailingFSM.choosing_type)
@@ -118,7 +147,7 @@ async def cb_mailings_add(callback: CallbackQuery, state: FSMContext):
     await callback.message.edit_text("Выберите тип рассылки:", reply_markup=mailing_type_keyboard())
 
 
-@router.callback_query(RoleFilter([Role.admin]), MailingTypeCB.filter())
+@router.callback_query(MailingTypeCB.filter(), RoleFilter([Role.admin]))
 async def cb_choose_type(callback: CallbackQuery, callback_data: MailingTypeCB, state: FSMContext):
     kind = callback_data.kind
     await state.update_data(kind=kind)
@@ -127,15 +156,15 @@ async def cb_choose_type(callback: CallbackQuery, callback_data: MailingTypeCB,
     await callback.message.edit_text("Введите название рассылки:")
 
 
-@router.callback_query(RoleFilter([Role.admin]), F.data == "mailings_delete")
-async def cb_mailings_delete(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(F.data == "mailings_delete", RoleFilter([Role.admin]))
+async def cb_mailings_delete(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     await state.clear()
     await state.set_state(MailingFSM.deleting_rules)
     await state.update_data(del_user_rules=[], del_state_rules=[], del_cohort_rules=[])
 
-    user_rules = await RuleDAO.list_user_rules()
-    state_rules = await RuleDAO.list_state_rules()
-    cohort_rules = await RuleDAO.list_cohort_rules()
+    user_rules = await RuleDAO.list_user_rules(session=session)
+    state_rules = await RuleDAO.list_state_rules(session=session)
+    cohort_rules = await RuleDAO.list_cohort_rules(session=session)
 
     await callback.answer()
     await callback.message.edit_text(
@@ -145,14 +174,15 @@ async def cb_mailings_delete(callback: CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(
-    RoleFilter([Role.admin]),
     StateFilter(MailingFSM.deleting_rules),
     ToggleDeleteUserRuleCB.filter(),
+    RoleFilter([Role.admin]),
 )
 async def cb_toggle_delete_user_rule(
     callback: CallbackQuery,
     callback_data: ToggleDeleteUserRuleCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
     data = await state.get_data()
     sel_users = set(data.get("del_user_rules", []))
@@ -162,9 +192,9 @@ async def cb_toggle_delete_user_rule(
         sel_users.add(callback_data.rule_id)
     await state.update_data(del_user_rules=list(sel_users))
 
-    user_rules = await RuleDAO.list_user_rules()
-    state_rules = await RuleDAO.list_state_rules()
-    cohort_rules = await RuleDAO.list_cohort_rules()
+    user_rules = await RuleDAO.list_user_rules(session=session)
+    state_rules = await RuleDAO.list_state_rules(session=session)
+    cohort_rules = await RuleDAO.list_cohort_rules(session=session)
 
     await callback.answer()
     await callback.message.edit_text(
@@ -181,14 +211,15 @@ async def cb_toggle_delete_user_rule(
 
 
 @router.callback_query(
-    RoleFilter([Role.admin]),
     StateFilter(MailingFSM.deleting_rules),
     ToggleDeleteStateRuleCB.filter(),
+    RoleFilter([Role.admin]),
 )
 async def cb_toggle_delete_state_rule(
     callback: CallbackQuery,
     callback_data: ToggleDeleteStateRuleCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
     data = await state.get_data()
     sel_states = set(data.get("del_state_rules", []))
@@ -198,9 +229,9 @@ async def cb_toggle_delete_state_rule(
         sel_states.add(callback_data.rule_id)
     await state.update_data(del_state_rules=list(sel_states))
 
-    user_rules = await RuleDAO.list_user_rules()
-    state_rules = await RuleDAO.list_state_rules()
-    cohort_rules = await RuleDAO.list_cohort_rules()
+    user_rules = await RuleDAO.list_user_rules(session=session)
+    state_rules = await RuleDAO.list_state_rules(session=session)
+    cohort_rules = await RuleDAO.list_cohort_rules(session=session)
 
     await callback.answer()
     await callback.message.edit_text(
@@ -217,14 +248,15 @@ async def cb_toggle_delete_state_rule(
 
 
 @router.callback_query(
-    RoleFilter([Role.admin]),
     StateFilter(MailingFSM.deleting_rules),
     ToggleDeleteCohortRuleCB.filter(),
+    RoleFilter([Role.admin]),
 )
 async def cb_toggle_delete_cohort_rule(
     callback: CallbackQuery,
     callback_data: ToggleDeleteCohortRuleCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
     data = await state.get_data()
     sel_cohorts = set(data.get("del_cohort_rules", []))
@@ -234,9 +266,9 @@ async def cb_toggle_delete_cohort_rule(
         sel_cohorts.add(callback_data.rule_id)
     await state.update_data(del_cohort_rules=list(sel_cohorts))
 
-    user_rules = await RuleDAO.list_user_rules()
-    state_rules = await RuleDAO.list_state_rules()
-    cohort_rules = await RuleDAO.list_cohort_rules()
+    user_rules = await RuleDAO.list_user_rules(session=session)
+    state_rules = await RuleDAO.list_state_rules(session=session)
+    cohort_rules = await RuleDAO.list_cohort_rules(session=session)
 
     await callback.answer()
     await callback.message.edit_text(
@@ -253,14 +285,15 @@ async def cb_toggle_delete_cohort_rule(
 
 
 @router.callback_query(
-    RoleFilter([Role.admin]),
     StateFilter(MailingFSM.deleting_rules),
     DeleteMailingsFinishCB.filter(),
+    RoleFilter([Role.admin]),
 )
 async def cb_delete_mailings_finish(
     callback: CallbackQuery,
     callback_data: DeleteMailingsFinishCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
     data = await state.get_data()
     sel_users = set(data.get("del_user_rules", []))
@@ -272,11 +305,11 @@ async def cb_delete_mailings_finish(
         return
 
     if sel_users:
-        await RuleDAO.delete_user_rules(sel_users)
+        await RuleDAO.delete_user_rules(sel_users, session=session)
     if sel_states:
-        await RuleDAO.delete_state_rules(sel_states)
+        await RuleDAO.delete_state_rules(sel_states, session=session)
     if sel_cohorts:
-        await RuleDAO.delete_cohort_rules(sel_cohorts)
+        await RuleDAO.delete_cohort_rules(sel_cohorts, session=session)
 
     await state.clear()
     await callback.answer()
@@ -286,8 +319,8 @@ async def cb_delete_mailings_finish(
     )
 
 
-@router.message(RoleFilter([Role.admin]), StateFilter(MailingFSM.waiting_title))
-async def msg_mailing_title(message: Message, state: FSMContext):
+@router.message(StateFilter(MailingFSM.waiting_title), RoleFilter([Role.admin]))
+async def msg_mailing_title(message: Message, state: FSMContext, session: AsyncSession):
     title = (message.text or "").strip()
     if not title:
         await message.answer("Название не может быть пустым. Введите название.")
@@ -299,7 +332,7 @@ async def msg_mailing_title(message: Message, state: FSMContext):
     await state.update_data(title=title)
 
     if kind == "individual":
-        users = await UserDAO.get_all()
+        users = await UserDAO.get_all(session=session)
         await state.update_data(selected_users=[])
         await state.set_state(MailingFSM.choosing_users)
         await message.answer(
@@ -314,7 +347,7 @@ async def msg_mailing_title(message: Message, state: FSMContext):
             reply_markup=select_states_keyboard(set()),
         )
     else:
-        cohorts = await CohortDAO.get_all()
+        cohorts = await CohortDAO.get_summaries(session=session)
         await state.update_data(selected_cohorts=[])
         await state.set_state(MailingFSM.choosing_cohorts)
         await message.answer(
@@ -323,8 +356,8 @@ async def msg_mailing_title(message: Message, state: FSMContext):
         )
 
 
-@router.callback_query(RoleFilter([Role.admin]), StateFilter(MailingFSM.choosing_users), ToggleUserCB.filter())
-async def cb_toggle_user(callback: CallbackQuery, callback_data: ToggleUserCB, state: FSMContext):
+@router.callback_query(StateFilter(MailingFSM.choosing_users), ToggleUserCB.filter(), RoleFilter([Role.admin]))
+async def cb_toggle_user(callback: CallbackQuery, callback_data: ToggleUserCB, state: FSMContext, session: AsyncSession):
     data = await state.get_data()
     selected = set(data.get("selected_users", []))
     if callback_data.user_id in selected:
@@ -333,7 +366,7 @@ async def cb_toggle_user(callback: CallbackQuery, callback_data: ToggleUserCB, s
         selected.add(callback_data.user_id)
     await state.update_data(selected_users=list(selected))
 
-    users = await UserDAO.get_all()
+    users = await UserDAO.get_all(session=session)
     await callback.answer()
     await callback.message.edit_text(
         "Выберите пользователей (можно несколько), затем нажмите «Готово».",
@@ -341,7 +374,7 @@ async def cb_toggle_user(callback: CallbackQuery, callback_data: ToggleUserCB, s
     )
 
 
-@router.callback_query(RoleFilter([Role.admin]), StateFilter(MailingFSM.choosing_users), MailingFinishUsersCB.filter())
+@router.callback_query(StateFilter(MailingFSM.choosing_users), MailingFinishUsersCB.filter(), RoleFilter([Role.admin]))
 async def cb_finish_users(callback: CallbackQuery, callback_data: MailingFinishUsersCB, state: FSMContext):
     data = await state.get_data()
     selected: set[int] = set(data.get("selected_users", set()))
@@ -354,7 +387,7 @@ async def cb_finish_users(callback: CallbackQuery, callback_data: MailingFinishU
     await callback.message.edit_text("Введите текст рассылки:")
 
 
-@router.callback_query(RoleFilter([Role.admin]), StateFilter(MailingFSM.choosing_states), ToggleStateCB.filter())
+@router.callback_query(StateFilter(MailingFSM.choosing_states), ToggleStateCB.filter(), RoleFilter([Role.admin]))
 async def cb_toggle_state(callback: CallbackQuery, callback_data: ToggleStateCB, state: FSMContext):
     data = await state.get_data()
     selected = set(data.get("selected_states", []))
@@ -376,7 +409,7 @@ async def cb_toggle_state(callback: CallbackQuery, callback_data: ToggleStateCB,
             raise
 
 
-@router.callback_query(RoleFilter([Role.admin]), StateFilter(MailingFSM.choosing_states), MailingFinishStatesCB.filter())
+@router.callback_query(StateFilter(MailingFSM.choosing_states), MailingFinishStatesCB.filter(), RoleFilter([Role.admin]))
 async def cb_finish_states(callback: CallbackQuery, callback_data: MailingFinishStatesCB, state: FSMContext):
     data = await state.get_data()
     selected_names = set(data.get("selected_states", []))
@@ -390,8 +423,8 @@ async def cb_finish_states(callback: CallbackQuery, callback_data: MailingFinish
     await callback.message.edit_text("Введите текст рассылки:")
 
 
-@router.callback_query(RoleFilter([Role.admin]), StateFilter(MailingFSM.choosing_cohorts), ToggleCohortCB.filter())
-async def cb_toggle_cohort(callback: CallbackQuery, callback_data: ToggleCohortCB, state: FSMContext):
+@router.callback_query(StateFilter(MailingFSM.choosing_cohorts), ToggleCohortCB.filter(), RoleFilter([Role.admin]))
+async def cb_toggle_cohort(callback: CallbackQuery, callback_data: ToggleCohortCB, state: FSMContext, session: AsyncSession):
     data = await state.get_data()
     selected = set(data.get("selected_cohorts", []))
     cohort_id = callback_data.cohort_id
@@ -401,7 +434,7 @@ async def cb_toggle_cohort(callback: CallbackQuery, callback_data: ToggleCohortC
         selected.add(cohort_id)
     await state.update_data(selected_cohorts=list(selected))
 
-    cohorts = await CohortDAO.get_all()
+    cohorts = await CohortDAO.get_summaries(session=session)
     await callback.answer()
     await callback.message.edit_text(
         "Выберите когорты (можно несколько), затем нажмите «Готово».",
@@ -409,7 +442,7 @@ async def cb_toggle_cohort(callback: CallbackQuery, callback_data: ToggleCohortC
     )
 
 
-@router.callback_query(RoleFilter([Role.admin]), StateFilter(MailingFSM.choosing_cohorts), MailingFinishCohortsCB.filter())
+@router.callback_query(StateFilter(MailingFSM.choosing_cohorts), MailingFinishCohortsCB.filter(), RoleFilter([Role.admin]))
 async def cb_finish_cohorts(callback: CallbackQuery, callback_data: MailingFinishCohortsCB, state: FSMContext):
     data = await state.get_data()
     selected: set[int] = set(data.get("selected_cohorts", set()))
@@ -422,7 +455,7 @@ async def cb_finish_cohorts(callback: CallbackQuery, callback_data: MailingFinis
     await callback.message.edit_text("Введите текст рассылки:")
 
 
-@router.message(RoleFilter([Role.admin]), StateFilter(MailingFSM.waiting_text))
+@router.message(StateFilter(MailingFSM.waiting_text), RoleFilter([Role.admin]))
 async def msg_mailing_text(message: Message, state: FSMContext):
     text = (message.text or "").strip()
     if not text:
@@ -438,11 +471,12 @@ async def msg_mailing_text(message: Message, state: FSMContext):
     )
 
 
-@router.callback_query(RoleFilter([Role.admin]), StateFilter(MailingFSM.choosing_regularity), ChooseRegularityCB.filter())
+@router.callback_query(StateFilter(MailingFSM.choosing_regularity), ChooseRegularityCB.filter(), RoleFilter([Role.admin]))
 async def cb_choose_regularity(
     callback: CallbackQuery,
     callback_data: ChooseRegularityCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
     data = await state.get_data()
     kind = data.get("kind")
@@ -462,6 +496,7 @@ async def cb_choose_regularity(
             text=text_body,
             regularity=regularity,
             author_id=author_id,
+            session=session,
         )
         await state.clear()
         await callback.message.edit_text(
@@ -479,6 +514,7 @@ async def cb_choose_regularity(
             regularity=regularity,
             author_id=author_id,
             offset_days=offset_days,
+            session=session,
         )
         await state.clear()
         await callback.message.edit_text(
@@ -486,22 +522,129 @@ async def cb_choose_regularity(
             reply_markup=mailings_menu_keyboard(),
         )
     else:
-        selected_cohorts = set(data.get("selected_cohorts", []))
-        await RuleDAO.create_cohort_rules(
-            cohort_ids=selected_cohorts,
-            name=title,
-            text=text_body,
-            regularity=regularity,
-            author_id=author_id,
-        )
-        await state.clear()
+        # a cohort broadcast can be large: ask how fast it may go out
+        await state.update_data(regularity=regularity.name)
+        await state.set_state(MailingFSM.choosing_window)
+        quiet_hours = _quiet_hours()
+        prompt = "Как быстро доставить рассылку?"
+        if quiet_hours:
+            prompt += f"\nС {quiet_hours[0]}:00 до {quiet_hours[1]}:00 МСК сообщения не отправляются."
+        await callback.message.edit_text(prompt, reply_markup=delivery_window_keyboard())
+
+
+@router.callback_query(StateFilter(MailingFSM.choosing_window), ChooseDeliveryWindowCB.filter(), RoleFilter([Role.admin]))
+async def cb_choose_window(
+    callback: CallbackQuery,
+    callback_data: ChooseDeliveryWindowCB,
+    state: FSMContext,
+    session: AsyncSession,
+):
+    data = await state.get_data()
+    await callback.answer()
+    await RuleDAO.create_cohort_rules(
+        cohort_ids=set(data.get("selected_cohorts", [])),
+        name=data.get("title"),
+        text=data.get("text"),
+        regularity=Regularity[data["regularity"]],
+        author_id=callback.from_user.id,
+        delivery_window_minutes=callback_data.minutes or None,
+        quiet_hours=_quiet_hours(),
+        session=session,
+    )
+    await state.clear()
+    await callback.message.edit_text(
+        "Рассылка по когортам создана.",
+        reply_markup=mailings_menu_keyboard(),
+    )
+
+
+@router.callback_query(F.data == "campaigns_add", RoleFilter([Role.admin]))
+async def cb_campaigns_add(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+    await state.clear()
+    await state.set_state(MailingFSM.campaign_choosing_cohort)
+    cohorts = await CohortDAO.get_summaries(session=session)
+    await callback.answer()
+    await callback.message.edit_text(
+        "Разовая рассылка уходит участникам когорты один раз.\nВыберите когорту:",
+        reply_markup=campaign_cohorts_keyboard(cohorts),
+    )
+
+
+@router.callback_query(StateFilter(MailingFSM.campaign_choosing_cohort), CampaignCohortCB.filter(), RoleFilter([Role.admin]))
+async def cb_campaign_cohort(callback: CallbackQuery, callback_data: CampaignCohortCB, state: FSMContext):
+    await state.update_data(cohort_id=callback_data.cohort_id)
+    await state.set_state(MailingFSM.campaign_waiting_text)
+    await callback.answer()
+    await callback.message.edit_text("Введите текст рассылки:")
+
+
+@router.message(StateFilter(MailingFSM.campaign_waiting_text), RoleFilter([Role.admin]))
+async def msg_campaign_text(message: Message, state: FSMContext):
+    text = (message.text or "").strip()
+    if not text:
+        await message.answer("Текст не может быть пустым. Введите текст рассылки.")
+        return
+
+    await state.update_data(text=text)
+    await state.set_state(MailingFSM.campaign_confirming)
+    await message.answer(
+        "Запустить рассылку? Ход отправки будет виден в этом сообщении.",
+        reply_markup=campaign_confirm_keyboard(),
+    )
+
+
+@router.callback_query(StateFilter(MailingFSM.campaign_confirming), F.data == "campaign_start", RoleFilter([Role.admin]))
+async def cb_campaign_start(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+    data = await state.get_data()
+    text_body = data["text"]
+    campaign = await CampaignDAO.start(
+        name=text_body.splitlines()[0][:50],
+        text=text_body,
+        cohort_id=data["cohort_id"],
+        author_id=callback.from_user.id,
+        now=datetime.now(timezone.utc),
+        per_minute=settings.bulk_per_minute,
+        quiet_hours=_quiet_hours(),
+        progress_chat_id=callback.message.chat.id,
+        progress_message_id=callback.message.message_id,
+        session=session,
+    )
+    # the counters exist before the sender can see the notifications
+    await campaign_counters.start(campaign.id, campaign.queued)
+    await session.commit()
+    await state.clear()
+    await callback.answer()
+
+    if campaign.status is not CampaignStatus.running:
         await callback.message.edit_text(
-            "Рассылка по когортам создана.",
+            "В когорте нет получателей, рассылка не отправлена.",
             reply_markup=mailings_menu_keyboard(),
         )
+        return
+    # from here on the message is edited by the campaigns.refresh_progress task
+    await callback.message.edit_text(
+        render_progress(campaign, stored_counts(campaign)),
+        reply_markup=campaign_progress_keyboard(campaign.id),
+    )
+
+
+@router.callback_query(CampaignCancelCB.filter(), RoleFilter([Role.admin]))
+async def cb_campaign_cancel(callback: CallbackQuery, callback_data: CampaignCancelCB, session: AsyncSession):
+    campaign_id = callback_data.campaign_id
+    # Telegram refuses an answer that comes too late
+    await callback.answer()
+    dropped = await CampaignDAO.cancel(campaign_id, now=datetime.now(timezone.utc), session=session)
+    if dropped is not None:
+        await session.commit()
+        await campaign_counters.add({campaign_id: {"queued": -dropped, "dropped": dropped}})
+
+    # a campaign that had already ended shows how it ended
+    campaign = await CampaignDAO.find_one_or_none(id=campaign_id, session=session)
+    counts = (await campaign_counters.read([campaign_id])).get(campaign_id, stored_counts(campaign))
+    await callback.message.edit_text(render_progress(campaign, counts), reply_markup=mailings_menu_keyboard())
 
 
-@router.callback_query(RoleFilter([Role.admin]), F.data == "back_to_menu")
+@router.callback_query(F.data == "back_to_menu", RoleFilter([Role.admin]))
 async def cb_back_to_menu(callback: CallbackQuery, state: FSMContext):
     await state.clear()
     await callback.answer()
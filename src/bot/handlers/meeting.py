@@ -4,6 +4,7 @@ from aiogram.types import CallbackQuery, Message
 from aiogram.fsm.context import FSMContext
 from datetime import datetime, timedelta, date, timezone
 from aiogram.exceptions import TelegramBadRequest
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.bot.callbacks.meeting import (
     ChooseMeetingStudentCB,
@@ -11,10 +12,13 @@ from src.bot.callbacks.meeting import (
     ChooseMeetingDateCB,
     NavigateMeetingMonthCB,
     ChooseMeetingTimeCB,
+    MeetingsPageCB,
 )
+from src.bot.filters.callback_route import CallbackRouteFilter
 from src.bot.filters.role import RoleFilter
 from src.bot.keyboards.meeting import (
     mentor_meetings_keyboard,
+    student_meetings_keyboard,
     meeting_cancel_keyboard,
     meeting_students_keyboard,
     meeting_calendar_keyboard,
@@ -25,6 +29,7 @@ from src.bot.states.meeting import CreateMeetingFSM
 from src.dao.meeting import MeetingDAO
 from src.dao.user import UserDAO
 from src.models.user import Role
+from src.utils.task_publisher import task_publisher
 import logging
 from src.tasks.meeting import (
     notify_meeting_created,
@@ -34,35 +39,21 @@ from src.tasks.meeting import (
 
 logger = logging.getLogger(__name__)
 MOSCOW_TZ = timezone(timedelta(hours=3))
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MEETINGS_PAGE_SIZE = 10
 router = Router(name="meetings")
 router.message.filter(RoleFilter([Role.mentor, Role.student]))
-router.callback_query.filter(RoleFilter([Role.mentor, Role.student]))
+router.callback_query.filter(CallbackRouteFilter(router), RoleFilter([Role.mentor, Role.student]))
 
 
-def _format_meetings(meetings, viewer_id: int, role: Role) -> str:
+def _format_meetings(meetings) -> str:
     if not meetings:
         return "Список созвонов пуст."
 
     lines = ["<b>Мои созвоны:</b>", ""]
     for meeting in meetings:
-        mentor = next((p for p in meeting.participants if p.role == Role.mentor), None)
-        student = next((p for p in meeting.participants if p.role == Role.student), None)
-
-        # fallback: если роль не подтянулась, берем второго участника не равного ментору
-        if not student:
-            student = next(
-                (
-                    p
-                    for p in meeting.participants
-                    if mentor and p.telegram_id != mentor.telegram_id
-                ),
-                None,
-            )
-
-        if role == Role.mentor and mentor and mentor.telegram_id != viewer_id:
-            continue
-        if role == Role.student and student and student.telegram_id != viewer_id:
-            continue
+        mentor = meeting.mentor
+        student = meeting.student
 
         mentor_text = f"Ментор: <b>{mentor.name}</b> @{mentor.username}" if mentor else "Ментор: —"
         student_text = f"Ученик: <b>{student.name}</b> @{student.username}" if student else "Ученик: —"
@@ -93,33 +84,76 @@ def _format_meetings(meetings, viewer_id: int, role: Role) -> str:
     return "\n".join(lines)
 
 
-@router.callback_query(RoleFilter([Role.mentor]), F.data == "mentor_meetings_list")
-async def cb_mentor_meetings(callback: CallbackQuery):
+async def _load_meetings_page(
+    viewer_id: int,
+    role: Role,
+    after: tuple[datetime, int] | None = None,
+    *,
+    session: AsyncSession | None = None,
+):
+    """Fetch one page of upcoming meetings plus the cursor for the next one."""
+    meetings = await MeetingDAO.get_for_user(
+        viewer_id,
+        role=role,
+        hide_past=True,
+        after=after,
+        limit=MEETINGS_PAGE_SIZE + 1,
+        session=session,
+    )
+    page = meetings[:MEETINGS_PAGE_SIZE]
+    next_page = None
+    if len(meetings) > MEETINGS_PAGE_SIZE:
+        last = page[-1]
+        next_page = MeetingsPageCB(
+            as_mentor=role == Role.mentor,
+            after_us=(last.scheduled_at - EPOCH) // timedelta(microseconds=1),
+            after_id=last.id,
+        )
+    return page, next_page
+
+
+@router.callback_query(F.data == "mentor_meetings_list", RoleFilter([Role.mentor]))
+async def cb_mentor_meetings(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
-    meetings = await MeetingDAO.get_for_user(callback.from_user.id, hide_past=True)
+    meetings, next_page = await _load_meetings_page(callback.from_user.id, Role.mentor, session=session)
 
-    text = _format_meetings(meetings, callback.from_user.id, Role.mentor)
-    await callback.message.edit_text(text, reply_markup=mentor_meetings_keyboard(meetings))
+    text = _format_meetings(meetings)
+    await callback.message.edit_text(text, reply_markup=mentor_meetings_keyboard(meetings, next_page))
 
 
-@router.callback_query(RoleFilter([Role.student]), F.data == "student_meetings")
-async def cb_student_meetings(callback: CallbackQuery):
+@router.callback_query(F.data == "student_meetings", RoleFilter([Role.student]))
+async def cb_student_meetings(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
-    meetings = await MeetingDAO.get_for_user(callback.from_user.id, hide_past=True)
+    meetings, next_page = await _load_meetings_page(callback.from_user.id, Role.student, session=session)
 
-    text = _format_meetings(meetings, callback.from_user.id, Role.student)
+    text = _format_meetings(meetings)
     try:
-        await callback.message.edit_text(text, reply_markup=menu_keyboard(Role.student))
+        await callback.message.edit_text(text, reply_markup=student_meetings_keyboard(next_page))
     except TelegramBadRequest as exc:
         if "message is not modified" not in str(exc).lower():
             raise
 
 
-@router.callback_query(RoleFilter([Role.mentor]), F.data == "meeting_create")
-async def cb_meeting_create(callback: CallbackQuery, state: FSMContext):
+@router.callback_query(MeetingsPageCB.filter())
+async def cb_meetings_page(callback: CallbackQuery, callback_data: MeetingsPageCB, session: AsyncSession):
+    await callback.answer()
+    role = Role.mentor if callback_data.as_mentor else Role.student
+    after = (EPOCH + timedelta(microseconds=callback_data.after_us), callback_data.after_id)
+    meetings, next_page = await _load_meetings_page(callback.from_user.id, role, after, session=session)
+
+    text = _format_meetings(meetings)
+    if role == Role.mentor:
+        markup = mentor_meetings_keyboard(meetings, next_page)
+    else:
+        markup = student_meetings_keyboard(next_page)
+    await callback.message.edit_text(text, reply_markup=markup)
+
+
+@router.callback_query(F.data == "meeting_create", RoleFilter([Role.mentor]))
+async def cb_meeting_create(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     await callback.answer()
 
-    students = await UserDAO.get_all(mentor_id=callback.from_user.id)
+    students = await UserDAO.get_all(mentor_id=callback.from_user.id, session=session)
     if not students:
         await callback.message.edit_text(
             "У вас пока нет учеников.",
@@ -135,9 +169,9 @@ async def cb_meeting_create(callback: CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(
-    RoleFilter([Role.mentor]),
     StateFilter(CreateMeetingFSM.choosing_student),
     ChooseMeetingStudentCB.filter(),
+    RoleFilter([Role.mentor]),
 )
 async def cb_choose_meeting_student(
     callback: CallbackQuery,
@@ -155,7 +189,7 @@ async def cb_choose_meeting_student(
     )
 
 
-@router.message(RoleFilter([Role.mentor]), StateFilter(CreateMeetingFSM.waiting_description))
+@router.message(StateFilter(CreateMeetingFSM.waiting_description), RoleFilter([Role.mentor]))
 async def msg_meeting_description(message: Message, state: FSMContext):
     description = message.text.strip() if message.text else ""
     await state.update_data(description=description)
@@ -168,9 +202,9 @@ async def msg_meeting_description(message: Message, state: FSMContext):
 
 
 @router.callback_query(
-    RoleFilter([Role.mentor]),
     StateFilter(CreateMeetingFSM.waiting_date),
     NavigateMeetingMonthCB.filter(),
+    RoleFilter([Role.mentor]),
 )
 async def cb_meeting_nav_month(
     callback: CallbackQuery,
@@ -192,9 +226,9 @@ async def cb_meeting_nav_month(
 
 
 @router.callback_query(
-    RoleFilter([Role.mentor]),
     StateFilter(CreateMeetingFSM.waiting_date),
     ChooseMeetingDateCB.filter(),
+    RoleFilter([Role.mentor]),
 )
 async def cb_meeting_choose_date(
     callback: CallbackQuery,
@@ -221,7 +255,7 @@ def _parse_time(value: str) -> str | None:
     return None
 
 
-@router.message(RoleFilter([Role.mentor]), StateFilter(CreateMeetingFSM.waiting_time))
+@router.message(StateFilter(CreateMeetingFSM.waiting_time), RoleFilter([Role.mentor]))
 async def msg_meeting_time(message: Message, state: FSMContext):
     parsed = _parse_time(message.text)
     if not parsed:
@@ -249,9 +283,9 @@ async def msg_meeting_time(message: Message, state: FSMContext):
 
 
 @router.callback_query(
-    RoleFilter([Role.mentor]),
     StateFilter(CreateMeetingFSM.waiting_time),
     ChooseMeetingTimeCB.filter(),
+    RoleFilter([Role.mentor]),
 )
 async def cb_meeting_choose_time(
     callback: CallbackQuery,
@@ -306,7 +340,7 @@ def _to_utc_assuming_msk(dt: datetime | None) -> datetime | None:
     return dt.astimezone(timezone.utc)
 
 
-def _schedule_meeting_tasks(meeting) -> None:
+async def _schedule_meeting_tasks(meeting) -> None:
     meeting_id = meeting.id
     scheduled_at = meeting.scheduled_at
 
@@ -315,25 +349,25 @@ def _schedule_meeting_tasks(meeting) -> None:
     now = datetime.now(timezone.utc)
 
     # immediate notification
-    notify_meeting_created.delay(meeting_id)
+    await task_publisher.enqueue(notify_meeting_created, args=[meeting_id])
     logger.info("Scheduled notify_created for meeting %s", meeting_id)
 
     if scheduled_utc:
         reminder_eta = scheduled_utc - timedelta(minutes=5)
         if reminder_eta > now:
-            notify_meeting_reminder.apply_async(args=[meeting_id], eta=reminder_eta)
+            await task_publisher.enqueue(notify_meeting_reminder, args=[meeting_id], eta=reminder_eta)
             logger.info("Scheduled reminder for meeting %s at %s", meeting_id, reminder_eta)
 
         if scheduled_utc <= now:
-            complete_meeting_task.delay(meeting_id)
+            await task_publisher.enqueue(complete_meeting_task, args=[meeting_id])
             logger.info("Meeting %s already in past, completing now", meeting_id)
         else:
-            complete_meeting_task.apply_async(args=[meeting_id], eta=scheduled_utc)
+            await task_publisher.enqueue(complete_meeting_task, args=[meeting_id], eta=scheduled_utc)
             logger.info("Scheduled completion for meeting %s at %s", meeting_id, scheduled_utc)
 
 
-@router.message(RoleFilter([Role.mentor]), StateFilter(CreateMeetingFSM.waiting_link))
-async def msg_meeting_link(message: Message, state: FSMContext):
+@router.message(StateFilter(CreateMeetingFSM.waiting_link), RoleFilter([Role.mentor]))
+async def msg_meeting_link(message: Message, state: FSMContext, session: AsyncSession):
     link = message.text.strip() if message.text else ""
     data = await state.get_data()
 
@@ -358,8 +392,11 @@ async def msg_meeting_link(message: Message, state: FSMContext):
         scheduled_at=scheduled_at,
         mentor_id=message.from_user.id,
         student_id=student_id,
+        session=session,
     )
-    _schedule_meeting_tasks(meeting)
+    # Workers load the meeting by id, so it must be visible before they run.
+    await session.commit()
+    await _schedule_meeting_tasks(meeting)
     await state.clear()
 
     await message.answer(
@@ -368,13 +405,14 @@ async def msg_meeting_link(message: Message, state: FSMContext):
     )
 
 
-@router.callback_query(RoleFilter([Role.mentor]), DeleteMeetingCB.filter())
-async def cb_delete_meeting(callback: CallbackQuery, callback_data: DeleteMeetingCB):
+@router.callback_query(DeleteMeetingCB.filter(), RoleFilter([Role.mentor]))
+async def cb_delete_meeting(callback: CallbackQuery, callback_data: DeleteMeetingCB, session: AsyncSession):
     await callback.answer()
 
     deleted = await MeetingDAO.delete_for_mentor(
         meeting_id=callback_data.meeting_id,
         mentor_id=callback.from_user.id,
+        session=session,
     )
 
     if not deleted:
@@ -384,16 +422,15 @@ async def cb_delete_meeting(callback: CallbackQuery, callback_data: DeleteMeetin
         )
         return
 
-    meetings = await MeetingDAO.get_for_user(callback.from_user.id)
-    text = _format_meetings(meetings, callback.from_user.id, Role.mentor)
+    meetings, next_page = await _load_meetings_page(callback.from_user.id, Role.mentor, session=session)
+    text = _format_meetings(meetings)
     await callback.message.edit_text(
         f"Созвон #{callback_data.meeting_id} удалён.\n\n{text}",
-        reply_markup=mentor_meetings_keyboard(meetings),
+        reply_markup=mentor_meetings_keyboard(meetings, next_page),
     )
 
 
 @router.callback_query(
-    RoleFilter([Role.mentor]),
     StateFilter(
         CreateMeetingFSM.choosing_student,
         CreateMeetingFSM.waiting_description,
@@ -402,6 +439,7 @@ async def cb_delete_meeting(callback: CallbackQuery, callback_data: DeleteMeetin
         CreateMeetingFSM.waiting_link,
     ),
     F.data == "meeting_create_cancel",
+    RoleFilter([Role.mentor]),
 )
 async def cb_meeting_cancel(callback: CallbackQuery, state: FSMContext):
     await state.clear()
@@ -1,20 +1,22 @@
 from aiogram import Router, F
 from aiogram.types import CallbackQuery
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.dao.user import UserDAO
+from src.bot.filters.callback_route import CallbackRouteFilter
 from src.bot.filters.role import RoleFilter
 from src.bot.keyboards.menu import back_to_menu_keyboard
 from src.models.user import Role
 
 router = Router(name="user")
-router.callback_query.filter(RoleFilter([Role.admin]))
+router.callback_query.filter(CallbackRouteFilter(router), RoleFilter([Role.admin]))
 
 
 @router.callback_query(F.data == "user_list")
-async def cb_user_list(callback: CallbackQuery):
+async def cb_user_list(callback: CallbackQuery, session: AsyncSession):
     await callback.answer()
 
-    all_users = await UserDAO.get_all()
+    all_users = await UserDAO.get_all(session=session)
 
     if not all_users:
         return await callback.message.edit_text("<b>Список пользователей пуст.</b>")
@@ -1,9 +1,13 @@
 # app/bot/handlers/admin/update_user_fsm.py
+from datetime import datetime, timezone
+
 from aiogram import Router, F
 from aiogram.filters import Command, StateFilter
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.bot.filters.callback_route import CallbackRouteFilter
 from src.bot.filters.role import RoleFilter
 from src.bot.states.update_user import UpdateUserFSM
 from src.bot.keyboards.user import (
@@ -31,12 +35,12 @@ from src.utils.auth import get_user_role
 from src.utils.onboarding import schedule_onboarding_for_mentor, notify_student_new_mentor
 
 router = Router(name="update-user-fsm")
-router.callback_query.filter(RoleFilter([Role.admin, Role.mentor]))
+router.callback_query.filter(CallbackRouteFilter(router), RoleFilter([Role.admin, Role.mentor]))
 
 
 @router.callback_query(F.data == "user_update_menu")
-async def cmd_start_update_user(callback: CallbackQuery, state: FSMContext):
-    role = await get_user_role(callback.from_user.id)
+async def cmd_start_update_user(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+    role = await get_user_role(callback.from_user.id, session)
     if role not in (Role.admin, Role.mentor):
         await callback.answer("Доступ запрещен.", show_alert=True)
         return
@@ -55,8 +59,8 @@ async def cmd_start_update_user(callback: CallbackQuery, state: FSMContext):
 
 
 @router.callback_query(F.data == "mentor_update_student")
-async def cmd_start_update_student_by_mentor(callback: CallbackQuery, state: FSMContext):
-    await cmd_start_update_user(callback, state)
+async def cmd_start_update_student_by_mentor(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
+    await cmd_start_update_user(callback, state, session)
 
 
 @router.callback_query(
@@ -67,8 +71,9 @@ async def cb_choose_param(
     callback: CallbackQuery,
     callback_data: ChooseParamCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
-    role = await get_user_role(callback.from_user.id)
+    role = await get_user_role(callback.from_user.id, session)
     if role not in (Role.admin, Role.mentor):
         await callback.answer("Доступ запрещен.", show_alert=True)
         await state.clear()
@@ -104,7 +109,7 @@ async def cb_choose_param(
         )
 
     elif param == UpdateParam.MENTOR:
-        mentors = await UserDAO.get_all(role=Role.mentor)
+        mentors = await UserDAO.get_all(role=Role.mentor, session=session)
         if not mentors:
             await callback.message.edit_text("Менторы не найдены.")
             await state.clear()
@@ -118,7 +123,7 @@ async def cb_choose_param(
         )
 
     elif param == UpdateParam.COHORT:
-        cohorts = await CohortDAO.get_all()
+        cohorts = await CohortDAO.get_summaries(session=session)
         if not cohorts:
             await callback.message.edit_text("Когорты не найдены.")
             await state.clear()
@@ -140,8 +145,9 @@ async def cb_choose_enum_value(
     callback: CallbackQuery,
     callback_data: ChooseEnumValueCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
-    role = await get_user_role(callback.from_user.id)
+    role = await get_user_role(callback.from_user.id, session)
     if role not in (Role.admin, Role.mentor):
         await callback.answer("Доступ запрещен.", show_alert=True)
         await state.clear()
@@ -158,9 +164,9 @@ async def cb_choose_enum_value(
     )
 
     users = (
-        await UserDAO.get_all()
+        await UserDAO.get_all(session=session)
         if role == Role.admin
-        else await UserDAO.get_all(mentor_id=callback.from_user.id)
+        else await UserDAO.get_all(mentor_id=callback.from_user.id, session=session)
     )
     if not users:
         await callback.message.edit_text("Пользователи не найдены.")
@@ -186,8 +192,9 @@ async def cb_choose_mentor(
     callback: CallbackQuery,
     callback_data: ChooseMentorCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
-    role = await get_user_role(callback.from_user.id)
+    role = await get_user_role(callback.from_user.id, session)
     if role != Role.admin:
         await callback.answer("Доступ запрещен.", show_alert=True)
         await state.clear()
@@ -201,7 +208,7 @@ async def cb_choose_mentor(
         chosen_value_type="mentor",
     )
 
-    students = await UserDAO.get_all(role=Role.student)
+    students = await UserDAO.get_all(role=Role.student, session=session)
     if not students:
         await callback.message.edit_text("Пользователи не найдены.")
         await state.clear()
@@ -210,7 +217,7 @@ async def cb_choose_mentor(
     await state.set_state(UpdateUserFSM.choosing_user)
 
     # Можно дополнительно подтянуть имя ментора для текста
-    mentor = await UserDAO.find_one_or_none(telegram_id=mentor_id)
+    mentor = await UserDAO.find_one_or_none(telegram_id=mentor_id, session=session)
     mentor_text = mentor.name if mentor else f"id={mentor_id}"
 
     await callback.message.edit_text(
@@ -228,8 +235,9 @@ async def cb_choose_cohort(
     callback: CallbackQuery,
     callback_data: ChooseCohortCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
-    role = await get_user_role(callback.from_user.id)
+    role = await get_user_role(callback.from_user.id, session)
     if role != Role.admin:
         await callback.answer("Доступ запрещен.", show_alert=True)
         await state.clear()
@@ -243,7 +251,7 @@ async def cb_choose_cohort(
         chosen_value_type="cohort",
     )
 
-    users = await UserDAO.get_all()
+    users = await UserDAO.get_all(session=session)
     if not users:
         await callback.message.edit_text("Пользователи не найдены.")
         await state.clear()
@@ -251,7 +259,7 @@ async def cb_choose_cohort(
 
     await state.set_state(UpdateUserFSM.choosing_user)
 
-    cohort = await CohortDAO.find_one_or_none(id=cohort_id)
+    cohort = await CohortDAO.find_one_or_none(id=cohort_id, session=session)
     cohort_text = cohort.name if cohort else f"id={cohort_id}"
 
     await callback.message.edit_text(
@@ -269,10 +277,11 @@ async def cb_choose_user_for_update(
     callback: CallbackQuery,
     callback_data: ChooseUserCB,
     state: FSMContext,
+    session: AsyncSession,
 ):
     await callback.answer()
 
-    role = await get_user_role(callback.from_user.id)
+    role = await get_user_role(callback.from_user.id, session)
     if role not in (Role.admin, Role.mentor):
         await callback.answer("Доступ запрещен.", show_alert=True)
         await state.clear()
@@ -284,7 +293,7 @@ async def cb_choose_user_for_update(
     chosen_value_type = data["chosen_value_type"]
 
     user_id = callback_data.user_id
-    user = await UserDAO.find_one_or_none(telegram_id=user_id)
+    user = await UserDAO.find_one_or_none(telegram_id=user_id, session=session)
 
     if not user:
         await callback.message.edit_text("Пользователь не найден.")
@@ -304,7 +313,7 @@ async def cb_choose_user_for_update(
         if param == UpdateParam.ROLE:
             value_human = Role[chosen_value].value
 
-            await UserDAO.update(telegram_id=user_id, role=Role[chosen_value])
+            await UserDAO.update(telegram_id=user_id, role=Role[chosen_value], session=session)
 
         elif param == UpdateParam.STATUS:
             if role == Role.mentor and user.mentor_id != callback.from_user.id:
@@ -317,29 +326,32 @@ async def cb_choose_user_for_update(
 
             value_human = State[chosen_value].value
 
-            await UserDAO.update(telegram_id=user_id, state=State[chosen_value])
+            await UserDAO.set_state(
+                user_id, State[chosen_value], changed_at=datetime.now(timezone.utc), session=session,
+            )
 
         else:
             value_human = chosen_value
 
     elif chosen_value_type == "mentor":
 
-        mentor = await UserDAO.find_one_or_none(telegram_id=chosen_value)
+        mentor = await UserDAO.find_one_or_none(telegram_id=chosen_value, session=session)
         is_new_mentor = user.mentor_id != chosen_value
-        await UserDAO.update(telegram_id=user_id, mentor_id=chosen_value)
+        await UserDAO.update(telegram_id=user_id, mentor_id=chosen_value, session=session)
 
         value_human = mentor.name if mentor else f"id={chosen_value}"
 
         if user.role == Role.student and user.state == State.greeting and mentor:
-            await schedule_onboarding_for_mentor(user, mentor.telegram_id)
+            await schedule_onboarding_for_mentor(user, mentor.telegram_id, session=session)
 
         if mentor and is_new_mentor:
-            await notify_student_new_mentor(user, mentor)
+            await notify_student_new_mentor(user, mentor, session=session)
 
     elif chosen_value_type == "cohort":
 
-        cohort = await CohortDAO.find_one_or_none(id=chosen_value)
-        await UserDAO.update(telegram_id=user_id, cohort_id=chosen_value)
+        cohort = await CohortDAO.find_one_or_none(id=chosen_value, session=session)
+        await UserDAO.update(telegram_id=user_id, cohort_id=chosen_value, session=session)
+        CohortDAO.invalidate_summaries_on_commit(session)
 
         value_human = cohort.name if cohort else f"id={chosen_value}"
 
@@ -1,8 +1,8 @@
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import InlineKeyboardMarkup
 
-from src.bot.callbacks.cohort import DeleteCohortCB
-from src.models.cohort import Cohort
+from src.bot.callbacks.cohort import CohortMembersCB, DeleteCohortCB
+from src.dao.cohort import CohortSummary
 
 
 def cohort_actions_keyboard() -> InlineKeyboardMarkup:
@@ -29,7 +29,7 @@ def cohort_cancel_keyboard() -> InlineKeyboardMarkup:
     return kb.as_markup()
 
 
-def cohort_delete_keyboard(cohorts: list[Cohort]) -> InlineKeyboardMarkup:
+def cohort_delete_keyboard(cohorts: list[CohortSummary]) -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
 
     for cohort in cohorts:
@@ -40,4 +40,31 @@ def cohort_delete_keyboard(cohorts: list[Cohort]) -> InlineKeyboardMarkup:
 
     kb.adjust(1)
 
-    return kb.as_markup()
\ No newline at end of file
+    return kb.as_markup()
+
+def cohort_list_keyboard(cohorts: list[CohortSummary]) -> InlineKeyboardMarkup:
+    kb = InlineKeyboardBuilder()
+
+    for cohort in cohorts:
+        kb.button(
+            text=f"{cohort.name} ({cohort.members})",
+            callback_data=CohortMembersCB(cohort_id=cohort.id).pack(),
+        )
+
+    kb.button(text="⬅️ Назад к меню", callback_data="back_to_menu")
+    kb.adjust(1)
+
+    return kb.as_markup()
+
+
+def cohort_members_keyboard(next_page: CohortMembersCB | None = None) -> InlineKeyboardMarkup:
+    kb = InlineKeyboardBuilder()
+
+    if next_page:
+        kb.button(text="Показать ещё", callback_data=next_page.pack())
+
+    kb.button(text="К списку когорт", callback_data="cohort_list")
+    kb.button(text="⬅️ Назад к меню", callback_data="back_to_menu")
+    kb.adjust(1)
+
+    return kb.as_markup()
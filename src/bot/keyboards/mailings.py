@@ -7,6 +7,7 @@ from src.bot.callbacks.rule import (
     ToggleStateCB,
     ToggleCohortCB,
     ChooseRegularityCB,
+    ChooseDeliveryWindowCB,
     MailingFinishUsersCB,
     MailingFinishStatesCB,
     MailingFinishCohortsCB,
@@ -14,9 +15,11 @@ from src.bot.callbacks.rule import (
     ToggleDeleteStateRuleCB,
     ToggleDeleteCohortRuleCB,
     DeleteMailingsFinishCB,
+    CampaignCohortCB,
+    CampaignCancelCB,
 )
+from src.dao.cohort import CohortSummary
 from src.models.user import User, State
-from src.models.cohort import Cohort
 from src.models.rule import Regularity, UserRule, StateRule, CohortRule
 
 
@@ -25,6 +28,7 @@ def mailings_menu_keyboard() -> InlineKeyboardMarkup:
     kb.button(text="Список рассылок", callback_data="mailings_list")
     kb.button(text="Добавить рассылку", callback_data="mailings_add")
     kb.button(text="Удалить рассылку", callback_data="mailings_delete")
+    kb.button(text="Разовая рассылка", callback_data="campaigns_add")
     kb.button(text="⬅️ Назад", callback_data="back_to_menu")
     kb.adjust(1)
     return kb.as_markup()
@@ -68,7 +72,7 @@ def select_states_keyboard(selected: set[str]) -> InlineKeyboardMarkup:
     return kb.as_markup()
 
 
-def select_cohorts_keyboard(cohorts: list[Cohort], selected: set[int]) -> InlineKeyboardMarkup:
+def select_cohorts_keyboard(cohorts: list[CohortSummary], selected: set[int]) -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
     for c in cohorts:
         mark = "✅ " if c.id in selected else ""
@@ -91,6 +95,51 @@ def regularity_keyboard() -> InlineKeyboardMarkup:
     return kb.as_markup()
 
 
+# minutes -> button label
+DELIVERY_WINDOWS = {
+    0: "Сразу",
+    60: "В течение часа",
+    120: "В течение 2 часов",
+    360: "В течение 6 часов",
+}
+
+
+def delivery_window_keyboard() -> InlineKeyboardMarkup:
+    kb = InlineKeyboardBuilder()
+    for minutes, label in DELIVERY_WINDOWS.items():
+        kb.button(text=label, callback_data=ChooseDeliveryWindowCB(minutes=minutes).pack())
+    kb.button(text="❌ Отмена", callback_data="mailings_menu")
+    kb.adjust(1)
+    return kb.as_markup()
+
+
+def campaign_cohorts_keyboard(cohorts: list[CohortSummary]) -> InlineKeyboardMarkup:
+    kb = InlineKeyboardBuilder()
+    for c in cohorts:
+        kb.button(
+            text=f"{c.name} ({c.members})",
+            callback_data=CampaignCohortCB(cohort_id=c.id).pack(),
+        )
+    kb.button(text="❌ Отмена", callback_data="mailings_menu")
+    kb.adjust(1)
+    return kb.as_markup()
+
+
+def campaign_confirm_keyboard() -> InlineKeyboardMarkup:
+    kb = InlineKeyboardBuilder()
+    kb.button(text="🚀 Запустить", callback_data="campaign_start")
+    kb.button(text="❌ Отмена", callback_data="mailings_menu")
+    kb.adjust(1)
+    return kb.as_markup()
+
+
+def campaign_progress_keyboard(campaign_id: int) -> InlineKeyboardMarkup:
+    kb = InlineKeyboardBuilder()
+    kb.button(text="⛔ Остановить", callback_data=CampaignCancelCB(campaign_id=campaign_id).pack())
+    kb.adjust(1)
+    return kb.as_markup()
+
+
 def delete_mailings_keyboard(
     user_rules: list[UserRule],
     state_rules: list[StateRule],
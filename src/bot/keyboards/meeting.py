@@ -9,12 +9,17 @@ from src.bot.callbacks.meeting import (
     ChooseMeetingDateCB,
     NavigateMeetingMonthCB,
     ChooseMeetingTimeCB,
+    MeetingsPageCB,
 )
-from src.models.user import User
+from src.bot.keyboards.menu import menu_keyboard
+from src.models.user import Role, User
 from src.models.meeting import Meeting
 
 
-def mentor_meetings_keyboard(meetings: list[Meeting] | None = None) -> InlineKeyboardMarkup:
+def mentor_meetings_keyboard(
+    meetings: list[Meeting] | None = None,
+    next_page: MeetingsPageCB | None = None,
+) -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
     kb.button(text="Добавить созвон", callback_data="meeting_create")
 
@@ -25,11 +30,25 @@ def mentor_meetings_keyboard(meetings: list[Meeting] | None = None) -> InlineKey
                 callback_data=DeleteMeetingCB(meeting_id=meeting.id).pack(),
             )
 
+    if next_page:
+        kb.button(text="Показать ещё", callback_data=next_page.pack())
+
     kb.button(text="⬅️ Назад к меню", callback_data="back_to_menu")
     kb.adjust(1)
     return kb.as_markup()
 
 
+def student_meetings_keyboard(next_page: MeetingsPageCB | None = None) -> InlineKeyboardMarkup:
+    kb = InlineKeyboardBuilder()
+
+    if next_page:
+        kb.button(text="Показать ещё", callback_data=next_page.pack())
+        kb.adjust(1)
+
+    kb.attach(InlineKeyboardBuilder.from_markup(menu_keyboard(Role.student)))
+    return kb.as_markup()
+
+
 def meeting_cancel_keyboard() -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
     kb.button(text="❌ Отмена", callback_data="meeting_create_cancel")
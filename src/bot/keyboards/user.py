@@ -11,8 +11,8 @@ from src.bot.callbacks.update_user import (
     ChooseCohortCB,
     ChooseUserCB,
 )
+from src.dao.cohort import CohortSummary
 from src.models.user import Role, State, User
-from src.models.cohort import Cohort
 
 
 class UserDetailCB(CallbackData, prefix="user"):
@@ -117,7 +117,7 @@ def mentors_keyboard(mentors: list[User]) -> InlineKeyboardMarkup:
 
 
 # 4.5. Клавиатура выбора когорты
-def cohorts_keyboard(cohorts: list[Cohort]) -> InlineKeyboardMarkup:
+def cohorts_keyboard(cohorts: list[CohortSummary]) -> InlineKeyboardMarkup:
     kb = InlineKeyboardBuilder()
 
     for cohort in cohorts:
@@ -0,0 +1,25 @@
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from src.core.database import async_session_maker
+
+
+class DbSessionMiddleware(BaseMiddleware):
+    """
+    One session per update: filters and handlers receive it as `session`
+    and share a single connection checkout. Committed once after the handler.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        async with async_session_maker() as session:
+            data["session"] = session
+            result = await handler(event, data)
+            await session.commit()
+            return result
@@ -0,0 +1,157 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import Response, TelegramType
+from aiogram.types import TelegramObject, Update
+
+from src.core.metrics import Counter, Histogram, registry
+from src.core.query_stats import track_queries
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+LOOP_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+update_seconds = registry.register(Histogram(
+    "bot_update_seconds", "Wall time of one update, middlewares included.", ["event_type"],
+))
+handler_seconds = registry.register(Histogram(
+    "bot_handler_seconds", "Wall time of the handler that took the update.", ["router", "handler"],
+))
+update_db_seconds = registry.register(Histogram(
+    "bot_update_db_seconds", "Time spent in SQL statements per update.", ["event_type"],
+))
+update_db_queries = registry.register(Histogram(
+    "bot_update_db_queries", "SQL statements executed per update.", ["event_type"], buckets=QUERY_COUNT_BUCKETS,
+))
+telegram_api_seconds = registry.register(Histogram(
+    "bot_telegram_api_seconds", "Bot API request time.", ["method"],
+))
+telegram_api_errors = registry.register(Counter(
+    "bot_telegram_api_errors_total", "Bot API requests that raised.", ["method"],
+))
+slow_updates = registry.register(Counter(
+    "bot_slow_updates_total", "Updates slower than the slow-update threshold.", ["event_type"],
+))
+loop_lag_seconds = registry.register(Histogram(
+    "bot_event_loop_lag_seconds", "How late the event loop ran a timer that was due.", buckets=LOOP_LAG_BUCKETS,
+))
+
+
+@dataclass
+class UpdateTrace:
+    handler: str | None = None
+    telegram_calls: int = 0
+    telegram_seconds: float = 0.0
+
+
+_trace: ContextVar[UpdateTrace | None] = ContextVar("update_trace", default=None)
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """
+    Outer update middleware: total time and SQL totals per update, and a log line with the
+    query breakdown for updates slower than slow_seconds. Register it before DbSessionMiddleware
+    so the commit is counted too.
+    """
+
+    def __init__(self, slow_seconds: float):
+        self.slow_seconds = slow_seconds
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        event_type = event.event_type if isinstance(event, Update) else type(event).__name__
+        trace = UpdateTrace()
+        token = _trace.set(trace)
+        started = time.perf_counter()
+        try:
+            with track_queries(breakdown=True) as queries:
+                return await handler(event, data)
+        finally:
+            elapsed = time.perf_counter() - started
+            _trace.reset(token)
+            update_seconds.observe(elapsed, event_type=event_type)
+            update_db_seconds.observe(queries.seconds, event_type=event_type)
+            update_db_queries.observe(queries.queries, event_type=event_type)
+            if elapsed >= self.slow_seconds:
+                slow_updates.inc(event_type=event_type)
+                logger.warning(
+                    "Slow update %s (%s, handler %s): %.0f ms total, db %.0f ms in %s queries, "
+                    "telegram %.0f ms in %s calls; slowest statements:%s",
+                    getattr(event, "update_id", None), event_type, trace.handler, elapsed * 1000,
+                    queries.seconds * 1000, queries.queries, trace.telegram_seconds * 1000, trace.telegram_calls,
+                    "".join(
+                        f"\n  {stats.seconds * 1000:.1f} ms x{stats.queries}: {statement}"
+                        for statement, stats in queries.slowest()
+                    ) or " none",
+                )
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Inner middleware: runs only once a handler matched, so it knows the router and the function."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object: HandlerObject | None = data.get("handler")
+        router = data.get("event_router")
+        router_name = router.name if router is not None else ""
+        handler_name = ""
+        if handler_object is not None:
+            handler_name = getattr(handler_object.callback, "__qualname__", repr(handler_object.callback))
+        trace = _trace.get()
+        if trace is not None:
+            trace.handler = f"{router_name}:{handler_name}"
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            handler_seconds.observe(time.perf_counter() - started, router=router_name, handler=handler_name)
+
+
+class TelegramApiMetricsMiddleware(BaseRequestMiddleware):
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        name = method.__api_method__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception:
+            telegram_api_errors.inc(method=name)
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            telegram_api_seconds.observe(elapsed, method=name)
+            trace = _trace.get()
+            if trace is not None:
+                trace.telegram_calls += 1
+                trace.telegram_seconds += elapsed
+
+
+def setup_metrics(dp: Dispatcher, bot: Bot, *, slow_seconds: float) -> None:
+    """Call before the other outer update middlewares are registered."""
+    dp.update.outer_middleware(UpdateMetricsMiddleware(slow_seconds))
+    handler_metrics = HandlerMetricsMiddleware()
+    # inner middlewares of the dispatcher apply to the handlers of every included router
+    for name, observer in dp.observers.items():
+        if name not in ("update", "error"):
+            observer.middleware(handler_metrics)
+    bot.session.middleware(TelegramApiMetricsMiddleware())
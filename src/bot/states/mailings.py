@@ -11,5 +11,10 @@ class MailingFSM(StatesGroup):
 
     waiting_text = State()
     choosing_regularity = State()
+    choosing_window = State()
 
     deleting_rules = State()
+
+    campaign_choosing_cohort = State()
+    campaign_waiting_text = State()
+    campaign_confirming = State()
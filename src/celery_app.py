@@ -3,6 +3,11 @@ from celery.schedules import crontab
 
 from src.core.config import settings
 
+# tasks a user is waiting on; consumed by a worker of its own so broadcasts can't hold them up
+TRANSACTIONAL_QUEUE = "transactional"
+DEFAULT_QUEUE = "celery"
+# the campaign progress refresh: a few queries every few seconds, never behind a paced bulk send
+PROGRESS_QUEUE = "progress"
 
 celery_app = Celery(
     "golubator",
@@ -11,12 +16,22 @@ celery_app = Celery(
     include=[
         "src.tasks.meeting",
         "src.tasks.notification",
+        "src.tasks.campaign",
     ],
 )
 
 celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
+    task_default_queue=DEFAULT_QUEUE,
+    task_routes={
+        "meeting.notify_created": {"queue": TRANSACTIONAL_QUEUE},
+        "meeting.notify_reminder": {"queue": TRANSACTIONAL_QUEUE},
+        "meeting.complete": {"queue": TRANSACTIONAL_QUEUE},
+        "meeting.delete": {"queue": TRANSACTIONAL_QUEUE},
+        "notifications.send_transactional": {"queue": TRANSACTIONAL_QUEUE},
+        "campaigns.refresh_progress": {"queue": PROGRESS_QUEUE},
+    },
     beat_schedule={
         "meeting.cleanup_stale": {
             "task": "meeting.cleanup_stale",
@@ -26,6 +41,18 @@ celery_app.conf.update(
             "task": "notifications.tick",
             "schedule": crontab(minute="*"),
         },
+        "notifications.send_transactional": {
+            "task": "notifications.send_transactional",
+            "schedule": settings.NOTIFY_TRANSACTIONAL_INTERVAL_SECONDS,
+            # a missed run is superseded by the next one
+            "options": {"expires": settings.NOTIFY_TRANSACTIONAL_INTERVAL_SECONDS},
+        },
+        "campaigns.refresh_progress": {
+            "task": "campaigns.refresh_progress",
+            "schedule": settings.CAMPAIGN_PROGRESS_INTERVAL_SECONDS,
+            # a run that waited too long is superseded by the next one
+            "options": {"expires": settings.CAMPAIGN_PROGRESS_INTERVAL_SECONDS},
+        },
     },
 )
 
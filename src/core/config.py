@@ -15,6 +15,45 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: str
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: int = 2
+    DB_STATEMENT_CACHE_SIZE: int = 256
+
+    API_HOST: str = "0.0.0.0"
+    API_PORT: int = 8000
+    API_WORKERS: int = 1
+    API_KEEPALIVE_TIMEOUT: int = 5
+    API_BACKLOG: int = 2048
+
+    # "telegram" or "recording" (in-memory, nothing leaves the process)
+    NOTIFY_TRANSPORT: str = "telegram"
+    # Bot API base URL override, e.g. a local fake server: http://127.0.0.1:8081
+    TELEGRAM_API_URL: str | None = None
+    NOTIFY_MAX_ATTEMPTS: int = 5
+    NOTIFY_RETRY_BASE_SECONDS: int = 60
+    NOTIFY_RETRY_MAX_SECONDS: int = 6 * 60 * 60
+    # the transactional lane (meeting notices, survey prompts) runs on its own worker queue
+    NOTIFY_TRANSACTIONAL_INTERVAL_SECONDS: float = 10.0
+    # bulk sends are paced below Telegram's ~30 msg/s per bot, the rest is left to the transactional lane
+    NOTIFY_BULK_MESSAGES_PER_SECOND: float = 25.0
+    # quiet hours (Moscow time) given to cohort rules created from the bot; unset: none
+    NOTIFY_QUIET_HOURS_START: int | None = 22
+    NOTIFY_QUIET_HOURS_END: int | None = 9
+    # how often campaign counters are saved and the admins' progress messages edited
+    CAMPAIGN_PROGRESS_INTERVAL_SECONDS: float = 5.0
+
+    # Prometheus /metrics of the bot process; 0 disables the endpoint
+    METRICS_HOST: str = "127.0.0.1"
+    METRICS_PORT: int = 9100
+    SLOW_UPDATE_SECONDS: float = 1.0
+    LOOP_LAG_INTERVAL_SECONDS: float = 0.5
+    # query_budget() violations raise instead of logging a warning
+    QUERY_BUDGET_STRICT: bool = False
+
     REDIS_HOST: str
     REDIS_PORT: int
     ADMIN_USERNAMES: str | None = None
@@ -32,6 +71,12 @@ class Settings(BaseSettings):
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}/0"
 
+    @property
+    def bulk_per_minute(self) -> int | None:
+        """Send budget the bulk fan-outs are planned against; the bulk lane sends at this pace."""
+        rate = self.NOTIFY_BULK_MESSAGES_PER_SECOND
+        return int(rate * 60) if rate > 0 else None
+
     @property
     def admin_usernames(self) -> set[str]:
         if not self.ADMIN_USERNAMES:
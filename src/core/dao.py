@@ -1,49 +1,159 @@
-from sqlalchemy import select, insert, delete, update
+from typing import Any, Iterator, Sequence
 
-from src.core.database import async_session_maker
+from sqlalchemy import select, insert, delete, update, inspect, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import session_scope
+
+BULK_CHUNK_SIZE = 1000
+# asyncpg refuses statements with more than 32767 bind parameters.
+MAX_BIND_PARAMS = 32767
+
+
+def _chunks(rows: Sequence[dict[str, Any]], size: int) -> Iterator[Sequence[dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
 
 
 class BaseDAO:
     model = None
 
     @classmethod
-    async def get_all(cls):
-        async with async_session_maker() as session:
+    async def get_all(cls, *, session: AsyncSession | None = None):
+        async with session_scope(session) as s:
             query = select(cls.model)
-            result = await session.execute(query)
+            result = await s.execute(query)
             return result.scalars().all()
 
     @classmethod
-    async def find_one_or_none(cls, **filter_by):
-        async with async_session_maker() as session:
+    async def find_one_or_none(cls, *, session: AsyncSession | None = None, **filter_by):
+        async with session_scope(session) as s:
             query = select(cls.model).filter_by(**filter_by)
-            result = await session.execute(query)
+            result = await s.execute(query)
             return result.scalars().one_or_none()
 
     @classmethod
-    async def add(cls, **data):
-        async with async_session_maker() as session:
+    async def add(cls, *, session: AsyncSession | None = None, **data):
+        async with session_scope(session, commit=True) as s:
             query = insert(cls.model).values(**data).returning(cls.model)
-            result = await session.execute(query)
-            await session.commit()
+            result = await s.execute(query)
             return result.scalars().first()
 
     @classmethod
-    async def delete(cls, **filter_by):
-        async with async_session_maker() as session:
+    async def delete(cls, *, session: AsyncSession | None = None, **filter_by):
+        async with session_scope(session, commit=True) as s:
             query = delete(cls.model).filter_by(**filter_by)
-            await session.execute(query)
-            await session.commit()
+            await s.execute(query)
 
     @classmethod
-    async def update(cls, id: int, **values):
-        async with async_session_maker() as session:
+    async def update(cls, id: int, *, session: AsyncSession | None = None, **values):
+        async with session_scope(session, commit=True) as s:
             query = (
                 update(cls.model)
                 .where(cls.model.id == id)
                 .values(**values)
                 .returning(cls.model)
             )
-            result = await session.execute(query)
-            await session.commit()
+            result = await s.execute(query)
             return result.scalars().first()
+
+    @classmethod
+    async def add_many(
+        cls,
+        rows: Sequence[dict[str, Any]],
+        *,
+        returning: bool = False,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        session: AsyncSession | None = None,
+    ) -> list:
+        """
+        Insert many rows with one executemany per chunk.
+        Returns the inserted objects when `returning` is set, otherwise [].
+        """
+        if not rows:
+            return []
+        inserted = []
+        async with session_scope(session, commit=True) as s:
+            for chunk in _chunks(rows, chunk_size):
+                if returning:
+                    result = await s.execute(insert(cls.model).returning(cls.model), chunk)
+                    inserted.extend(result.scalars().all())
+                else:
+                    await s.execute(insert(cls.model), chunk)
+        return inserted
+
+    @classmethod
+    async def update_many(
+        cls,
+        rows: Sequence[dict[str, Any]],
+        *,
+        returning: bool = False,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        session: AsyncSession | None = None,
+    ) -> list:
+        """
+        Bulk UPDATE keyed by primary key: every row must carry the PK column(s)
+        plus the values to set. Returns the updated objects when `returning` is set.
+        """
+        if not rows:
+            return []
+        pk_cols = inspect(cls.model).primary_key
+        updated = []
+        async with session_scope(session, commit=True) as s:
+            for chunk in _chunks(rows, chunk_size):
+                await s.execute(update(cls.model), chunk)
+            if returning:
+                for chunk in _chunks(rows, chunk_size):
+                    if len(pk_cols) == 1:
+                        key = pk_cols[0]
+                        query = select(cls.model).where(key.in_([row[key.key] for row in chunk]))
+                    else:
+                        keys = [tuple(row[col.key] for col in pk_cols) for row in chunk]
+                        query = select(cls.model).where(tuple_(*pk_cols).in_(keys))
+                    result = await s.execute(query.execution_options(populate_existing=True))
+                    updated.extend(result.scalars().all())
+        return updated
+
+    @classmethod
+    async def upsert(
+        cls,
+        rows: Sequence[dict[str, Any]],
+        *,
+        conflict_cols: Sequence[str],
+        update_cols: Sequence[str] | None = None,
+        returning: bool = False,
+        chunk_size: int = BULK_CHUNK_SIZE,
+        session: AsyncSession | None = None,
+    ) -> list:
+        """
+        INSERT ... ON CONFLICT (conflict_cols) DO UPDATE as multi-row VALUES.
+        `update_cols` defaults to every non-conflict column present in the rows;
+        an empty sequence means DO NOTHING, and then only inserted rows are returned.
+        Rows repeating a conflict key are collapsed first, the last one wins.
+        """
+        if not rows:
+            return []
+        # DO UPDATE cannot affect a row twice in one statement
+        rows = list({tuple(row[col] for col in conflict_cols): row for row in rows}.values())
+        if update_cols is None:
+            update_cols = [col for col in rows[0] if col not in conflict_cols]
+        chunk_size = min(chunk_size, MAX_BIND_PARAMS // max(len(rows[0]), 1))
+        upserted = []
+        async with session_scope(session, commit=True) as s:
+            for chunk in _chunks(rows, chunk_size):
+                stmt = pg_insert(cls.model).values(list(chunk))
+                if update_cols:
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=list(conflict_cols),
+                        set_={col: stmt.excluded[col] for col in update_cols},
+                    )
+                else:
+                    stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_cols))
+                if returning:
+                    stmt = stmt.returning(cls.model).execution_options(populate_existing=True)
+                    result = await s.execute(stmt)
+                    upserted.extend(result.scalars().all())
+                else:
+                    await s.execute(stmt)
+        return upserted
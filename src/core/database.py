@@ -1,13 +1,78 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 from src.core.config import settings
 
 
-engine = create_async_engine(settings.DATABASE_URL)
+def build_engine(**overrides) -> AsyncEngine:
+    """Create an async engine with pool settings taken from the environment."""
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "connect_args": {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    }
+    options.update(overrides)
+    return create_async_engine(settings.DATABASE_URL, **options)
+
+
+async def warm_up_pool(target: AsyncEngine, connections: int) -> int:
+    """Open up to `connections` pooled connections so the first requests skip the connect handshake."""
+    connections = max(0, min(connections, target.pool.size()))
+    if not connections:
+        return 0
+
+    async def _touch() -> None:
+        async with target.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(_touch() for _ in range(connections)))
+    return connections
+
+
+def pool_status(target: AsyncEngine) -> dict[str, int]:
+    pool = target.pool
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+    }
+
+
+engine = build_engine()
 
 async_session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 
+@asynccontextmanager
+async def session_scope(
+    session: AsyncSession | None = None,
+    *,
+    commit: bool = False,
+) -> AsyncIterator[AsyncSession]:
+    """
+    Unit-of-work helper for DAO methods.
+    A session passed by the caller is reused as is, the caller owns its transaction.
+    Otherwise a short-lived session is opened and, with commit=True, committed on success.
+    """
+    if session is not None:
+        yield session
+        return
+
+    async with async_session_maker() as own_session:
+        yield own_session
+        if commit:
+            await own_session.commit()
+
+
 class Base(DeclarativeBase):
     pass
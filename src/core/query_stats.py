@@ -0,0 +1,152 @@
+import functools
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    seconds: float = 0.0
+    # statement text -> its own totals; filled only by track_queries(breakdown=True)
+    statements: dict[str, "QueryStats"] | None = field(default=None, repr=False)
+
+    def slowest(self, limit: int = 5) -> list[tuple[str, "QueryStats"]]:
+        if not self.statements:
+            return []
+        return sorted(self.statements.items(), key=lambda item: item[1].seconds, reverse=True)[:limit]
+
+
+# every enclosing track_queries() block, so nested blocks each see the statements
+_active: ContextVar[tuple[QueryStats, ...]] = ContextVar("query_stats", default=())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if _active.get():
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    active = _active.get()
+    if not active:
+        return
+    elapsed = 0.0
+    started = conn.info.get("query_started_at")
+    if started:
+        elapsed = time.perf_counter() - started.pop()
+    text = None
+    for stats in active:
+        stats.seconds += elapsed
+        stats.queries += 1
+        if stats.statements is not None:
+            text = text or " ".join(statement.split())[:200]
+            per_statement = stats.statements.setdefault(text, QueryStats())
+            per_statement.seconds += elapsed
+            per_statement.queries += 1
+
+
+def _install() -> None:
+    # listening on the Engine class covers the per-task engines as well as the shared one
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def track_queries(*, breakdown: bool = False) -> Iterator[QueryStats]:
+    """
+    Count statements (an executemany is one round trip) and their time within the block.
+    Async engines are covered too: SQLAlchemy runs the driver calls in the caller's context.
+    With breakdown the totals are also kept per statement text.
+    """
+    _install()
+    stats = QueryStats(statements={} if breakdown else None)
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class query_budget:
+    """
+    Statement budget for a block or a function (sync or async):
+
+        @query_budget(3)
+        async def handler(...): ...
+
+    Running more than max_queries statements, or one statement text more than max_repeats
+    times (the N+1 shape), raises QueryBudgetExceeded with QUERY_BUDGET_STRICT (tests)
+    and is logged as a warning otherwise.
+    """
+
+    def __init__(self, max_queries: int, *, max_repeats: int = 1, name: str | None = None):
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.name = name
+        self._tracker = None
+
+    def __enter__(self) -> QueryStats:
+        self._tracker = track_queries(breakdown=True)
+        self.stats = self._tracker.__enter__()
+        return self.stats
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._tracker.__exit__(exc_type, exc, tb)
+        if exc_type is None:
+            self.check(self.stats)
+
+    def check(self, stats: QueryStats) -> None:
+        problems = []
+        if stats.queries > self.max_queries:
+            problems.append(f"{stats.queries} statements, budget {self.max_queries}")
+        problems.extend(
+            f"{per_statement.queries}x: {statement}"
+            for statement, per_statement in (stats.statements or {}).items()
+            if per_statement.queries > self.max_repeats
+        )
+        if not problems:
+            return
+        message = f"Query budget of {self.name or 'block'} exceeded: " + "; ".join(problems)
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    def __call__(self, func: F) -> F:
+        name = self.name or func.__qualname__
+
+        def budget() -> "query_budget":
+            # a fresh instance per call: the decorated function may run concurrently
+            return query_budget(self.max_queries, max_repeats=self.max_repeats, name=name)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with budget():
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with budget():
+                return func(*args, **kwargs)
+
+        return wrapper
@@ -2,9 +2,10 @@ from datetime import datetime, timezone
 from typing import Optional
 
 from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.dao import BaseDAO
-from src.core.database import async_session_maker
+from src.core.database import session_scope
 from src.models.call import Call, CallStatus
 
 
@@ -12,26 +13,37 @@ class CallDAO(BaseDAO):
     model = Call
 
     @classmethod
-    async def get_active_for_mentor(cls, mentor_id: int) -> Optional[Call]:
+    async def get_active_for_mentor(
+        cls,
+        mentor_id: int,
+        *,
+        session: AsyncSession | None = None,
+    ) -> Optional[Call]:
         """Return the ongoing call where this user is the mentor, or None."""
-        async with async_session_maker() as session:
+        async with session_scope(session) as s:
             query = (
                 select(Call)
                 .where(Call.mentor_id == mentor_id, Call.status == CallStatus.ongoing)
                 .order_by(Call.started_at.desc())
                 .limit(1)
             )
-            result = await session.execute(query)
+            result = await s.execute(query)
             return result.scalar_one_or_none()
 
     @classmethod
-    async def finish_call(cls, call_id: int, mentor_id: int) -> Optional[Call]:
+    async def finish_call(
+        cls,
+        call_id: int,
+        mentor_id: int,
+        *,
+        session: AsyncSession | None = None,
+    ) -> Optional[Call]:
         """
         Close the call only if it belongs to the given mentor and is still ongoing.
         Sets status=finished and ended_at=now().
         Returns the updated Call or None if not found / not allowed.
         """
-        async with async_session_maker() as session:
+        async with session_scope(session, commit=True) as s:
             query = (
                 update(Call)
                 .where(
@@ -45,6 +57,5 @@ class CallDAO(BaseDAO):
                 )
                 .returning(Call)
             )
-            result = await session.execute(query)
-            await session.commit()
+            result = await s.execute(query)
             return result.scalar_one_or_none()
@@ -0,0 +1,267 @@
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from sqlalchemy import ColumnElement, Row, delete, exists, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dao import BaseDAO
+from src.core.database import session_scope
+from src.dao.notification import NotificationDAO, NotificationPayloadDAO, slot_values, stagger
+from src.models.campaign import Campaign, CampaignStatus
+from src.models.notification import Notification, NotificationDeadLetter
+from src.models.user import User
+from src.utils.delivery_plan import Broadcast, plan_broadcasts
+
+
+def _in_progress(now: datetime, settle: timedelta) -> ColumnElement[bool]:
+    """Running campaigns, and those cancelled within `settle`."""
+    return (Campaign.status == CampaignStatus.running) | (
+        (Campaign.status == CampaignStatus.cancelled) & (Campaign.finished_at >= now - settle)
+    )
+
+
+class CampaignDAO(BaseDAO):
+    model = Campaign
+
+    @classmethod
+    async def start(
+        cls,
+        *,
+        name: str | None,
+        text: str,
+        cohort_id: int,
+        author_id: int,
+        now: datetime,
+        per_minute: int | None = None,
+        quiet_hours: tuple[int, int] | None = None,
+        progress_chat_id: int | None = None,
+        progress_message_id: int | None = None,
+        session: AsyncSession | None = None,
+    ) -> Campaign:
+        """
+        Create the campaign and materialize its recipient set in one INSERT ... SELECT: a bulk
+        notification per reachable member of the cohort, referencing the shared payload.
+        Recipients are staggered by plan_broadcasts against the same send budget as cohort rules.
+        """
+        reachable_member = (User.cohort_id == cohort_id) & User.is_reachable.is_(True)
+        now_value = literal(now, Notification.scheduled_at.type)
+        async with session_scope(session, commit=True) as s:
+            recipients = (await s.execute(
+                select(func.count()).select_from(User).where(reachable_member)
+            )).scalar_one()
+            campaign = (await s.execute(
+                insert(Campaign)
+                .values(
+                    name=name,
+                    text=text,
+                    cohort_id=cohort_id,
+                    author_id=author_id,
+                    status=CampaignStatus.running if recipients else CampaignStatus.finished,
+                    recipients=recipients,
+                    queued=recipients,
+                    progress_chat_id=progress_chat_id,
+                    progress_message_id=progress_message_id,
+                    finished_at=None if recipients else now,
+                )
+                .returning(Campaign)
+            )).scalar_one()
+            if not recipients:
+                return campaign
+
+            payload_id = (await NotificationPayloadDAO.get_or_create_ids([text], session=s))[text]
+            booked = await NotificationDAO.booked_bulk_minutes(now=now, session=s)
+            plan = plan_broadcasts(
+                [Broadcast(key=campaign.id, recipients=recipients, quiet_hours=quiet_hours)],
+                now=now,
+                per_minute=per_minute,
+                booked=booked,
+            )
+            slots = slot_values(plan)
+            ranked = (
+                select(
+                    User.telegram_id,
+                    literal(campaign.id).label("campaign_id"),
+                    func.row_number().over(order_by=User.telegram_id).label("rank"),
+                )
+                .where(reachable_member)
+                .subquery("ranked")
+            )
+            in_slot, scheduled_at = stagger(slots, ranked.c.campaign_id, ranked.c.rank, now_value)
+            created = (
+                insert(Notification)
+                .from_select(
+                    ["user_id", "payload_id", "campaign_id", "scheduled_at"],
+                    select(ranked.c.telegram_id, literal(payload_id), ranked.c.campaign_id, scheduled_at)
+                    .outerjoin(slots, in_slot),
+                )
+                .returning(Notification.id)
+                .cte("campaign_notifications")
+            )
+            materialized = (await s.execute(select(func.count()).select_from(created))).scalar_one()
+            if materialized != recipients:
+                # the cohort changed between the count and the insert
+                campaign.recipients = campaign.queued = materialized
+            return campaign
+
+    @classmethod
+    async def cancel(
+        cls,
+        campaign_id: int,
+        *,
+        now: datetime,
+        session: AsyncSession | None = None,
+    ) -> int | None:
+        """
+        Stop a running campaign and delete its queued notifications in the same statement.
+        Returns how many were dropped, None if the campaign was not running. Rows of a batch
+        being sent are locked by the sender (NotificationDAO.claim) and skipped here without
+        waiting: the sender sees the cancel and drops them itself, so each row is counted once.
+        """
+        cancelled = (
+            update(Campaign)
+            .where(Campaign.id == campaign_id, Campaign.status == CampaignStatus.running)
+            .values(status=CampaignStatus.cancelled, finished_at=now)
+            .returning(Campaign.id)
+            .cte("cancelled_campaign")
+        )
+        unclaimed = (
+            select(Notification.id)
+            .where(Notification.campaign_id.in_(select(cancelled.c.id)))
+            .with_for_update(skip_locked=True)
+        )
+        dropped = (
+            delete(Notification)
+            .where(Notification.id.in_(unclaimed))
+            .returning(Notification.payload_id)
+            .cte("dropped_notifications")
+        )
+        async with session_scope(session, commit=True) as s:
+            was_running, count, payload_id = (await s.execute(
+                select(
+                    select(func.count()).select_from(cancelled).scalar_subquery(),
+                    func.count(),
+                    func.max(dropped.c.payload_id),
+                )
+                .select_from(dropped)
+            )).one()
+            if not was_running:
+                return None
+            if payload_id is not None:
+                await NotificationPayloadDAO.delete_unreferenced([payload_id], session=s)
+            return count
+
+    @classmethod
+    async def get_ended_ids(
+        cls,
+        campaign_ids: Iterable[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> set[int]:
+        """Those of the campaigns that are no longer running."""
+        campaign_ids = list(set(campaign_ids))
+        if not campaign_ids:
+            return set()
+        async with session_scope(session) as s:
+            result = await s.execute(
+                select(Campaign.id).where(Campaign.id.in_(campaign_ids), Campaign.status != CampaignStatus.running)
+            )
+            return set(result.scalars().all())
+
+    @classmethod
+    async def get_for_progress(
+        cls,
+        *,
+        now: datetime,
+        settle: timedelta,
+        session: AsyncSession | None = None,
+    ) -> list[Row]:
+        """
+        Campaigns whose counters can still move: running ones, and those cancelled within
+        `settle` (rows a sender held at the cancel are dropped and counted late). has_queued tells
+        whether any of the campaign's notifications is left. A finished campaign already has
+        its final numbers from get_final_counts().
+        """
+        async with session_scope(session) as s:
+            result = await s.execute(
+                select(
+                    Campaign,
+                    exists().where(Notification.campaign_id == Campaign.id).label("has_queued"),
+                )
+                .where(_in_progress(now, settle))
+                .order_by(Campaign.id)
+            )
+            return list(result.all())
+
+    @classmethod
+    async def has_in_progress(
+        cls,
+        *,
+        now: datetime,
+        settle: timedelta,
+        session: AsyncSession | None = None,
+    ) -> bool:
+        """Whether get_for_progress() has anything to return, without probing the notifications."""
+        async with session_scope(session) as s:
+            result = await s.execute(select(exists().where(_in_progress(now, settle))))
+            return bool(result.scalar())
+
+    @classmethod
+    async def get_final_counts(
+        cls,
+        campaign_ids: Iterable[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> dict[int, dict[str, int]]:
+        """
+        Counters of campaigns with no notification left, from the database alone: what did not
+        end in a dead letter was sent. Dead letters of users who are unreachable now count as
+        blocked, the rest as failed.
+        """
+        campaign_ids = list(set(campaign_ids))
+        if not campaign_ids:
+            return {}
+        is_blocked = User.is_reachable.is_(False)
+        dead_letters = (
+            select(
+                NotificationDeadLetter.campaign_id,
+                func.count().filter(~is_blocked).label("failed"),
+                func.count().filter(is_blocked).label("blocked"),
+            )
+            .outerjoin(User, User.telegram_id == NotificationDeadLetter.user_id)
+            .where(NotificationDeadLetter.campaign_id.in_(campaign_ids))
+            .group_by(NotificationDeadLetter.campaign_id)
+            .subquery("dead_letters")
+        )
+        failed = func.coalesce(dead_letters.c.failed, 0)
+        blocked = func.coalesce(dead_letters.c.blocked, 0)
+        async with session_scope(session) as s:
+            result = await s.execute(
+                select(Campaign.id, Campaign.recipients - Campaign.dropped - failed - blocked, failed, blocked)
+                .outerjoin(dead_letters, dead_letters.c.campaign_id == Campaign.id)
+                .where(Campaign.id.in_(campaign_ids))
+            )
+            return {
+                campaign_id: {"queued": 0, "sent": sent, "failed": failed, "blocked": blocked}
+                for campaign_id, sent, failed, blocked in result.all()
+            }
+
+    @classmethod
+    async def save_progress(
+        cls,
+        counters: list[dict[str, Any]],
+        finished_ids: Iterable[int],
+        *,
+        now: datetime,
+        session: AsyncSession | None = None,
+    ) -> None:
+        """Store the flushed counters (rows keyed by id) and close the campaigns that ran out of notifications."""
+        finished_ids = list(finished_ids)
+        async with session_scope(session, commit=True) as s:
+            await cls.update_many(counters, session=s)
+            if finished_ids:
+                # a cancel that got there first wins
+                await s.execute(
+                    update(Campaign)
+                    .where(Campaign.id.in_(finished_ids), Campaign.status == CampaignStatus.running)
+                    .values(status=CampaignStatus.finished, finished_at=now)
+                )
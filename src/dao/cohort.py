@@ -1,6 +1,102 @@
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+
 from src.core.dao import BaseDAO
+from src.core.database import session_scope
 from src.models.cohort import Cohort
+from src.models.user import Role, State, User
+
+# students who are learning or looking for a job
+ACTIVE_STATES = (State.study, State.search)
+SUMMARY_TTL_SECONDS = 30
+
+
+@dataclass(frozen=True)
+class CohortSummary:
+    id: int
+    name: str
+    members: int
+    active_students: int
 
 
 class CohortDAO(BaseDAO):
     model = Cohort
+
+    # (expires_at, summaries); cohorts change rarely, the pickers are opened often
+    _summary_cache: tuple[float, list[CohortSummary]] | None = None
+
+    @classmethod
+    def invalidate_summaries(cls) -> None:
+        cls._summary_cache = None
+
+    @classmethod
+    def invalidate_summaries_on_commit(cls, session: AsyncSession) -> None:
+        """
+        Drop the cached summaries once the session's transaction commits; dropped earlier,
+        a picker opened in between would cache the old counts again for the whole TTL.
+        """
+        event.listen(session.sync_session, "after_commit", lambda _: cls.invalidate_summaries(), once=True)
+
+    @classmethod
+    async def get_summaries(cls, *, session: AsyncSession | None = None) -> list[CohortSummary]:
+        """Every cohort with its member counts in one GROUP BY, cached for SUMMARY_TTL_SECONDS."""
+        cached = cls._summary_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+
+        is_active_student = (User.role == Role.student) & User.state.in_(ACTIVE_STATES)
+        async with session_scope(session) as s:
+            result = await s.execute(
+                select(
+                    Cohort.id,
+                    Cohort.name,
+                    func.count(User.telegram_id),
+                    func.count(User.telegram_id).filter(is_active_student),
+                )
+                .outerjoin(User, User.cohort_id == Cohort.id)
+                .group_by(Cohort.id)
+                .order_by(Cohort.name, Cohort.id)
+            )
+            summaries = [CohortSummary(*row) for row in result.all()]
+
+        cls._summary_cache = (time.monotonic() + SUMMARY_TTL_SECONDS, summaries)
+        return summaries
+
+    @classmethod
+    async def get_members(
+        cls,
+        cohort_id: int,
+        *,
+        after: int | None = None,
+        limit: int = 20,
+        session: AsyncSession | None = None,
+    ) -> list[User]:
+        """One page of members ordered by telegram_id; after is the last id of the previous page."""
+        async with session_scope(session) as s:
+            query = (
+                select(User)
+                .where(User.cohort_id == cohort_id)
+                .options(raiseload("*"))
+                .order_by(User.telegram_id)
+                .limit(limit)
+            )
+            if after is not None:
+                query = query.where(User.telegram_id > after)
+            result = await s.execute(query)
+            return list(result.scalars().all())
+
+    @classmethod
+    async def add(cls, *, session: AsyncSession | None = None, **data):
+        async with session_scope(session, commit=True) as s:
+            cls.invalidate_summaries_on_commit(s)
+            return await super().add(session=s, **data)
+
+    @classmethod
+    async def delete(cls, *, session: AsyncSession | None = None, **filter_by):
+        async with session_scope(session, commit=True) as s:
+            cls.invalidate_summaries_on_commit(s)
+            return await super().delete(session=s, **filter_by)
@@ -1,12 +1,27 @@
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
-from sqlalchemy import select, insert, delete, text, update
-from sqlalchemy.orm import joinedload
+from sqlalchemy import select, insert, delete, or_, tuple_, update
+from sqlalchemy.orm import joinedload, raiseload
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.dao import BaseDAO
-from src.core.database import async_session_maker
+from src.core.database import session_scope
+from src.core.query_stats import query_budget
 from src.models.meeting import Meeting, MeetingUser
+from src.models.user import Role
+
+# scheduled_at holds MSK wall time, shift "now" instead of the column so the range stays index-friendly
+MSK_OFFSET = timedelta(hours=3)
+
+
+def with_roles():
+    """Load mentor and student rows only, without the participants/User selectin cascade."""
+    return (
+        joinedload(Meeting.mentor).raiseload("*"),
+        joinedload(Meeting.student).raiseload("*"),
+        raiseload("*"),
+    )
 
 
 class MeetingDAO(BaseDAO):
@@ -21,99 +36,129 @@ class MeetingDAO(BaseDAO):
         scheduled_at: datetime | None,
         mentor_id: int,
         student_id: int,
+        session: AsyncSession | None = None,
     ) -> Meeting:
-        async with async_session_maker() as session:
+        async with session_scope(session, commit=True) as s:
             meeting_stmt = (
                 insert(Meeting)
                 .values(
                     description=description,
                     meeting_link=meeting_link,
                     scheduled_at=scheduled_at,
+                    mentor_id=mentor_id,
+                    student_id=student_id,
                 )
-                .returning(Meeting)
+                .returning(Meeting.id)
             )
-            meeting_res = await session.execute(meeting_stmt)
-            meeting: Meeting = meeting_res.scalar_one()
+            meeting_res = await s.execute(meeting_stmt)
+            meeting_id: int = meeting_res.scalar_one()
 
             participants_stmt = insert(MeetingUser).values(
                 [
-                    {"meeting_id": meeting.id, "user_id": mentor_id},
-                    {"meeting_id": meeting.id, "user_id": student_id},
+                    {"meeting_id": meeting_id, "user_id": mentor_id},
+                    {"meeting_id": meeting_id, "user_id": student_id},
                 ]
             )
-            await session.execute(participants_stmt)
-            await session.commit()
+            await s.execute(participants_stmt)
 
-            # reload with participants
             query = (
                 select(Meeting)
-                .where(Meeting.id == meeting.id)
-                .options(joinedload(Meeting.participants))
+                .where(Meeting.id == meeting_id)
+                .options(*with_roles())
             )
-            result = await session.execute(query)
-            result = result.unique()
+            result = await s.execute(query)
             return result.scalar_one()
 
     @classmethod
-    async def get_for_user(cls, user_id: int, *, hide_past: bool = False) -> list[Meeting]:
-        async with async_session_maker() as session:
+    @query_budget(1)
+    async def get_for_user(
+        cls,
+        user_id: int,
+        *,
+        role: Role | None = None,
+        hide_past: bool = False,
+        after: tuple[datetime, int] | None = None,
+        limit: int | None = None,
+        session: AsyncSession | None = None,
+    ) -> list[Meeting]:
+        """
+        Meetings of the user ordered by (scheduled_at, id).
+        role narrows to meetings where the user is the mentor/student,
+        after is the keyset cursor (scheduled_at, id) of the last row of the previous page.
+        """
+        if role == Role.mentor:
+            owner = Meeting.mentor_id == user_id
+        elif role == Role.student:
+            owner = Meeting.student_id == user_id
+        else:
+            owner = or_(Meeting.mentor_id == user_id, Meeting.student_id == user_id)
+
+        async with session_scope(session) as s:
             query = (
                 select(Meeting)
-                .join(MeetingUser, MeetingUser.meeting_id == Meeting.id)
-                .where(MeetingUser.user_id == user_id)
-                .options(joinedload(Meeting.participants))
-                .order_by(Meeting.created_at.desc())
+                .where(owner)
+                .options(*with_roles())
+                .order_by(Meeting.scheduled_at.asc().nulls_last(), Meeting.id.asc())
             )
             if hide_past:
-                now = datetime.now(timezone.utc)
-                query = query.where((Meeting.scheduled_at - text("interval '3 hours'")) > now)
-            res = await session.execute(query)
-            res = res.unique()
-            return res.scalars().all()
+                query = query.where(Meeting.scheduled_at > datetime.now(timezone.utc) + MSK_OFFSET)
+            if after:
+                query = query.where(tuple_(Meeting.scheduled_at, Meeting.id) > tuple_(*after))
+            if limit:
+                query = query.limit(limit)
+            res = await s.execute(query)
+            return list(res.scalars().all())
 
     @classmethod
-    async def get_with_participants(cls, meeting_id: int) -> Optional[Meeting]:
-        async with async_session_maker() as session:
+    async def get_with_participants(
+        cls,
+        meeting_id: int,
+        *,
+        session: AsyncSession | None = None,
+    ) -> Optional[Meeting]:
+        async with session_scope(session) as s:
             query = (
                 select(Meeting)
                 .where(Meeting.id == meeting_id)
-                .options(joinedload(Meeting.participants))
+                .options(*with_roles())
             )
-            res = await session.execute(query)
-            res = res.unique()
+            res = await s.execute(query)
             return res.scalar_one_or_none()
 
     @classmethod
-    async def delete_for_mentor(cls, meeting_id: int, mentor_id: int) -> bool:
-        async with async_session_maker() as session:
-            # ensure mentor is participant of meeting
-            query = (
-                select(Meeting)
-                .join(MeetingUser, MeetingUser.meeting_id == Meeting.id)
-                .where(Meeting.id == meeting_id, MeetingUser.user_id == mentor_id)
+    async def delete_for_mentor(
+        cls,
+        meeting_id: int,
+        mentor_id: int,
+        *,
+        session: AsyncSession | None = None,
+    ) -> bool:
+        async with session_scope(session, commit=True) as s:
+            stmt = (
+                delete(Meeting)
+                .where(Meeting.id == meeting_id, Meeting.mentor_id == mentor_id)
+                .returning(Meeting.id)
             )
-            result = await session.execute(query)
-            meeting = result.scalar_one_or_none()
-            if not meeting:
-                return False
-
-            await session.execute(delete(Meeting).where(Meeting.id == meeting_id))
-            await session.commit()
-            return True
+            result = await s.execute(stmt)
+            return result.scalar_one_or_none() is not None
 
     @classmethod
-    async def purge_older_than(cls, cutoff: datetime) -> int:
+    async def purge_older_than(
+        cls,
+        cutoff: datetime,
+        *,
+        session: AsyncSession | None = None,
+    ) -> int:
         if cutoff.tzinfo is None:
             cutoff = cutoff.replace(tzinfo=timezone.utc)
-        async with async_session_maker() as session:
+        async with session_scope(session, commit=True) as s:
             stmt = (
                 update(Meeting)
                 .where(
-                    (Meeting.scheduled_at - text("interval '3 hours'")) <= cutoff,
+                    Meeting.scheduled_at <= cutoff + MSK_OFFSET,
                     Meeting.completed_at.is_(None),
                 )
                 .values(completed_at=cutoff, survey_available_at=cutoff)
             )
-            res = await session.execute(stmt)
-            await session.commit()
+            res = await s.execute(stmt)
             return res.rowcount or 0
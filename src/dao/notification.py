@@ -0,0 +1,455 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from sqlalchemy import ColumnElement, DateTime, Float, Integer, Values, case, column, delete, exists, func, insert, literal, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.dao import BaseDAO
+from src.core.database import session_scope
+from src.models.notification import Notification, NotificationDeadLetter, NotificationPayload, Priority
+from src.models.rule import REGULARITY_TO_DELTA, CohortRule, Regularity, StateRule, UserRule
+from src.models.user import User
+from src.utils.delivery_plan import Broadcast, Slot, floor_minute, plan_broadcasts
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _period(regularity: ColumnElement[Regularity]) -> ColumnElement:
+    return case(
+        {value: literal(delta) for value, delta in REGULARITY_TO_DELTA.items()},
+        value=regularity,
+    )
+
+
+def _is_due(rule: type[UserRule] | type[CohortRule], now: ColumnElement) -> ColumnElement[bool]:
+    return rule.regularity.in_(list(REGULARITY_TO_DELTA)) & (
+        rule.last_sent_at.is_(None) | (rule.last_sent_at + _period(rule.regularity) <= now)
+    )
+
+
+def slot_values(plan: list[Slot]) -> Values:
+    return values(
+        column("key", Integer),
+        column("first", Integer),
+        column("last", Integer),
+        column("starts_at", DateTime(timezone=True)),
+        column("step", Float),
+        name="slots",
+    ).data([
+        (slot.key, slot.first, slot.first + slot.count - 1, slot.starts_at, slot.step_seconds)
+        for slot in plan
+    ])
+
+
+def stagger(
+    slots: Values,
+    key: ColumnElement[int],
+    rank: ColumnElement[int],
+    now: ColumnElement[datetime],
+) -> tuple[ColumnElement[bool], ColumnElement[datetime]]:
+    """
+    Join condition of a recipient (ranked 1.. within its broadcast) to its slot, and the
+    scheduled_at that slot gives it. Recipients who joined after the count have no slot
+    and go out now, unstaggered.
+    """
+    in_slot = (slots.c.key == key) & rank.between(slots.c.first, slots.c.last)
+    scheduled_at = func.coalesce(
+        slots.c.starts_at + func.make_interval(0, 0, 0, 0, 0, 0, (rank - slots.c.first) * slots.c.step),
+        now,
+    )
+    return in_slot, scheduled_at
+
+
+class NotificationDAO(BaseDAO):
+    model = Notification
+
+    @classmethod
+    async def booked_bulk_minutes(cls, *, now: datetime, session: AsyncSession | None = None) -> dict[datetime, int]:
+        """Bulk notifications already scheduled per minute from now on: the send budget they have taken."""
+        booked_minute = func.date_trunc("minute", Notification.scheduled_at)
+        async with session_scope(session) as s:
+            result = await s.execute(
+                select(booked_minute, func.count())
+                .where(Notification.priority == Priority.bulk, Notification.scheduled_at >= floor_minute(now))
+                .group_by(booked_minute)
+            )
+            return dict(result.all())
+
+    @classmethod
+    async def schedule_state_rules(
+        cls,
+        *,
+        now: datetime,
+        user_ids: Iterable[int] | None = None,
+        rule_ids: Iterable[int] | None = None,
+        session: AsyncSession | None = None,
+    ) -> int:
+        """
+        Give users the recurring notification of every state rule matching their current state,
+        first firing at state_changed_at + offset_days (or now, if that has passed).
+        With user_ids (a state transition) their pending state-rule notifications are cancelled
+        first; with rule_ids (new rules) only those rules are scheduled.
+        """
+        user_ids = None if user_ids is None else list(set(user_ids))
+        rule_ids = None if rule_ids is None else list(set(rule_ids))
+        if user_ids == [] or rule_ids == []:
+            return 0
+
+        async with session_scope(session, commit=True) as s:
+            if user_ids is not None:
+                await s.execute(
+                    delete(Notification).where(
+                        Notification.user_id.in_(user_ids),
+                        Notification.state_rule_id.is_not(None),
+                    )
+                )
+
+            rules_query = select(StateRule.id, StateRule.text)
+            if rule_ids is not None:
+                rules_query = rules_query.where(StateRule.id.in_(rule_ids))
+            rules = (await s.execute(rules_query)).all()
+            if not rules:
+                return 0
+            payload_ids = await NotificationPayloadDAO.get_or_create_ids(
+                [text for _, text in rules], session=s,
+            )
+            rule_payloads = values(
+                column("rule_id", Integer), column("payload_id", Integer), name="rule_payloads",
+            ).data([(rule_id, payload_ids[text]) for rule_id, text in rules])
+
+            first_fire = func.greatest(
+                User.state_changed_at + func.make_interval(0, 0, 0, func.coalesce(StateRule.offset_days, 0)),
+                literal(now, Notification.scheduled_at.type),
+            )
+            recipients = (
+                select(User.telegram_id, rule_payloads.c.payload_id, StateRule.id, first_fire)
+                .join(StateRule, StateRule.user_state == User.state)
+                .join(rule_payloads, rule_payloads.c.rule_id == StateRule.id)
+                .where(User.state_changed_at.is_not(None), User.is_reachable.is_(True))
+            )
+            if user_ids is not None:
+                recipients = recipients.where(User.telegram_id.in_(user_ids))
+
+            result = await s.execute(
+                insert(Notification).from_select(
+                    ["user_id", "payload_id", "state_rule_id", "scheduled_at"], recipients,
+                )
+            )
+            return result.rowcount or 0
+
+    @classmethod
+    async def create_for_user_rules(cls, *, now: datetime, session: AsyncSession | None = None) -> int:
+        """
+        One statement for every due individual rule: stamp last_sent_at and write
+        the notification of its (reachable) user.
+        """
+        now_value = literal(now, UserRule.last_sent_at.type)
+        due = (
+            update(UserRule)
+            .where(
+                UserRule.user_id == User.telegram_id,
+                User.is_reachable.is_(True),
+                _is_due(UserRule, now_value),
+                UserRule.start_at.is_(None) | (UserRule.start_at <= now_value),
+                UserRule.end_at.is_(None) | (UserRule.end_at >= now_value),
+            )
+            .values(last_sent_at=now_value)
+            .returning(UserRule.user_id, UserRule.text)
+            .cte("due_user_rules")
+        )
+        created = (
+            insert(Notification)
+            .from_select(["user_id", "text", "scheduled_at"], select(due.c.user_id, due.c.text, now_value))
+            .returning(Notification.id)
+            .cte("user_rule_notifications")
+        )
+        async with session_scope(session, commit=True) as s:
+            result = await s.execute(select(func.count()).select_from(created))
+            return result.scalar_one()
+
+    @classmethod
+    async def create_for_cohort_rules(
+        cls,
+        *,
+        now: datetime,
+        per_minute: int | None = None,
+        session: AsyncSession | None = None,
+    ) -> int:
+        """
+        Fan every due cohort rule out to the reachable members of its cohort; a rule whose
+        cohort has no one to write to keeps its last_sent_at.
+        Recipients get staggered scheduled_at slots from plan_broadcasts: at most per_minute
+        bulk notifications per minute (counting the ones already booked), within each
+        rule's delivery window and outside its quiet hours.
+        """
+        now_value = literal(now, CohortRule.last_sent_at.type)
+        async with session_scope(session, commit=True) as s:
+            rules = (await s.execute(
+                select(
+                    CohortRule.id,
+                    CohortRule.text,
+                    CohortRule.delivery_window_minutes,
+                    CohortRule.quiet_hours_start,
+                    CohortRule.quiet_hours_end,
+                    func.count(User.telegram_id),
+                )
+                .join(User, (User.cohort_id == CohortRule.cohort_id) & User.is_reachable.is_(True))
+                .where(_is_due(CohortRule, now_value))
+                .group_by(CohortRule.id)
+                .order_by(CohortRule.id)
+            )).all()
+            if not rules:
+                return 0
+            payload_ids = await NotificationPayloadDAO.get_or_create_ids([rule.text for rule in rules], session=s)
+            rule_payloads = values(
+                column("rule_id", Integer), column("payload_id", Integer), name="rule_payloads",
+            ).data([(rule.id, payload_ids[rule.text]) for rule in rules])
+
+            booked = await cls.booked_bulk_minutes(now=now, session=s)
+            plan = plan_broadcasts(
+                [
+                    Broadcast(
+                        key=rule_id,
+                        recipients=recipients,
+                        window=timedelta(minutes=window) if window else None,
+                        quiet_hours=(quiet_start, quiet_end) if quiet_start is not None else None,
+                    )
+                    for rule_id, _, window, quiet_start, quiet_end, recipients in rules
+                ],
+                now=now,
+                per_minute=per_minute,
+                booked=booked,
+            )
+            slots = slot_values(plan)
+
+            reachable_member = exists().where(User.cohort_id == CohortRule.cohort_id, User.is_reachable.is_(True))
+            due = (
+                update(CohortRule)
+                .where(CohortRule.id == rule_payloads.c.rule_id, reachable_member)
+                .values(last_sent_at=now_value)
+                .returning(CohortRule.id, CohortRule.cohort_id, rule_payloads.c.payload_id)
+                .cte("due_cohort_rules")
+            )
+            ranked = (
+                select(
+                    User.telegram_id,
+                    due.c.id.label("rule_id"),
+                    due.c.payload_id,
+                    func.row_number().over(partition_by=due.c.id, order_by=User.telegram_id).label("rank"),
+                )
+                .join(due, due.c.cohort_id == User.cohort_id)
+                .where(User.is_reachable.is_(True))
+                .subquery("ranked")
+            )
+            in_slot, scheduled_at = stagger(slots, ranked.c.rule_id, ranked.c.rank, now_value)
+            created = (
+                insert(Notification)
+                .from_select(
+                    ["user_id", "payload_id", "scheduled_at"],
+                    select(ranked.c.telegram_id, ranked.c.payload_id, scheduled_at).outerjoin(slots, in_slot),
+                )
+                .returning(Notification.id)
+                .cte("cohort_rule_notifications")
+            )
+            result = await s.execute(select(func.count()).select_from(created))
+            return result.scalar_one()
+
+    @classmethod
+    async def reschedule_state_rules(
+        cls,
+        ids: Iterable[int],
+        *,
+        now: datetime,
+        session: AsyncSession | None = None,
+    ) -> int:
+        """Move delivered state-rule notifications to their rule's next period instead of deleting them."""
+        ids = list(set(ids))
+        if not ids:
+            return 0
+        period = _period(StateRule.regularity)
+        async with session_scope(session, commit=True) as s:
+            result = await s.execute(
+                update(Notification)
+                .where(Notification.id.in_(ids), Notification.state_rule_id == StateRule.id)
+                .values(
+                    scheduled_at=literal(now, Notification.scheduled_at.type) + period,
+                    attempts=0,
+                    next_attempt_at=None,
+                    last_error=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            return result.rowcount or 0
+
+    @classmethod
+    async def claim(
+        cls,
+        ids: Iterable[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> set[int]:
+        """
+        Lock the notifications of a batch about to be sent until the caller commits, and return
+        the ids that are still there. Rows deleted since they were read (a campaign cancel) or
+        locked by another transaction are left out, so nobody sends what was dropped.
+        """
+        ids = list(set(ids))
+        if not ids:
+            return set()
+        async with session_scope(session) as s:
+            result = await s.execute(
+                select(Notification.id)
+                .where(Notification.id.in_(ids))
+                .with_for_update(skip_locked=True)
+            )
+            return set(result.scalars().all())
+
+    @classmethod
+    async def dead_letter(
+        cls,
+        ids: Iterable[int],
+        *,
+        keep: bool = False,
+        session: AsyncSession | None = None,
+    ) -> int:
+        """
+        Move the given notifications to the dead-letter table. With keep they are only copied
+        there: a state rule's row stays, the caller moves it to the next period.
+        """
+        ids = list(set(ids))
+        if not ids:
+            return 0
+        return await cls._move_to_dead_letters(Notification.id.in_(ids), keep=keep, session=session)
+
+    @classmethod
+    async def dead_letter_for_users(
+        cls,
+        user_ids: Iterable[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> int:
+        """Move every pending notification of these users to the dead-letter table."""
+        user_ids = list(set(user_ids))
+        if not user_ids:
+            return 0
+        return await cls._move_to_dead_letters(Notification.user_id.in_(user_ids), session=session)
+
+    @classmethod
+    async def _move_to_dead_letters(
+        cls,
+        condition: ColumnElement[bool],
+        *,
+        keep: bool = False,
+        session: AsyncSession | None = None,
+    ) -> int:
+        # payload texts are copied, so dead letters never keep a payload alive
+        rows = (
+            select(
+                Notification.id,
+                Notification.user_id,
+                func.coalesce(Notification.text, NotificationPayload.text),
+                Notification.campaign_id,
+                Notification.scheduled_at,
+                Notification.priority,
+                Notification.attempts,
+                Notification.last_error,
+            )
+            .outerjoin(NotificationPayload, NotificationPayload.id == Notification.payload_id)
+            .where(condition)
+        )
+        async with session_scope(session, commit=True) as s:
+            copied = await s.execute(
+                insert(NotificationDeadLetter).from_select(
+                    [
+                        "notification_id", "user_id", "text", "campaign_id", "scheduled_at", "priority", "attempts",
+                        "last_error",
+                    ],
+                    rows,
+                )
+            )
+            if keep:
+                return copied.rowcount or 0
+            result = await s.execute(delete(Notification).where(condition))
+            return result.rowcount or 0
+
+
+class NotificationPayloadDAO(BaseDAO):
+    model = NotificationPayload
+
+    @classmethod
+    async def get_or_create_ids(
+        cls,
+        texts: Iterable[str],
+        *,
+        session: AsyncSession | None = None,
+    ) -> dict[str, int]:
+        """
+        Map each text to its payload id, storing unseen texts once.
+        Rows are KEY SHARE locked until the caller commits, so a concurrent
+        garbage collection can't remove a payload that is about to be referenced.
+        """
+        by_hash = {content_hash(text): text for text in texts}
+        if not by_hash:
+            return {}
+        async with session_scope(session, commit=True) as s:
+            await s.execute(
+                pg_insert(NotificationPayload)
+                .values([{"content_hash": h, "text": text} for h, text in by_hash.items()])
+                .on_conflict_do_nothing(index_elements=["content_hash"])
+            )
+            result = await s.execute(
+                select(NotificationPayload.content_hash, NotificationPayload.id)
+                .where(NotificationPayload.content_hash.in_(list(by_hash)))
+                .with_for_update(key_share=True, read=True)
+            )
+            return {by_hash[h]: payload_id for h, payload_id in result.all()}
+
+    @classmethod
+    async def get_texts(
+        cls,
+        ids: Iterable[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> dict[int, str]:
+        ids = list(set(ids))
+        if not ids:
+            return {}
+        async with session_scope(session) as s:
+            result = await s.execute(
+                select(NotificationPayload.id, NotificationPayload.text)
+                .where(NotificationPayload.id.in_(ids))
+            )
+            return dict(result.all())
+
+    @classmethod
+    async def delete_unreferenced(
+        cls,
+        ids: Iterable[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> int:
+        """
+        Drop the given payloads once no notification points at them.
+        References are counted by an index probe at delete time instead of a stored
+        counter; payloads locked by an in-flight fan-out are skipped.
+        """
+        ids = list(set(ids))
+        if not ids:
+            return 0
+        candidates = (
+            select(NotificationPayload.id)
+            .where(
+                NotificationPayload.id.in_(ids),
+                ~exists().where(Notification.payload_id == NotificationPayload.id),
+            )
+            .with_for_update(skip_locked=True)
+        )
+        async with session_scope(session, commit=True) as s:
+            result = await s.execute(
+                delete(NotificationPayload).where(NotificationPayload.id.in_(candidates))
+            )
+            return result.rowcount or 0
@@ -1,9 +1,12 @@
+from datetime import datetime, timezone
 from typing import Iterable
 
 from sqlalchemy import insert, select
 from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import async_session_maker
+from src.core.database import session_scope
+from src.dao.notification import NotificationDAO
 from src.models.rule import UserRule, StateRule, CohortRule, Regularity
 from src.models.user import State
 
@@ -17,8 +20,9 @@ class RuleDAO:
         text: str,
         regularity: Regularity,
         author_id: int,
+        session: AsyncSession | None = None,
     ) -> list[UserRule]:
-        async with async_session_maker() as session:
+        async with session_scope(session, commit=True) as s:
             values = [
                 {
                     "user_id": uid,
@@ -30,8 +34,7 @@ class RuleDAO:
                 for uid in user_ids
             ]
             stmt = insert(UserRule).values(values).returning(UserRule)
-            res = await session.execute(stmt)
-            await session.commit()
+            res = await s.execute(stmt)
             return list(res.scalars().all())
 
     @staticmethod
@@ -43,8 +46,9 @@ class RuleDAO:
         regularity: Regularity,
         author_id: int,
         offset_days: int | None,
+        session: AsyncSession | None = None,
     ) -> list[StateRule]:
-        async with async_session_maker() as session:
+        async with session_scope(session, commit=True) as s:
             values = [
                 {
                     "user_state": state,
@@ -57,44 +61,50 @@ class RuleDAO:
                 for state in states
             ]
             stmt = insert(StateRule).values(values).returning(StateRule)
-            res = await session.execute(stmt)
-            await session.commit()
-            return list(res.scalars().all())
+            res = await s.execute(stmt)
+            rules = list(res.scalars().all())
+            # users already in these states are due from now on
+            await NotificationDAO.schedule_state_rules(
+                now=datetime.now(timezone.utc), rule_ids=[rule.id for rule in rules], session=s,
+            )
+            return rules
 
     @staticmethod
-    async def list_user_rules() -> list[UserRule]:
-        async with async_session_maker() as session:
+    async def list_user_rules(*, session: AsyncSession | None = None) -> list[UserRule]:
+        async with session_scope(session) as s:
             query = (
                 select(UserRule)
-                .options(joinedload(UserRule.user))
-                .options(joinedload(UserRule.author))
+                .options(joinedload(UserRule.user).raiseload("*"))
+                .options(joinedload(UserRule.author).raiseload("*"))
                 .order_by(UserRule.id.desc())
             )
-            res = await session.execute(query)
+            res = await s.execute(query)
             res = res.unique()
             return list(res.scalars().all())
 
     @staticmethod
-    async def delete_user_rules(ids: Iterable[int]) -> None:
-        async with async_session_maker() as session:
-            await session.execute(UserRule.__table__.delete().where(UserRule.id.in_(list(ids))))
-            await session.commit()
+    async def delete_user_rules(ids: Iterable[int], *, session: AsyncSession | None = None) -> None:
+        async with session_scope(session, commit=True) as s:
+            await s.execute(UserRule.__table__.delete().where(UserRule.id.in_(list(ids))))
 
     @staticmethod
-    async def delete_state_rules(ids: Iterable[int]) -> None:
-        async with async_session_maker() as session:
-            await session.execute(StateRule.__table__.delete().where(StateRule.id.in_(list(ids))))
-            await session.commit()
+    async def delete_state_rules(
+        ids: Iterable[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> None:
+        async with session_scope(session, commit=True) as s:
+            await s.execute(StateRule.__table__.delete().where(StateRule.id.in_(list(ids))))
 
     @staticmethod
-    async def list_state_rules() -> list[StateRule]:
-        async with async_session_maker() as session:
+    async def list_state_rules(*, session: AsyncSession | None = None) -> list[StateRule]:
+        async with session_scope(session) as s:
             query = (
                 select(StateRule)
-                .options(joinedload(StateRule.author))
+                .options(joinedload(StateRule.author).raiseload("*"))
                 .order_by(StateRule.id.desc())
             )
-            res = await session.execute(query)
+            res = await s.execute(query)
             res = res.unique()
             return list(res.scalars().all())
 
@@ -107,8 +117,12 @@ class RuleDAO:
         text: str,
         regularity: Regularity,
         author_id: int,
+        delivery_window_minutes: int | None = None,
+        quiet_hours: tuple[int, int] | None = None,
+        session: AsyncSession | None = None,
     ) -> list[CohortRule]:
-        async with async_session_maker() as session:
+        quiet_start, quiet_end = quiet_hours or (None, None)
+        async with session_scope(session, commit=True) as s:
             values = [
                 {
                     "cohort_id": cid,
@@ -116,29 +130,34 @@ class RuleDAO:
                     "text": text,
                     "regularity": regularity,
                     "author_id": author_id,
+                    "delivery_window_minutes": delivery_window_minutes,
+                    "quiet_hours_start": quiet_start,
+                    "quiet_hours_end": quiet_end,
                 }
                 for cid in cohort_ids
             ]
             stmt = insert(CohortRule).values(values).returning(CohortRule)
-            res = await session.execute(stmt)
-            await session.commit()
+            res = await s.execute(stmt)
             return list(res.scalars().all())
 
     @staticmethod
-    async def list_cohort_rules() -> list[CohortRule]:
-        async with async_session_maker() as session:
+    async def list_cohort_rules(*, session: AsyncSession | None = None) -> list[CohortRule]:
+        async with session_scope(session) as s:
             query = (
                 select(CohortRule)
-                .options(joinedload(CohortRule.author))
+                .options(joinedload(CohortRule.author).raiseload("*"))
                 .options(joinedload(CohortRule.cohort))
                 .order_by(CohortRule.id.desc())
             )
-            res = await session.execute(query)
+            res = await s.execute(query)
             res = res.unique()
             return list(res.scalars().all())
 
     @staticmethod
-    async def delete_cohort_rules(ids: Iterable[int]) -> None:
-        async with async_session_maker() as session:
-            await session.execute(CohortRule.__table__.delete().where(CohortRule.id.in_(list(ids))))
-            await session.commit()
+    async def delete_cohort_rules(
+        ids: Iterable[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> None:
+        async with session_scope(session, commit=True) as s:
+            await s.execute(CohortRule.__table__.delete().where(CohortRule.id.in_(list(ids))))
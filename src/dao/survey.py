@@ -1,35 +1,70 @@
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import Integer, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
 
-from src.core.database import async_session_maker
+from src.core.database import session_scope
 from src.models.meeting import Meeting
 from src.models.survey import SurveyResponse
 
 
 class SurveyDAO:
     @classmethod
-    async def get_call_with_participants(cls, call_id: int) -> Optional[Meeting]:
-        async with async_session_maker() as session:
+    async def get_call_with_response(
+        cls,
+        call_id: int,
+        *,
+        session: AsyncSession | None = None,
+    ) -> Optional[Meeting]:
+        async with session_scope(session) as s:
             query = (
                 select(Meeting)
                 .where(Meeting.id == call_id)
                 .options(
-                    joinedload(Meeting.participants),
-                    joinedload(Meeting.survey_response),
+                    joinedload(Meeting.survey_response).raiseload("*"),
+                    raiseload("*"),
                 )
             )
-            result = await session.execute(query)
-            result = result.unique()
+            result = await s.execute(query)
             return result.scalar_one_or_none()
 
     @classmethod
-    async def get_response(cls, call_id: int) -> Optional[SurveyResponse]:
-        async with async_session_maker() as session:
+    async def get_statuses(
+        cls,
+        call_ids: list[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> list[tuple[int, bool, bool]]:
+        """
+        Resolve survey flags for many calls in one round-trip.
+        Returns (call_id, survey_open, has_response) for every call that exists.
+        """
+        async with session_scope(session) as s:
+            query = (
+                select(
+                    Meeting.id,
+                    (Meeting.completed_at.is_not(None) & Meeting.survey_available_at.is_not(None)),
+                    SurveyResponse.id.is_not(None),
+                )
+                .outerjoin(SurveyResponse, SurveyResponse.call_id == Meeting.id)
+                .where(Meeting.id == any_(bindparam("call_ids", call_ids, type_=ARRAY(Integer))))
+            )
+            result = await s.execute(query)
+            return [tuple(row) for row in result.all()]
+
+    @classmethod
+    async def get_response(
+        cls,
+        call_id: int,
+        *,
+        session: AsyncSession | None = None,
+    ) -> Optional[SurveyResponse]:
+        async with session_scope(session) as s:
             query = select(SurveyResponse).where(SurveyResponse.call_id == call_id)
-            result = await session.execute(query)
+            result = await s.execute(query)
             return result.scalar_one_or_none()
 
     @classmethod
@@ -43,31 +78,35 @@ class SurveyDAO:
         knowledge_depth: int,
         understanding: int,
         comment: str | None,
+        session: AsyncSession | None = None,
     ) -> tuple[SurveyResponse, bool]:
-        async with async_session_maker() as session:
-            try:
-                async with session.begin():
-                    existing = await session.execute(
-                        select(SurveyResponse).where(SurveyResponse.call_id == call_id)
-                    )
-                    existing_response = existing.scalar_one_or_none()
-                    if existing_response:
-                        return existing_response, True
-
-                    response = SurveyResponse(
-                        call_id=call_id,
-                        student_id=student_id,
-                        duration_option=duration_option,
-                        mentor_style=mentor_style,
-                        knowledge_depth=knowledge_depth,
-                        understanding=understanding,
-                        comment=comment,
-                    )
+        """
+        Insert the response once per call. Returns (response, already_existed).
+        The insert runs in a savepoint, so a concurrent duplicate only rolls back
+        this step and leaves the caller's unit of work usable.
+        """
+        async with session_scope(session, commit=True) as s:
+            existing = await s.execute(
+                select(SurveyResponse).where(SurveyResponse.call_id == call_id)
+            )
+            existing_response = existing.scalar_one_or_none()
+            if existing_response:
+                return existing_response, True
 
-                    session.add(response)
+            response = SurveyResponse(
+                call_id=call_id,
+                student_id=student_id,
+                duration_option=duration_option,
+                mentor_style=mentor_style,
+                knowledge_depth=knowledge_depth,
+                understanding=understanding,
+                comment=comment,
+            )
+            try:
+                async with s.begin_nested():
+                    s.add(response)
             except IntegrityError:
-                await session.rollback()
-                existing = await session.execute(
+                existing = await s.execute(
                     select(SurveyResponse).where(SurveyResponse.call_id == call_id)
                 )
                 existing_response = existing.scalar_one_or_none()
@@ -75,5 +114,5 @@ class SurveyDAO:
                     return existing_response, True
                 raise
 
-            await session.refresh(response)
+            await s.refresh(response)
             return response, False
@@ -1,40 +1,179 @@
-from sqlalchemy import select, insert, delete, update
-from sqlalchemy.orm import joinedload
+from datetime import datetime, timedelta
+from typing import Sequence
 
-from src.core.dao import BaseDAO
-from src.models.user import User
+from sqlalchemy import Interval, Text, case, column, insert, literal_column, select, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload
 
-from src.core.database import async_session_maker
+from src.core.dao import BaseDAO
+from src.core.database import session_scope
+from src.core.query_stats import query_budget
+from src.dao.notification import NotificationDAO
+from src.models.notification import Notification
+from src.models.user import Role, State, User
 
 
 class UserDAO(BaseDAO):
     model = User
 
     @classmethod
-    async def get_all(cls, **filter_by):
-        async with async_session_maker() as session:
+    @query_budget(1)
+    async def get_all(cls, *, session: AsyncSession | None = None, **filter_by):
+        """Users with cohort and mentor; other relationships raise instead of cascading selectin loads."""
+        async with session_scope(session) as s:
             query = (
                 select(cls.model)
                 .filter_by(**filter_by)
                 .options(
                     joinedload(cls.model.cohort),
-                    joinedload(cls.model.mentor),
-                    joinedload(cls.model.meetings)
+                    joinedload(cls.model.mentor).raiseload("*"),
+                    raiseload("*"),
                 )
             )
-            result = await session.execute(query)
-            result = result.unique()
+            result = await s.execute(query)
             return result.scalars().all()
 
     @classmethod
-    async def update(cls, telegram_id: int, **values):
-        async with async_session_maker() as session:
+    async def get_role(cls, telegram_id: int, *, session: AsyncSession | None = None) -> Role | None:
+        """Role column only: loading the User row would also pull its selectin relationships."""
+        async with session_scope(session) as s:
+            result = await s.execute(select(User.role).where(User.telegram_id == telegram_id))
+            return result.scalar_one_or_none()
+
+    @classmethod
+    async def update(cls, telegram_id: int, *, session: AsyncSession | None = None, **values):
+        async with session_scope(session, commit=True) as s:
             query = (
                 update(cls.model)
                 .where(cls.model.telegram_id == telegram_id)
                 .values(**values)
                 .returning(cls.model)
             )
-            result = await session.execute(query)
-            await session.commit()
+            result = await s.execute(query)
             return result.scalars().first()
+
+    @classmethod
+    async def set_state(
+        cls,
+        telegram_id: int,
+        state: State,
+        *,
+        changed_at: datetime,
+        session: AsyncSession | None = None,
+    ) -> User | None:
+        """
+        State transition: stamps state_changed_at and swaps the user's pending
+        state-rule notifications for the ones of the new state. No-op if the state is unchanged.
+        """
+        async with session_scope(session, commit=True) as s:
+            result = await s.execute(
+                update(User)
+                .where(User.telegram_id == telegram_id, User.state.is_distinct_from(state))
+                .values(state=state, state_changed_at=changed_at)
+                .returning(User)
+            )
+            user = result.scalars().first()
+            if user is not None:
+                await NotificationDAO.schedule_state_rules(now=changed_at, user_ids=[telegram_id], session=s)
+            return user
+
+    @classmethod
+    async def register(
+        cls,
+        *,
+        telegram_id: int,
+        username: str | None,
+        name: str,
+        is_admin: bool,
+        registered_at: datetime,
+        onboarding: Sequence[tuple[str, timedelta]] = (),
+        session: AsyncSession | None = None,
+    ) -> bool:
+        """
+        /start in one statement: insert the user or, for a configured admin, promote
+        the existing one and mark it reachable again; onboarding notifications are
+        written only for a new row.
+        Returns True when the user was created.
+        """
+        upsert = pg_insert(User).values(
+            telegram_id=telegram_id,
+            username=username,
+            name=name,
+            role=Role.admin if is_admin else Role.student,
+            state=State.greeting,
+            registered_at=registered_at,
+        )
+        # Known users are not touched at all unless they must become admin or were
+        # marked unreachable (/start proves the chat works), so repeated /start does not rewrite the row.
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[User.telegram_id],
+            set_={
+                "role": case((upsert.excluded.role == Role.admin, Role.admin), else_=User.role),
+                "is_reachable": True,
+                "unreachable_reason": None,
+                "reachability_changed_at": case(
+                    (User.is_reachable.is_(False), upsert.excluded.registered_at),
+                    else_=User.reachability_changed_at,
+                ),
+            },
+            where=((upsert.excluded.role == Role.admin) & (User.role != Role.admin)) | User.is_reachable.is_(False),
+        ).returning(
+            User.telegram_id,
+            User.registered_at,
+            literal_column("xmax = 0").label("inserted"),
+        ).cte("upserted")
+
+        query = select(upsert.c.inserted)
+        if onboarding:
+            schedule = values(
+                column("text", Text), column("delay", Interval), name="onboarding",
+            ).data(list(onboarding))
+            notifications = insert(Notification).from_select(
+                ["user_id", "text", "scheduled_at"],
+                select(upsert.c.telegram_id, schedule.c.text, upsert.c.registered_at + schedule.c.delay)
+                .where(upsert.c.inserted),
+            ).cte("onboarding_notifications")
+            query = query.add_cte(notifications)
+
+        async with session_scope(session, commit=True) as s:
+            result = await s.execute(query)
+            return bool(result.scalar_one_or_none())
+
+    @classmethod
+    async def mark_unreachable(
+        cls,
+        reasons: dict[int, str],
+        *,
+        changed_at: datetime,
+        session: AsyncSession | None = None,
+    ) -> None:
+        """Record telegram_id -> reason (blocked, deactivated, ...) for chats we can't write to."""
+        by_reason: dict[str, list[int]] = {}
+        for telegram_id, reason in reasons.items():
+            by_reason.setdefault(reason, []).append(telegram_id)
+        async with session_scope(session, commit=True) as s:
+            for reason, telegram_ids in by_reason.items():
+                await s.execute(
+                    update(User)
+                    .where(User.telegram_id.in_(telegram_ids), User.is_reachable.is_(True))
+                    .values(is_reachable=False, unreachable_reason=reason, reachability_changed_at=changed_at)
+                )
+
+    @classmethod
+    async def mark_reachable(
+        cls,
+        telegram_id: int,
+        *,
+        changed_at: datetime,
+        session: AsyncSession | None = None,
+    ) -> None:
+        async with session_scope(session, commit=True) as s:
+            result = await s.execute(
+                update(User)
+                .where(User.telegram_id == telegram_id, User.is_reachable.is_(False))
+                .values(is_reachable=True, unreachable_reason=None, reachability_changed_at=changed_at)
+            )
+            if result.rowcount:
+                # state-rule notifications were dead-lettered with the rest of the user's queue
+                await NotificationDAO.schedule_state_rules(now=changed_at, user_ids=[telegram_id], session=s)
@@ -6,16 +6,22 @@ from aiogram.fsm.storage.redis import RedisStorage
 
 from src.bot.handlers.common.start import router as start_router
 from src.bot.handlers.common.menu import router as menu_router
+from src.bot.handlers.common.chat_member import router as chat_member_router
 from src.bot.handlers.cohort.create import router as cohort_create_router
 from src.bot.handlers.cohort.delete import router as cohort_delete_router
 from src.bot.handlers.cohort.list import router as cohort_list_router
 from src.bot.handlers.user.list import router as user_router
 from src.bot.handlers.user.update_user import router as update_user_fsm_router
 from src.bot.handlers.meeting import router as meeting_router
-from src.bot.handlers.mailings import router as mailings_router
+from src.bot.handlers.mailings import campaign_counters, router as mailings_router
+from src.bot.filters.callback_route import callback_routes
+from src.bot.middlewares.db import DbSessionMiddleware
+from src.bot.middlewares.metrics import loop_lag_seconds, setup_metrics
 
 
 from src.core.config import settings
+from src.core.metrics import monitor_loop_lag, start_metrics_server
+from src.utils.task_publisher import task_publisher
 
 
 async def main():
@@ -24,9 +30,12 @@ async def main():
 
     storage = RedisStorage.from_url(settings.REDIS_URL)
     dp = Dispatcher(storage=storage)
+    setup_metrics(dp, bot, slow_seconds=settings.SLOW_UPDATE_SECONDS)
+    dp.update.outer_middleware(DbSessionMiddleware())
 
     dp.include_routers(
         start_router,
+        chat_member_router,
         menu_router,
         cohort_create_router,
         cohort_list_router,
@@ -36,8 +45,23 @@ async def main():
         meeting_router,
         mailings_router,
     )
+    # after include_routers: the index is built from the registered handlers
+    callback_routes.build(dp.sub_routers)
 
-    await dp.start_polling(bot)
+    metrics_runner = None
+    if settings.METRICS_PORT:
+        metrics_runner = await start_metrics_server(settings.METRICS_HOST, settings.METRICS_PORT)
+    lag_probe = asyncio.create_task(monitor_loop_lag(loop_lag_seconds, settings.LOOP_LAG_INTERVAL_SECONDS))
+
+    try:
+        await dp.start_polling(bot)
+    finally:
+        lag_probe.cancel()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
+        # tasks enqueued by the last handlers are still in the publisher queue
+        await task_publisher.close()
+        await campaign_counters.close()
 
 
 if __name__ == "__main__":
@@ -1,7 +1,8 @@
 from src.models.user import User
 from src.models.cohort import Cohort
-from src.models.notification import Notification
+from src.models.notification import Notification, NotificationDeadLetter, NotificationPayload
 from src.models.meeting import Meeting, MeetingUser
 from src.models.survey import SurveyResponse
 from src.models.call import Call, CallStatus
 from src.models.rule import UserRule, StateRule, CohortRule
+from src.models.campaign import Campaign, CampaignStatus
@@ -0,0 +1,76 @@
+import enum
+from typing import Optional
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Enum, ForeignKey, Integer, String, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core.database import Base
+
+
+class CampaignStatus(enum.Enum):
+    running = "running"
+    finished = "finished"
+    cancelled = "cancelled"
+
+
+class Campaign(Base):
+    """
+    One-off broadcast to a cohort. Its notifications point back at it, so progress is counted
+    per campaign and a cancel drops what is still queued. The live counters are kept in Redis
+    (src.services.campaign) and copied here on every progress flush.
+    """
+
+    __tablename__ = "campaigns"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[Optional[str]] = mapped_column(
+        String(255), nullable=True
+    )
+    text: Mapped[str] = mapped_column(
+        Text, nullable=False
+    )
+    cohort_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger, ForeignKey("cohorts.id", ondelete="SET NULL"), nullable=True,
+    )
+    author_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger, ForeignKey("users.telegram_id", ondelete="SET NULL"), nullable=True,
+    )
+    status: Mapped[CampaignStatus] = mapped_column(
+        Enum(CampaignStatus, name="campaign_status_enum"),
+        nullable=False, default=CampaignStatus.running, server_default=CampaignStatus.running.name,
+    )
+    # notifications materialized at start
+    recipients: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0",
+    )
+    # as of the last progress flush
+    queued: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0",
+    )
+    sent: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0",
+    )
+    failed: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0",
+    )
+    blocked: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0",
+    )
+    # queued notifications dropped by a cancel
+    dropped: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0",
+    )
+    # the admin's message that shows the progress
+    progress_chat_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger, nullable=True
+    )
+    progress_message_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(),
+    )
+    finished_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
@@ -17,6 +17,7 @@ class Cohort(Base):
         String(255), nullable=False
     )
 
+    # never loaded implicitly: use CohortDAO.get_summaries / get_members
     users: Mapped[List["User"]] = relationship(
-        "User", back_populates="cohort", passive_deletes=True, lazy="selectin",
+        "User", back_populates="cohort", passive_deletes=True, lazy="raise",
     )
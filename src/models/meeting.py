@@ -1,7 +1,7 @@
 from typing import Optional
 from datetime import datetime
 from sqlalchemy import (
-    Integer, BigInteger, Text, String, DateTime, ForeignKey, func, UniqueConstraint
+    Integer, BigInteger, Text, String, DateTime, ForeignKey, Index, func, UniqueConstraint
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from src.core.database import Base
@@ -10,6 +10,11 @@ from src.core.database import Base
 class Meeting(Base):
     __tablename__ = "meetings"
 
+    __table_args__ = (
+        Index("ix_meetings_mentor_schedule", "mentor_id", "scheduled_at", "id"),
+        Index("ix_meetings_student_schedule", "student_id", "scheduled_at", "id"),
+    )
+
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True
     )
@@ -31,6 +36,12 @@ class Meeting(Base):
     survey_available_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    mentor_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger, ForeignKey("users.telegram_id", ondelete="SET NULL"), nullable=True,
+    )
+    student_id: Mapped[Optional[int]] = mapped_column(
+        BigInteger, ForeignKey("users.telegram_id", ondelete="SET NULL"), nullable=True,
+    )
 
     participants: Mapped[list["User"]] = relationship(
         "User", secondary="meeting_users", back_populates="meetings", lazy="selectin",
@@ -38,6 +49,12 @@ class Meeting(Base):
     survey_response: Mapped[Optional["SurveyResponse"]] = relationship(
         "SurveyResponse", back_populates="meeting", uselist=False, lazy="selectin",
     )
+    mentor: Mapped[Optional["User"]] = relationship(
+        "User", foreign_keys=[mentor_id],
+    )
+    student: Mapped[Optional["User"]] = relationship(
+        "User", foreign_keys=[student_id],
+    )
 
 class MeetingUser(Base):
     __tablename__ = "meeting_users"
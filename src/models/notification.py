@@ -1,24 +1,90 @@
+import enum
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import BigInteger, Integer, Text, DateTime, ForeignKey, func
+from sqlalchemy import BigInteger, CheckConstraint, Enum, Index, Integer, String, Text, DateTime, ForeignKey, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
 
 
+class Priority(enum.Enum):
+    # replies to something the user did or is about to do: meeting notices, survey prompts
+    transactional = "transactional"
+    # rule and onboarding broadcasts
+    bulk = "bulk"
+
+
+class NotificationPayload(Base):
+    """Broadcast text stored once and referenced by every notification of the fan-out."""
+
+    __tablename__ = "notification_payloads"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    content_hash: Mapped[str] = mapped_column(
+        String(64), unique=True, nullable=False
+    )
+    text: Mapped[str] = mapped_column(
+        Text, nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(),
+    )
+
+
 class Notification(Base):
     __tablename__ = "notifications"
 
+    __table_args__ = (
+        CheckConstraint(
+            "text IS NOT NULL OR payload_id IS NOT NULL", name="ck_notifications_text_or_payload",
+        ),
+        # a state transition cancels the user's pending state-rule notifications
+        Index("ix_notifications_user_state_rule", "user_id", postgresql_where=text("state_rule_id IS NOT NULL")),
+        # the transactional lane never scans the bulk backlog
+        Index(
+            "ix_notifications_transactional_due",
+            "scheduled_at",
+            postgresql_where=text("priority = 'transactional'"),
+        ),
+        # a campaign cancel deletes its queued rows in one statement
+        Index("ix_notifications_campaign", "campaign_id", postgresql_where=text("campaign_id IS NOT NULL")),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("users.telegram_id", ondelete="CASCADE"), nullable=False,
     )
-    text: Mapped[str] = mapped_column(
-        Text, nullable=False
+    # personal texts are stored inline, broadcasts reference a shared payload
+    text: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True
+    )
+    payload_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("notification_payloads.id"), nullable=True, index=True,
+    )
+    # set for the recurring notification a state rule keeps for a user in that state
+    state_rule_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("state_rules.id", ondelete="CASCADE"), nullable=True, index=True,
+    )
+    # set for the notifications of a one-off campaign
+    campaign_id: Mapped[Optional[int]] = mapped_column(
+        Integer, ForeignKey("campaigns.id", ondelete="CASCADE"), nullable=True,
     )
     scheduled_at: Mapped[Optional[datetime]] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    priority: Mapped[Priority] = mapped_column(
+        Enum(Priority, name="notification_priority_enum"),
+        nullable=False, default=Priority.bulk, server_default=Priority.bulk.name,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0",
+    )
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True
+    )
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), nullable=False, server_default=func.now(),
     )
@@ -26,3 +92,40 @@ class Notification(Base):
     user: Mapped["User"] = relationship(
         "User", back_populates="notifications", lazy="selectin",
     )
+
+
+class NotificationDeadLetter(Base):
+    """Notifications that will never be delivered, kept for inspection."""
+
+    __tablename__ = "notification_dead_letters"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    notification_id: Mapped[int] = mapped_column(
+        Integer, nullable=False
+    )
+    user_id: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, index=True,
+    )
+    text: Mapped[str] = mapped_column(
+        Text, nullable=False
+    )
+    # a campaign's final numbers are counted from its dead letters
+    campaign_id: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )
+    scheduled_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    priority: Mapped[Priority] = mapped_column(
+        Enum(Priority, name="notification_priority_enum"),
+        nullable=False, default=Priority.bulk, server_default=Priority.bulk.name,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer, nullable=False
+    )
+    last_error: Mapped[Optional[str]] = mapped_column(
+        Text, nullable=True
+    )
+    failed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now(),
+    )
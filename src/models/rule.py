@@ -1,7 +1,7 @@
 import enum
 from typing import Optional
-from datetime import datetime
-from sqlalchemy import Integer, Text, DateTime, ForeignKey, Enum, func, BigInteger, String
+from datetime import datetime, timedelta
+from sqlalchemy import CheckConstraint, Integer, SmallInteger, Text, DateTime, ForeignKey, Enum, func, BigInteger, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.models.user import State, User
@@ -16,6 +16,14 @@ class Regularity(enum.Enum):
     month = "month"
 
 
+REGULARITY_TO_DELTA = {
+    Regularity.day: timedelta(days=1),
+    Regularity.week: timedelta(days=7),
+    Regularity.fortnight: timedelta(days=14),
+    Regularity.month: timedelta(days=30),
+}
+
+
 class UserRule(Base):
     __tablename__ = "user_rules"
 
@@ -91,6 +99,15 @@ class StateRule(Base):
 class CohortRule(Base):
     __tablename__ = "cohort_rules"
 
+    __table_args__ = (
+        CheckConstraint(
+            "(quiet_hours_start IS NULL) = (quiet_hours_end IS NULL)"
+            " AND quiet_hours_start BETWEEN 0 AND 23 AND quiet_hours_end BETWEEN 0 AND 23"
+            " AND quiet_hours_start <> quiet_hours_end",
+            name="ck_cohort_rules_quiet_hours",
+        ),
+    )
+
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     cohort_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("cohorts.id", ondelete="CASCADE"), nullable=False
@@ -110,6 +127,17 @@ class CohortRule(Base):
     author_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("users.telegram_id", ondelete="SET NULL"), nullable=False,
     )
+    # the fan-out is spread over this many minutes instead of going out at once
+    delivery_window_minutes: Mapped[Optional[int]] = mapped_column(
+        Integer, nullable=True
+    )
+    # nothing is delivered in [start, end) Moscow time; may wrap midnight
+    quiet_hours_start: Mapped[Optional[int]] = mapped_column(
+        SmallInteger, nullable=True
+    )
+    quiet_hours_end: Mapped[Optional[int]] = mapped_column(
+        SmallInteger, nullable=True
+    )
 
     cohort: Mapped["Cohort"] = relationship("Cohort", lazy="selectin")
     author: Mapped["User"] = relationship("User")
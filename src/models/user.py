@@ -2,7 +2,7 @@ import enum
 from datetime import datetime
 from typing import List, Optional
 
-from sqlalchemy import String, DateTime, func, Enum, ForeignKey, Integer, BigInteger
+from sqlalchemy import Boolean, String, DateTime, func, Enum, ForeignKey, Index, Integer, BigInteger, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.core.database import Base
@@ -25,6 +25,14 @@ class State(enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
+    __table_args__ = (
+        # rule fan-out only ever selects reachable users
+        Index("ix_users_cohort_reachable", "cohort_id", postgresql_where=text("is_reachable")),
+        Index("ix_users_state_reachable", "state", "state_changed_at", postgresql_where=text("is_reachable")),
+        # the sender only needs the (few) unreachable ones
+        Index("ix_users_unreachable", "telegram_id", postgresql_where=text("NOT is_reachable")),
+    )
+
     telegram_id: Mapped[int] = mapped_column(
         BigInteger, primary_key=True, index=True
     )
@@ -55,6 +63,16 @@ class User(Base):
     state_changed_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True
     )
+    # False once Telegram reports the chat as blocked or deactivated
+    is_reachable: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=True, server_default="true",
+    )
+    unreachable_reason: Mapped[Optional[str]] = mapped_column(
+        String(32), nullable=True
+    )
+    reachability_changed_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
 
     meetings: Mapped[list["Meeting"]] = relationship(
         "Meeting", secondary="meeting_users", back_populates="participants", lazy="selectin",
@@ -1,8 +1,26 @@
 import uvicorn
 
+from src.core.config import settings
+
 
 def main() -> None:
-    uvicorn.run("src.api.main:app", host="0.0.0.0", port=8000)
+    # Import the app in the master process so broken config or imports fail before workers start.
+    from src.api.main import app
+
+    workers = max(settings.API_WORKERS, 1)
+    uvicorn.run(
+        # workers are spawned, not forked: they need an import string to load the app themselves
+        "src.api.main:app" if workers > 1 else app,
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        workers=workers,
+        timeout_keep_alive=settings.API_KEEPALIVE_TIMEOUT,
+        backlog=settings.API_BACKLOG,
+        # both come with uvicorn[standard]
+        loop="uvloop",
+        http="httptools",
+        lifespan="on",
+    )
 
 
 if __name__ == "__main__":
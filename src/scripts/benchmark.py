@@ -0,0 +1,94 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+import platform
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.bench.dataset import PRESETS, seed
+from src.bench.runner import SCENARIOS, bench_cleanup, bench_generate, bench_meetings_for_user, bench_send
+from src.core.database import async_session_maker, engine
+
+
+async def _run(args: argparse.Namespace, dataset) -> dict:
+    try:
+        if not args.skip_seed:
+            async with async_session_maker() as session:
+                await seed(session, dataset)
+                await session.commit()
+
+        results = []
+        for scenario in args.scenarios:
+            if scenario == "generate":
+                results.append(await bench_generate(args.iterations))
+            elif scenario == "send":
+                results.append(await bench_send(args.iterations, api_url=args.api_url))
+            elif scenario == "cleanup":
+                results.append(await bench_cleanup(args.iterations))
+            elif scenario == "meetings":
+                results.append(await bench_meetings_for_user(args.lookups))
+    finally:
+        await engine.dispose()
+
+    return {
+        "label": args.label,
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "dataset": dataclasses.asdict(dataset),
+        "iterations": args.iterations,
+        "transport": args.api_url or "recording",
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Seed a throwaway database and benchmark the notification pipeline; prints JSON.",
+    )
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="1k")
+    parser.add_argument("--users", type=int, help="override the preset's student count")
+    parser.add_argument("--cohorts", type=int)
+    parser.add_argument("--user-rules", type=int)
+    parser.add_argument("--meetings-per-user", type=int)
+    parser.add_argument("--iterations", type=int, default=5, help="runs per pipeline scenario")
+    parser.add_argument("--lookups", type=int, default=200, help="get_for_user samples")
+    parser.add_argument(
+        "--scenarios", type=lambda value: value.split(","), default=list(SCENARIOS),
+        help=f"comma separated subset of {','.join(SCENARIOS)}",
+    )
+    parser.add_argument("--api-url", help="send through TelegramTransport at this Bot API (e.g. the fake server)")
+    parser.add_argument("--label", default=None, help="free-form tag stored in the report, e.g. a commit")
+    parser.add_argument("--output", type=Path, help="write the JSON report here instead of stdout")
+    parser.add_argument("--reset", action="store_true", help="allow wiping all bot tables before seeding")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the data of a previous run")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    if not (args.reset or args.skip_seed):
+        parser.error("seeding truncates every bot table: pass --reset (throwaway database only) or --skip-seed")
+
+    overrides = {
+        field: value
+        for field, value in (
+            ("users", args.users),
+            ("cohorts", args.cohorts),
+            ("user_rules", args.user_rules),
+            ("meetings_per_user", args.meetings_per_user),
+        )
+        if value is not None
+    }
+    dataset = dataclasses.replace(PRESETS[args.preset], **overrides)
+
+    report = json.dumps(asyncio.run(_run(args, dataset)), indent=2)
+    if args.output:
+        args.output.write_text(report + "\n", encoding="utf-8")
+    else:
+        sys.stdout.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,21 @@
-from src.celery_app import celery_app
+import argparse
+
+from src.celery_app import DEFAULT_QUEUE, PROGRESS_QUEUE, TRANSACTIONAL_QUEUE, celery_app
 
 
 def main() -> None:
+    parser = argparse.ArgumentParser(description="Celery worker")
+    parser.add_argument(
+        "--queues",
+        default=f"{DEFAULT_QUEUE},{TRANSACTIONAL_QUEUE},{PROGRESS_QUEUE}",
+        help=f"comma-separated queues; run separate workers with --queues {TRANSACTIONAL_QUEUE} "
+             f"to reserve one for meeting notices and survey prompts, and with --queues {PROGRESS_QUEUE} "
+             "for the campaign progress messages",
+    )
+    args = parser.parse_args()
     # BOT_TOKEN / REDIS_* must be set in environment
     # Use solo pool to avoid asyncio loop sharing issues with asyncpg in prefork
-    celery_app.worker_main(argv=["worker", "-l", "info", "-P", "solo"])
+    celery_app.worker_main(argv=["worker", "-l", "info", "-P", "solo", "-Q", args.queues])
 
 
 if __name__ == "__main__":
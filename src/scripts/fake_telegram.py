@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import itertools
+import random
+import time
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+
+@dataclass
+class FakeTelegramConfig:
+    latency_ms: float = 30.0
+    jitter_ms: float = 10.0
+    # share of sendMessage calls answered with 429 and this retry_after
+    retry_after_rate: float = 0.0
+    retry_after: int = 1
+    # chats with chat_id % 1000 < blocked_ratio * 1000 always get 403
+    blocked_ratio: float = 0.0
+    blocked_ids: set[int] = field(default_factory=set)
+    seed: int | None = None
+
+
+@dataclass
+class FakeTelegramStats:
+    sent: int = 0
+    retry_after: int = 0
+    blocked: int = 0
+
+
+STATS_KEY = web.AppKey("stats", FakeTelegramStats)
+
+
+def _error(code: int, description: str, **parameters) -> web.Response:
+    body = {"ok": False, "error_code": code, "description": description}
+    if parameters:
+        body["parameters"] = parameters
+    return web.json_response(body, status=code)
+
+
+def build_app(config: FakeTelegramConfig | None = None) -> web.Application:
+    """
+    Minimal Bot API (`/bot<token>/<method>`) for load tests: answers sendMessage after
+    a simulated latency, and injects 429 flood waits and 403 blocked chats.
+    """
+    config = config or FakeTelegramConfig()
+    stats = FakeTelegramStats()
+    rng = random.Random(config.seed)
+    message_ids = itertools.count(1)
+
+    def is_blocked(chat_id: int) -> bool:
+        return chat_id in config.blocked_ids or chat_id % 1000 < config.blocked_ratio * 1000
+
+    async def handle(request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        data = dict(await request.post())
+
+        if config.latency_ms or config.jitter_ms:
+            delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+            await asyncio.sleep(max(delay, 0) / 1000)
+
+        if method.lower() == "getme":
+            return web.json_response(
+                {"ok": True, "result": {"id": 1, "is_bot": True, "first_name": "fake", "username": "fake_bot"}}
+            )
+        if method.lower() != "sendmessage":
+            return web.json_response({"ok": True, "result": True})
+
+        chat_id = int(data["chat_id"])
+        if is_blocked(chat_id):
+            stats.blocked += 1
+            return _error(403, "Forbidden: bot was blocked by the user")
+        if config.retry_after_rate and rng.random() < config.retry_after_rate:
+            stats.retry_after += 1
+            return _error(
+                429,
+                f"Too Many Requests: retry after {config.retry_after}",
+                retry_after=config.retry_after,
+            )
+
+        stats.sent += 1
+        return web.json_response(
+            {
+                "ok": True,
+                "result": {
+                    "message_id": next(message_ids),
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "text": data.get("text", ""),
+                },
+            }
+        )
+
+    async def handle_stats(request: web.Request) -> web.Response:
+        return web.json_response(vars(request.app[STATS_KEY]))
+
+    app = web.Application()
+    app[STATS_KEY] = stats
+    app.router.add_get("/stats", handle_stats)
+    app.router.add_post("/bot{token}/{method}", handle)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local fake Telegram Bot API server for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--retry-after-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--blocked-ratio", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = FakeTelegramConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        retry_after_rate=args.retry_after_rate,
+        retry_after=args.retry_after,
+        blocked_ratio=args.blocked_ratio,
+        seed=args.seed,
+    )
+    # point the sender at it with TELEGRAM_API_URL=http://<host>:<port>
+    web.run_app(build_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import asyncio
+import logging
+from pathlib import Path
+
+from src.core.database import engine
+from src.services.user_import import UserImportError, import_users, iter_records
+
+logger = logging.getLogger(__name__)
+
+
+async def _run(path: Path) -> None:
+    try:
+        result = await import_users(iter_records(path))
+    finally:
+        await engine.dispose()
+    logger.info(
+        "Imported %s rows: created=%s updated=%s cohorts_created=%s notifications=%s meetings=%s",
+        result.rows,
+        result.created,
+        result.updated,
+        result.cohorts_created,
+        result.notifications,
+        result.meetings,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Bulk import users from CSV, JSON or JSON Lines "
+                    "(telegram_id, username, name, role, state, cohort, mentor).",
+    )
+    parser.add_argument("path", type=Path, help="input file (.csv, .json or .jsonl)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_run(args.path))
+    except UserImportError as exc:
+        # the whole import runs in one transaction, nothing was written
+        parser.exit(1, f"Import aborted, {exc}\n")
+
+
+if __name__ == "__main__":
+    main()
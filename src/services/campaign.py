@@ -0,0 +1,205 @@
+import html
+import logging
+from datetime import datetime, timedelta
+from typing import Callable, Iterable
+
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import InlineKeyboardMarkup
+from redis.asyncio import Redis
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dao.campaign import CampaignDAO
+from src.models.campaign import Campaign, CampaignStatus
+from src.utils.transport import Transport
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ("queued", "sent", "failed", "blocked", "dropped")
+COUNTERS_TTL_SECONDS = 7 * 24 * 60 * 60
+# a cancelled campaign is still flushed for this long: rows a sender held at the cancel are counted late
+SETTLE = timedelta(minutes=1)
+
+STATUS_LABELS = {
+    CampaignStatus.running: "идёт",
+    CampaignStatus.finished: "завершена",
+    CampaignStatus.cancelled: "отменена",
+}
+
+
+def counters_key(campaign_id: int) -> str:
+    return f"campaign:{campaign_id}:counters"
+
+
+def stored_counts(campaign: Campaign) -> dict[str, int]:
+    return {name: getattr(campaign, name) for name in COUNTERS}
+
+
+def tally(campaign_of: dict[int, int], **outcomes: Iterable[int]) -> dict[int, dict[str, int]]:
+    """
+    Counter deltas per campaign for notifications that left the queue: every id of an
+    outcome (sent, failed, ...) counts one up there and one down in queued.
+    campaign_of maps notification id -> campaign id; other notifications are ignored.
+    """
+    deltas: dict[int, dict[str, int]] = {}
+    for outcome, ids in outcomes.items():
+        for notification_id in ids:
+            campaign_id = campaign_of.get(notification_id)
+            if campaign_id is None:
+                continue
+            counts = deltas.setdefault(campaign_id, dict.fromkeys(COUNTERS, 0))
+            counts[outcome] += 1
+            counts["queued"] -= 1
+    return deltas
+
+
+class CampaignCounters:
+    """
+    Live counters of each campaign, one Redis hash per campaign. Every update is a HINCRBY,
+    so the senders of both lanes and a cancel never overwrite each other; the database copy
+    is refreshed by refresh_progress().
+    """
+
+    def __init__(self, redis: Redis):
+        self.redis = redis
+
+    @classmethod
+    def from_url(cls, url: str) -> "CampaignCounters":
+        return cls(Redis.from_url(url, decode_responses=True))
+
+    async def start(self, campaign_id: int, queued: int) -> None:
+        key = counters_key(campaign_id)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hset(key, mapping={**dict.fromkeys(COUNTERS, 0), "queued": queued})
+            pipe.expire(key, COUNTERS_TTL_SECONDS)
+            await pipe.execute()
+
+    async def add(self, deltas: dict[int, dict[str, int]]) -> None:
+        if not deltas:
+            return
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for campaign_id, counts in deltas.items():
+                key = counters_key(campaign_id)
+                for name, amount in counts.items():
+                    if amount:
+                        pipe.hincrby(key, name, amount)
+                pipe.expire(key, COUNTERS_TTL_SECONDS)
+            await pipe.execute()
+
+    async def read(self, campaign_ids: Iterable[int]) -> dict[int, dict[str, int]]:
+        """Counters of the campaigns that still have a hash."""
+        campaign_ids = list(campaign_ids)
+        if not campaign_ids:
+            return {}
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for campaign_id in campaign_ids:
+                pipe.hgetall(counters_key(campaign_id))
+            hashes = await pipe.execute()
+        return {
+            campaign_id: {name: int(values.get(name, 0)) for name in COUNTERS}
+            for campaign_id, values in zip(campaign_ids, hashes)
+            if values
+        }
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def render_progress(campaign: Campaign, counts: dict[str, int], *, status: CampaignStatus | None = None) -> str:
+    status = status or campaign.status
+    done = counts["sent"] + counts["failed"] + counts["blocked"] + counts["dropped"]
+    percent = min(done * 100 // campaign.recipients, 100) if campaign.recipients else 100
+    lines = [
+        f"📣 <b>{html.escape(campaign.name or 'Разовая рассылка')}</b>",
+        f"Статус: {STATUS_LABELS[status]} ({percent}%)",
+        f"Получателей: {campaign.recipients}",
+        f"В очереди: {max(counts['queued'], 0)}",
+        f"Отправлено: {counts['sent']}",
+        f"Ошибки: {counts['failed']}",
+        f"Заблокировали бота: {counts['blocked']}",
+    ]
+    if counts["dropped"]:
+        lines.append(f"Отменено: {counts['dropped']}")
+    return "\n".join(lines)
+
+
+async def edit_progress(
+    transport: Transport,
+    campaign: Campaign,
+    counts: dict[str, int],
+    *,
+    status: CampaignStatus | None = None,
+    reply_markup: InlineKeyboardMarkup | None = None,
+) -> bool:
+    """Show the progress in the admin's message."""
+    if campaign.progress_chat_id is None or campaign.progress_message_id is None:
+        return False
+    try:
+        await transport.edit_message_text(
+            campaign.progress_chat_id,
+            campaign.progress_message_id,
+            render_progress(campaign, counts, status=status),
+            reply_markup=reply_markup,
+        )
+    except TelegramBadRequest as exc:
+        if "message is not modified" not in str(exc).lower():
+            logger.warning("Failed to edit progress of campaign %s: %s", campaign.id, exc)
+        return False
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Failed to edit progress of campaign %s: %s", campaign.id, exc)
+        return False
+    return True
+
+
+async def refresh_progress(
+    *,
+    now: datetime,
+    counters: CampaignCounters,
+    transport: Transport,
+    session: AsyncSession,
+    cancel_keyboard: Callable[[int], InlineKeyboardMarkup],
+) -> int:
+    """
+    One progress flush: copy the Redis counters of live campaigns to the database, close
+    the campaigns with nothing left to send and edit the progress messages whose numbers
+    changed. It runs every CAMPAIGN_PROGRESS_INTERVAL_SECONDS, which is what keeps the
+    edits under Telegram's limits. A running campaign keeps cancel_keyboard(campaign_id)
+    under its message. Returns how many messages were edited.
+    """
+    rows = await CampaignDAO.get_for_progress(now=now, settle=SETTLE, session=session)
+    if not rows:
+        return 0
+    live = await counters.read(campaign.id for campaign, _ in rows)
+    # the sender counts in Redis after its commit, so a drained campaign may not be counted
+    # in full yet: its final numbers come from the database
+    final = await CampaignDAO.get_final_counts(
+        [campaign.id for campaign, has_queued in rows if campaign.status is CampaignStatus.running and not has_queued],
+        session=session,
+    )
+
+    updates: list[dict] = []
+    finished: list[int] = []
+    changed: list[tuple[Campaign, dict[str, int], CampaignStatus]] = []
+    for campaign, has_queued in rows:
+        before = stored_counts(campaign)
+        # a lost hash leaves the last saved numbers
+        counts = live.get(campaign.id, before)
+        status = campaign.status
+        if campaign.id in final:
+            counts = {**before, **final[campaign.id]}
+            finished.append(campaign.id)
+            status = CampaignStatus.finished
+        if counts != before:
+            updates.append({"id": campaign.id, **counts})
+        if counts != before or status is not campaign.status:
+            changed.append((campaign, counts, status))
+
+    if updates or finished:
+        await CampaignDAO.save_progress(updates, finished, now=now, session=session)
+        # the messages never show more than what is saved
+        await session.commit()
+
+    edited = 0
+    for campaign, counts, status in changed:
+        reply_markup = cancel_keyboard(campaign.id) if status is CampaignStatus.running else None
+        edited += await edit_progress(transport, campaign, counts, status=status, reply_markup=reply_markup)
+    return edited
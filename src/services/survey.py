@@ -1,3 +1,5 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.api.schemas.survey import SurveyQuestion, SurveyQuestionOption, SurveyStatus, SurveySubmitRequest
 from src.survey.constants import DURATION_OPTION_LABELS
 
@@ -64,26 +66,17 @@ class SurveyService:
 
     @staticmethod
     def _resolve_student_id(meeting) -> int | None:
-        mentor = next((p for p in meeting.participants if getattr(p.role, "name", "") == "mentor"), None)
-        student = next((p for p in meeting.participants if getattr(p.role, "name", "") == "student"), None)
-
-        if student:
-            return student.telegram_id
-
-        if mentor:
-            fallback = next(
-                (p for p in meeting.participants if p.telegram_id != mentor.telegram_id),
-                None,
-            )
-            if fallback:
-                return fallback.telegram_id
+        return meeting.student_id
 
-        return None
-
-    async def get_survey_state(self, call_id: int) -> tuple[SurveyStatus, object | None]:
+    async def get_survey_state(
+        self,
+        call_id: int,
+        *,
+        session: AsyncSession | None = None,
+    ) -> tuple[SurveyStatus, object | None]:
         from src.dao.survey import SurveyDAO
 
-        meeting = await SurveyDAO.get_call_with_participants(call_id)
+        meeting = await SurveyDAO.get_call_with_response(call_id, session=session)
         if not meeting:
             raise CallNotFoundError
 
@@ -95,15 +88,34 @@ class SurveyService:
 
         return SurveyStatus.available, None
 
+    async def get_survey_statuses(
+        self,
+        call_ids: list[int],
+        *,
+        session: AsyncSession | None = None,
+    ) -> dict[int, SurveyStatus]:
+        from src.dao.survey import SurveyDAO
+
+        statuses: dict[int, SurveyStatus] = {}
+        for call_id, survey_open, has_response in await SurveyDAO.get_statuses(call_ids, session=session):
+            if has_response:
+                statuses[call_id] = SurveyStatus.completed
+            elif survey_open:
+                statuses[call_id] = SurveyStatus.available
+            else:
+                statuses[call_id] = SurveyStatus.not_available
+        return statuses
+
     async def submit_survey(
         self,
         *,
         call_id: int,
         payload: SurveySubmitRequest,
+        session: AsyncSession | None = None,
     ) -> tuple[object, bool]:
         from src.dao.survey import SurveyDAO
 
-        meeting = await SurveyDAO.get_call_with_participants(call_id)
+        meeting = await SurveyDAO.get_call_with_response(call_id, session=session)
         if not meeting:
             raise CallNotFoundError
 
@@ -122,4 +134,5 @@ class SurveyService:
             knowledge_depth=payload.knowledge_depth,
             understanding=payload.understanding,
             comment=payload.comment,
+            session=session,
         )
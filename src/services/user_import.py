@@ -0,0 +1,337 @@
+import csv
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.database import session_scope
+from src.dao.notification import NotificationDAO
+from src.models.user import Role, State
+from src.utils.onboarding import (
+    MENTOR_NOTICE_TEXT,
+    MENTOR_REMINDER_TEXT,
+    ONBOARDING_MEETING_DESCRIPTION,
+    SECOND_DELAY,
+    STUDENT_ONBOARDING,
+)
+
+STAGING_TABLE = "import_users"
+STAGING_COLUMNS = (
+    "line",
+    "telegram_id",
+    "username",
+    "name",
+    "role",
+    "state",
+    "cohort_name",
+    "mentor_id",
+    "mentor_username",
+)
+
+
+class UserImportError(Exception):
+    def __init__(self, line: int, message: str):
+        super().__init__(f"line {line}: {message}")
+        self.line = line
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    created: int = 0
+    updated: int = 0
+    cohorts_created: int = 0
+    notifications: int = 0
+    meetings: int = 0
+
+
+def _enum_name(enum_cls, raw: Any, line: int) -> str | None:
+    """Accept either the DB name (`student`) or the label (`Студент`)."""
+    if raw is None or str(raw).strip() == "":
+        return None
+    value = str(raw).strip()
+    for member in enum_cls:
+        if value.lower() in (member.name, member.value.lower()):
+            return member.name
+    raise UserImportError(line, f"unknown {enum_cls.__name__.lower()} {value!r}")
+
+
+def _optional_str(raw: Any) -> str | None:
+    if raw is None:
+        return None
+    value = str(raw).strip()
+    return value or None
+
+
+def parse_record(raw: dict[str, Any], line: int) -> tuple:
+    """Validate one input row and shape it as a staging-table record."""
+    try:
+        telegram_id = int(raw["telegram_id"])
+    except (KeyError, TypeError, ValueError):
+        raise UserImportError(line, "telegram_id must be an integer") from None
+
+    username = _optional_str(raw.get("username"))
+    if username is None:
+        raise UserImportError(line, "username is required")
+    username = username.lstrip("@")
+
+    mentor = _optional_str(raw.get("mentor"))
+    mentor_id = mentor_username = None
+    if mentor is not None:
+        if mentor.lstrip("-").isdigit():
+            mentor_id = int(mentor)
+        else:
+            mentor_username = mentor.lstrip("@")
+
+    return (
+        line,
+        telegram_id,
+        username,
+        _optional_str(raw.get("name")) or username,
+        _enum_name(Role, raw.get("role"), line),
+        _enum_name(State, raw.get("state"), line),
+        _optional_str(raw.get("cohort")),
+        mentor_id,
+        mentor_username,
+    )
+
+
+def iter_records(path: Path) -> Iterator[tuple]:
+    """
+    Stream records from CSV (header row), JSON (array of objects) or JSON Lines.
+    Columns: telegram_id, username, name, role, state, cohort, mentor (id or @username).
+    """
+    suffix = path.suffix.lower()
+    with path.open(encoding="utf-8", newline="") as fh:
+        if suffix == ".csv":
+            for line, raw in enumerate(csv.DictReader(fh), start=2):
+                yield parse_record(raw, line)
+        elif suffix == ".jsonl":
+            for line, raw_line in enumerate(fh, start=1):
+                if raw_line.strip():
+                    yield parse_record(json.loads(raw_line), line)
+        elif suffix == ".json":
+            for line, raw in enumerate(json.load(fh), start=1):
+                yield parse_record(raw, line)
+        else:
+            raise ValueError(f"Unsupported file type: {path.suffix}")
+
+
+async def _copy_to_staging(session: AsyncSession, records: Iterable[tuple]) -> int:
+    await session.execute(text(
+        f"""
+        CREATE TEMP TABLE {STAGING_TABLE} (
+            line integer NOT NULL,
+            telegram_id bigint NOT NULL,
+            username text NOT NULL,
+            name text NOT NULL,
+            role text,
+            state text,
+            cohort_name text,
+            mentor_id bigint,
+            mentor_username text
+        ) ON COMMIT DROP
+        """
+    ))
+    connection = await session.connection()
+    raw = await connection.get_raw_connection()
+    status = await raw.driver_connection.copy_records_to_table(
+        STAGING_TABLE, records=records, columns=STAGING_COLUMNS,
+    )
+    # asyncpg returns the command tag, e.g. "COPY 10000"
+    return int(status.split()[-1])
+
+
+async def import_users(
+    records: Iterable[tuple],
+    *,
+    session: AsyncSession | None = None,
+) -> ImportResult:
+    """
+    COPY records into a temp table and merge them into cohorts/users set-based.
+    New students get their onboarding notifications; new greeting students with a mentor
+    also get the mentor notices and the onboarding meeting, like a manual mentor assignment.
+    New users and users whose state changed get their state-rule notifications.
+    """
+    result = ImportResult()
+    now = datetime.now(timezone.utc)
+
+    async with session_scope(session, commit=True) as s:
+        result.rows = await _copy_to_staging(s, records)
+
+        # the last occurrence of a telegram_id in the file wins
+        await s.execute(text(
+            f"""
+            DELETE FROM {STAGING_TABLE} a
+            USING {STAGING_TABLE} b
+            WHERE a.telegram_id = b.telegram_id AND a.line < b.line
+            """
+        ))
+
+        cohorts = await s.execute(text(
+            f"""
+            INSERT INTO cohorts (name)
+            SELECT DISTINCT t.cohort_name
+            FROM {STAGING_TABLE} t
+            WHERE t.cohort_name IS NOT NULL
+              AND NOT EXISTS (SELECT 1 FROM cohorts c WHERE c.name = t.cohort_name)
+            """
+        ))
+        result.cohorts_created = cohorts.rowcount or 0
+
+        # state transitions, read before the UPDATE overwrites the old state
+        transitions = await s.execute(text(
+            f"""
+            SELECT u.telegram_id
+            FROM users u
+            JOIN {STAGING_TABLE} t ON t.telegram_id = u.telegram_id
+            WHERE t.state IS NOT NULL AND t.state::state_enum IS DISTINCT FROM u.state
+            """
+        ))
+        transitioned_ids = list(transitions.scalars().all())
+
+        updated = await s.execute(text(
+            f"""
+            UPDATE users u SET
+                username = t.username,
+                name = t.name,
+                role = COALESCE(t.role::role_enum, u.role),
+                state = COALESCE(t.state::state_enum, u.state),
+                state_changed_at = CASE
+                    WHEN t.state IS NOT NULL AND t.state::state_enum IS DISTINCT FROM u.state
+                    THEN :now ELSE u.state_changed_at
+                END,
+                cohort_id = COALESCE(
+                    (SELECT min(c.id) FROM cohorts c WHERE c.name = t.cohort_name), u.cohort_id
+                )
+            FROM {STAGING_TABLE} t
+            WHERE u.telegram_id = t.telegram_id
+            """
+        ), {"now": now})
+        result.updated = updated.rowcount or 0
+
+        inserted = await s.execute(text(
+            f"""
+            INSERT INTO users (telegram_id, username, name, role, state, cohort_id, registered_at, state_changed_at)
+            SELECT
+                t.telegram_id,
+                t.username,
+                t.name,
+                COALESCE(t.role, 'student')::role_enum,
+                COALESCE(t.state, 'greeting')::state_enum,
+                (SELECT min(c.id) FROM cohorts c WHERE c.name = t.cohort_name),
+                :now,
+                :now
+            FROM {STAGING_TABLE} t
+            WHERE NOT EXISTS (SELECT 1 FROM users u WHERE u.telegram_id = t.telegram_id)
+            ON CONFLICT (telegram_id) DO NOTHING
+            RETURNING telegram_id
+            """
+        ), {"now": now})
+        created_ids = list(inserted.scalars().all())
+        result.created = len(created_ids)
+
+        # mentors may be defined in the same file, so they are linked after the insert
+        await s.execute(text(
+            f"""
+            UPDATE users u SET mentor_id = m.telegram_id
+            FROM {STAGING_TABLE} t
+            JOIN users m ON m.telegram_id = COALESCE(
+                t.mentor_id,
+                (SELECT x.telegram_id FROM users x WHERE x.username = t.mentor_username)
+            )
+            WHERE u.telegram_id = t.telegram_id
+              AND u.mentor_id IS DISTINCT FROM m.telegram_id
+            """
+        ))
+
+        if created_ids:
+            await _schedule_onboarding(s, created_ids, result)
+
+        result.notifications += await NotificationDAO.schedule_state_rules(
+            now=now, user_ids=transitioned_ids + created_ids, session=s,
+        )
+
+    return result
+
+
+async def _schedule_onboarding(session: AsyncSession, user_ids: list[int], result: ImportResult) -> None:
+    """
+    Onboarding of the new students, set-based like the merges above: their own notifications
+    and, for greeting students with a mentor, the mentor notices plus the onboarding meeting.
+    """
+    new_students = f"""
+        new_students AS (
+            SELECT u.telegram_id, u.name, u.username, u.mentor_id,
+                   u.state = 'greeting' AS greeting,
+                   u.registered_at,
+                   u.registered_at + :meeting_delay AS meeting_time
+            FROM users u
+            JOIN {STAGING_TABLE} t ON t.telegram_id = u.telegram_id
+            WHERE u.telegram_id = ANY(:ids) AND u.role = 'student'
+        )
+    """
+    # same text as mentor_onboarding_texts(): MSK is a fixed UTC+3
+    meeting_time_msk = "to_char(timezone(interval '3 hours', s.meeting_time), 'DD.MM.YYYY HH24:MI') || ' MSK'"
+
+    notifications = await session.execute(
+        text(
+            f"""
+            WITH {new_students},
+            created AS (
+                INSERT INTO notifications (user_id, text, scheduled_at)
+                SELECT s.telegram_id, o.text, s.registered_at + o.delay
+                FROM new_students s
+                CROSS JOIN unnest(CAST(:texts AS text[]), CAST(:delays AS interval[])) AS o(text, delay)
+                UNION ALL
+                SELECT s.mentor_id, format(:notice, s.name, coalesce(s.username, ''), {meeting_time_msk}), NULL
+                FROM new_students s
+                WHERE s.greeting AND s.mentor_id IS NOT NULL
+                UNION ALL
+                SELECT s.mentor_id, format(:reminder, s.name, coalesce(s.username, ''), {meeting_time_msk}),
+                       s.meeting_time
+                FROM new_students s
+                WHERE s.greeting AND s.mentor_id IS NOT NULL
+                RETURNING id
+            )
+            SELECT count(*) FROM created
+            """
+        ),
+        {
+            "ids": user_ids,
+            "meeting_delay": SECOND_DELAY,
+            "texts": [onboarding_text for onboarding_text, _ in STUDENT_ONBOARDING],
+            "delays": [delay for _, delay in STUDENT_ONBOARDING],
+            "notice": MENTOR_NOTICE_TEXT,
+            "reminder": MENTOR_REMINDER_TEXT,
+        },
+    )
+    result.notifications += notifications.scalar_one()
+
+    meetings = await session.execute(
+        text(
+            f"""
+            WITH {new_students},
+            created AS (
+                INSERT INTO meetings (description, meeting_link, scheduled_at, mentor_id, student_id)
+                SELECT :description, NULL, s.meeting_time, s.mentor_id, s.telegram_id
+                FROM new_students s
+                WHERE s.greeting AND s.mentor_id IS NOT NULL
+                RETURNING id, mentor_id, student_id
+            ),
+            participants AS (
+                INSERT INTO meeting_users (meeting_id, user_id)
+                SELECT id, mentor_id FROM created
+                UNION ALL
+                SELECT id, student_id FROM created
+            )
+            SELECT count(*) FROM created
+            """
+        ),
+        {"ids": user_ids, "meeting_delay": SECOND_DELAY, "description": ONBOARDING_MEETING_DESCRIPTION},
+    )
+    result.meetings = meetings.scalar_one()
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.bot.keyboards.mailings import campaign_progress_keyboard
+from src.celery_app import celery_app
+from src.core.config import settings
+from src.core.query_stats import query_budget
+from src.dao.campaign import CampaignDAO
+from src.services.campaign import SETTLE, CampaignCounters, refresh_progress
+from src.utils.transport import Transport, build_transport
+
+logger = logging.getLogger(__name__)
+
+
+class _Clients:
+    """
+    The refresh runs every few seconds, so the worker keeps its connections between runs.
+    They are bound to an event loop, hence a loop of its own instead of asyncio.run per run.
+    """
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.engine = create_async_engine(settings.DATABASE_URL, pool_size=1, max_overflow=0, pool_pre_ping=True)
+        self.Session = async_sessionmaker(self.engine, expire_on_commit=False)
+        self.counters = CampaignCounters.from_url(settings.REDIS_URL)
+        # built on the first run with something to show
+        self.transport: Transport | None = None
+
+
+_clients: _Clients | None = None
+
+
+# an idle run is the in-progress probe alone; otherwise also live campaigns with a has-queued probe,
+# final counts of the drained ones, counters (one executemany), closing the finished ones
+@query_budget(5)
+async def _refresh_campaign_progress(clients: _Clients) -> None:
+    now = datetime.now(timezone.utc)
+    async with clients.Session() as session:
+        if not await CampaignDAO.has_in_progress(now=now, settle=SETTLE, session=session):
+            return
+        clients.transport = clients.transport or build_transport()
+        edited = await refresh_progress(
+            now=now,
+            counters=clients.counters,
+            transport=clients.transport,
+            session=session,
+            cancel_keyboard=campaign_progress_keyboard,
+        )
+    if edited:
+        logger.info("Updated the progress of %s campaigns", edited)
+
+
+@celery_app.task(name="campaigns.refresh_progress")
+def refresh_campaign_progress() -> None:
+    global _clients
+    _clients = _clients or _Clients()
+    _clients.loop.run_until_complete(_refresh_campaign_progress(_clients))
@@ -3,17 +3,18 @@ import logging
 from datetime import datetime, timezone
 from typing import Optional
 
-from aiogram import Bot
-from aiogram.client.default import DefaultBotProperties
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import raiseload
 
 from src.celery_app import celery_app
 from src.core.config import settings
+from src.dao.meeting import with_roles
+from src.dao.notification import NotificationDAO
 from src.models.meeting import Meeting
-from src.models.notification import Notification
-from src.models.user import Role, User
+from src.models.notification import Priority
+from src.models.user import User
+from src.utils.transport import build_transport
 
 logger = logging.getLogger(__name__)
 
@@ -27,14 +28,7 @@ def _format_dt(dt: Optional[datetime]) -> str:
 
 
 def _split_participants(meeting: Meeting) -> tuple[Optional[User], Optional[User]]:
-    mentor = next((p for p in meeting.participants if p.role == Role.mentor), None)
-    student = next((p for p in meeting.participants if p.role == Role.student), None)
-    if not student and mentor:
-        student = next(
-            (p for p in meeting.participants if p.telegram_id != mentor.telegram_id),
-            None,
-        )
-    return mentor, student
+    return meeting.mentor, meeting.student
 
 
 def _survey_notification_text(meeting: Meeting) -> str:
@@ -48,11 +42,11 @@ def _survey_notification_text(meeting: Meeting) -> str:
 async def _send_to_student(student: Optional[User], text: str) -> None:
     if not student:
         return
-    bot = Bot(settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode="HTML"))
+    transport = build_transport()
     try:
-        await bot.send_message(student.telegram_id, text)
+        await transport.send_message(student.telegram_id, text)
     finally:
-        await bot.session.close()
+        await transport.close()
 
 
 async def _load_meeting(meeting_id: int) -> Optional[Meeting]:
@@ -63,10 +57,9 @@ async def _load_meeting(meeting_id: int) -> Optional[Meeting]:
             query = (
                 select(Meeting)
                 .where(Meeting.id == meeting_id)
-                .options(joinedload(Meeting.participants))
+                .options(*with_roles())
             )
             res = await session.execute(query)
-            res = res.unique()
             return res.scalar_one_or_none()
     finally:
         await engine.dispose()
@@ -119,10 +112,10 @@ async def _complete_meeting_async(meeting_id: int) -> bool:
             query = (
                 select(Meeting)
                 .where(Meeting.id == meeting_id)
-                .options(joinedload(Meeting.participants))
+                .options(raiseload("*"))
             )
             result = await session.execute(query)
-            meeting = result.unique().scalar_one_or_none()
+            meeting = result.scalar_one_or_none()
 
             if not meeting:
                 logger.info("Meeting %s not found for completion", meeting_id)
@@ -136,14 +129,13 @@ async def _complete_meeting_async(meeting_id: int) -> bool:
             if meeting.survey_available_at is None:
                 meeting.survey_available_at = now
 
-            _, student = _split_participants(meeting)
-            if student:
-                session.add(
-                    Notification(
-                        user_id=student.telegram_id,
-                        text=_survey_notification_text(meeting),
-                        scheduled_at=now,
-                    )
+            if meeting.student_id:
+                await NotificationDAO.add(
+                    user_id=meeting.student_id,
+                    text=_survey_notification_text(meeting),
+                    scheduled_at=now,
+                    priority=Priority.transactional,
+                    session=session,
                 )
 
             await session.commit()
@@ -166,29 +158,31 @@ async def _cleanup_stale_async() -> None:
                     Meeting.scheduled_at <= cutoff,
                     Meeting.completed_at.is_(None),
                 )
-                .options(joinedload(Meeting.participants))
+                .options(raiseload("*"))
             )
             result = await session.execute(query)
-            meetings = result.unique().scalars().all()
+            meetings = result.scalars().all()
 
             completed = 0
+            notifications = []
             for meeting in meetings:
                 meeting.completed_at = cutoff
                 if meeting.survey_available_at is None:
                     meeting.survey_available_at = cutoff
 
-                _, student = _split_participants(meeting)
-                if student:
-                    session.add(
-                        Notification(
-                            user_id=student.telegram_id,
-                            text=_survey_notification_text(meeting),
-                            scheduled_at=cutoff,
-                        )
+                if meeting.student_id:
+                    notifications.append(
+                        {
+                            "user_id": meeting.student_id,
+                            "text": _survey_notification_text(meeting),
+                            "scheduled_at": cutoff,
+                            "priority": Priority.transactional,
+                        }
                     )
                 completed += 1
 
             if completed:
+                await NotificationDAO.add_many(notifications, session=session)
                 await session.commit()
             logger.info("Cleanup stale meetings: cutoff=%s, completed=%s", cutoff, completed)
     finally:
@@ -1,73 +1,45 @@
 import asyncio
 import logging
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Iterable
 
-from aiogram import Bot
-from aiogram.client.default import DefaultBotProperties
-from sqlalchemy import select, update, delete
-from sqlalchemy.orm import joinedload
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from aiogram.exceptions import TelegramRetryAfter
+from sqlalchemy import Row, exists, select, delete
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
 from src.celery_app import celery_app
 from src.core.config import settings
-from src.models.notification import Notification
-from src.models.rule import UserRule, StateRule, CohortRule, Regularity
+from src.core.query_stats import query_budget
+from src.dao.campaign import CampaignDAO
+from src.dao.notification import NotificationDAO, NotificationPayloadDAO
+from src.dao.user import UserDAO
+from src.models.notification import Notification, Priority
 from src.models.user import User
+from src.services.campaign import CampaignCounters, tally
+from src.utils.coalesce import SEPARATOR, coalesce_messages
+from src.utils.delivery import Failure, classify_error, retry_delay, unreachable_reason
+from src.utils.transport import Transport, build_transport
 
 logger = logging.getLogger(__name__)
 
-REGULARITY_TO_DELTA = {
-    Regularity.day: timedelta(days=1),
-    Regularity.week: timedelta(days=7),
-    Regularity.fortnight: timedelta(days=14),
-    Regularity.month: timedelta(days=30),
-}
-
+# rows per server-side cursor fetch, and per send/commit round
+SEND_BATCH_SIZE = 1000
+# how late a sender working through a batch may notice that a campaign was cancelled
+CANCEL_CHECK_SECONDS = 1.0
 
 def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _is_within_bounds(now: datetime, start_at: datetime | None, end_at: datetime | None) -> bool:
-    if start_at and now < start_at:
-        return False
-    if end_at and now > end_at:
-        return False
-    return True
-
-
 async def _create_notifications_for_user_rules(now: datetime) -> int:
     """Create notifications for individual user rules."""
-    created = 0
     engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
     Session = async_sessionmaker(engine, expire_on_commit=False)
     try:
         async with Session() as session:
-            result = await session.execute(
-                select(UserRule).options(joinedload(UserRule.user))
-            )
-            rules: Iterable[UserRule] = result.scalars().all()
-
-            for rule in rules:
-                delta = REGULARITY_TO_DELTA.get(rule.regularity)
-                if not delta:
-                    continue
-                if not _is_within_bounds(now, rule.start_at, rule.end_at):
-                    continue
-                if rule.last_sent_at and rule.last_sent_at + delta > now:
-                    continue
-
-                session.add(
-                    Notification(
-                        user_id=rule.user_id,
-                        text=rule.text,
-                        scheduled_at=now,
-                    )
-                )
-                rule.last_sent_at = now
-                created += 1
-
+            created = await NotificationDAO.create_for_user_rules(now=now, session=session)
             await session.commit()
     finally:
         await engine.dispose()
@@ -76,107 +48,15 @@ async def _create_notifications_for_user_rules(now: datetime) -> int:
     return created
 
 
-async def _create_notifications_for_state_rules(now: datetime) -> int:
-    """Create notifications for rules that target user state."""
-    created = 0
-    engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
-    Session = async_sessionmaker(engine, expire_on_commit=False)
-    try:
-        async with Session() as session:
-            result = await session.execute(select(StateRule))
-            rules: Iterable[StateRule] = result.scalars().all()
-
-            for rule in rules:
-                rule_created = 0
-                delta = REGULARITY_TO_DELTA.get(rule.regularity)
-                if not delta:
-                    continue
-
-                # throttle by rule periodicity
-                if rule.last_sent_at and rule.last_sent_at + delta > now:
-                    continue
-
-                offset = timedelta(days=rule.offset_days or 0)
-
-                users_result = await session.execute(
-                    select(User).where(User.state == rule.user_state)
-                )
-                users: Iterable[User] = users_result.scalars().all()
-
-                for user in users:
-                    if not user.state_changed_at:
-                        continue
-                    first_allowed = user.state_changed_at + offset
-                    if now < first_allowed:
-                        continue
-                    session.add(
-                        Notification(
-                            user_id=user.telegram_id,
-                            text=rule.text,
-                            scheduled_at=now,
-                        )
-                    )
-                    created += 1
-                    rule_created += 1
-
-                if rule_created:
-                    # mark rule as sent for this period so we don't re-create every minute
-                    await session.execute(
-                        update(StateRule)
-                        .where(StateRule.id == rule.id)
-                        .values(last_sent_at=now)
-                    )
-
-            await session.commit()
-    finally:
-        await engine.dispose()
-    if created:
-        logger.info("Created %s notifications from state rules", created)
-    return created
-
-
 async def _create_notifications_for_cohort_rules(now: datetime) -> int:
     """Create notifications for rules that target cohorts."""
-    created = 0
     engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
     Session = async_sessionmaker(engine, expire_on_commit=False)
     try:
         async with Session() as session:
-            result = await session.execute(
-                select(CohortRule).options(joinedload(CohortRule.cohort))
+            created = await NotificationDAO.create_for_cohort_rules(
+                now=now, per_minute=settings.bulk_per_minute, session=session,
             )
-            rules: Iterable[CohortRule] = result.scalars().all()
-
-            for rule in rules:
-                delta = REGULARITY_TO_DELTA.get(rule.regularity)
-                if not delta:
-                    continue
-                if rule.last_sent_at and rule.last_sent_at + delta > now:
-                    continue
-
-                users_result = await session.execute(
-                    select(User).where(User.cohort_id == rule.cohort_id)
-                )
-                users: Iterable[User] = users_result.scalars().all()
-                if not users:
-                    continue
-
-                for user in users:
-                    session.add(
-                        Notification(
-                            user_id=user.telegram_id,
-                            text=rule.text,
-                            scheduled_at=now,
-                        )
-                    )
-                    created += 1
-
-                await session.execute(
-                    update(CohortRule)
-                    .where(CohortRule.id == rule.id)
-                    .values(last_sent_at=now)
-                )
-
             await session.commit()
     finally:
         await engine.dispose()
@@ -185,66 +65,325 @@ async def _create_notifications_for_cohort_rules(now: datetime) -> int:
     return created
 
 
+# user rules: 1; cohort rules: due rules with counts, payload upsert + lookup, booked minutes, fan-out
+@query_budget(6)
 async def _generate_notifications() -> None:
     now = _now_utc()
     await _create_notifications_for_user_rules(now)
-    await _create_notifications_for_state_rules(now)
+    # state rules need no scan: UserDAO.set_state schedules them on each transition
     await _create_notifications_for_cohort_rules(now)
 
 
-async def _send_due_notifications() -> None:
-    now = _now_utc()
-    engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
-    Session = async_sessionmaker(engine, expire_on_commit=False)
-    try:
-        async with Session() as session:
-            result = await session.execute(
-                select(Notification)
-                .where((Notification.scheduled_at == None) | (Notification.scheduled_at <= now))  # noqa: E711
-            )
-            notifications: list[Notification] = list(result.scalars().all())
-    finally:
-        await engine.dispose()
-
-    if not notifications:
+def _error_text(exc: BaseException) -> str:
+    return f"{type(exc).__name__}: {exc}"[:1000]
+
+
+def _hold_back_last_recipient(rows: list[Row]) -> tuple[list[Row], list[Row]]:
+    """Rows are ordered by user_id; the last recipient may continue in the next partition."""
+    split = len(rows)
+    while split and rows[split - 1].user_id == rows[-1].user_id:
+        split -= 1
+    return rows[:split], rows[split:]
+
+
+class _Pacer:
+    """Spaces sends to at most rate messages per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next_at = 0.0
+
+    async def wait(self) -> None:
+        now = time.monotonic()
+        if self._next_at > now:
+            await asyncio.sleep(self._next_at - now)
+            now = self._next_at
+        self._next_at = now + self.interval
+
+
+class _CancelWatch:
+    """The campaigns of a batch that ended since it was claimed, re-read at most every CANCEL_CHECK_SECONDS."""
+
+    def __init__(self, campaign_ids: set[int], session: AsyncSession):
+        self.campaign_ids = campaign_ids
+        self.session = session
+        self._ended: set[int] = set()
+        self._next_check = 0.0
+
+    async def ended(self) -> set[int]:
+        if self.campaign_ids and time.monotonic() >= self._next_check:
+            self._ended = await CampaignDAO.get_ended_ids(self.campaign_ids, session=self.session)
+            self._next_check = time.monotonic() + CANCEL_CHECK_SECONDS
+        return self._ended
+
+
+@dataclass
+class _SendStats:
+    sent: int = 0
+    messages: int = 0
+    retrying: int = 0
+    dead: int = 0
+    unreachable: int = 0
+
+
+async def _send_batch(
+    rows: list[Row],
+    *,
+    now: datetime,
+    transport: Transport,
+    session: AsyncSession,
+    payloads: dict[int, str],
+    unreachable_seen: set[int],
+    stats: _SendStats,
+    pacer: _Pacer | None = None,
+    counters: CampaignCounters | None = None,
+) -> None:
+    """
+    Send one batch of (id, user_id, text, payload_id, attempts, state_rule_id, campaign_id) rows
+    and record the outcome; campaign notifications are also counted in the live counters.
+    """
+    # the cursor reads a snapshot: keep only the rows that are still queued, and hold them until
+    # the batch commits; a cancel skips the held rows, and they are dropped here once it is seen
+    # users in unreachable_seen were already dead-lettered earlier in this run
+    rows = [row for row in rows if row.user_id not in unreachable_seen]
+    claimed = await NotificationDAO.claim([row.id for row in rows], session=session)
+    rows = [row for row in rows if row.id in claimed]
+    if not rows:
+        await session.commit()
         return
 
-    bot = Bot(settings.BOT_TOKEN, default=DefaultBotProperties(parse_mode="HTML"))
-    sent_ids: list[int] = []
+    # a broadcast payload is fetched once per run, not once per recipient
+    payloads.update(await NotificationPayloadDAO.get_texts(
+        {row.payload_id for row in rows if row.payload_id is not None} - payloads.keys(), session=session,
+    ))
+
+    # one chat gets as few messages as possible, so rules firing together don't hit its rate limit
+    by_user: dict[int, list[tuple[int, str]]] = defaultdict(list)
+    attempts: dict[int, int] = {}
+    recurring: set[int] = set()
+    payload_ids: set[int] = set()
+    campaign_of: dict[int, int] = {}
+    for notification_id, user_id, text, payload_id, row_attempts, state_rule_id, campaign_id in rows:
+        if payload_id is not None:
+            payload_ids.add(payload_id)
+            text = payloads[payload_id]
+        by_user[user_id].append((notification_id, text))
+        attempts[notification_id] = row_attempts
+        if state_rule_id is not None:
+            recurring.add(notification_id)
+        if campaign_id is not None:
+            campaign_of[notification_id] = campaign_id
 
-    try:
-        for notification in notifications:
+    sent_ids: list[int] = []
+    failed: list[dict] = []
+    dead_ids: list[int] = []
+    exhausted_ids: list[int] = []
+    dropped_ids: list[int] = []
+    cancel_watch = _CancelWatch(set(campaign_of.values()), session)
+    unreachable: dict[int, str] = {}
+
+    for user_id, items in by_user.items():
+        texts = dict(items)
+        messages = deque(coalesce_messages(items))
+        while messages:
+            text, ids = messages.popleft()
+            if pacer is not None:
+                await pacer.wait()
+            ended = await cancel_watch.ended()
+            cancelled = [notification_id for notification_id in ids if campaign_of.get(notification_id) in ended]
+            if cancelled:
+                # held by this batch when the campaign was cancelled: dropped here instead of sent
+                dropped_ids.extend(cancelled)
+                ids = [notification_id for notification_id in ids if notification_id not in cancelled]
+                if not ids:
+                    continue
+                text = SEPARATOR.join(texts[notification_id] for notification_id in ids)
             try:
-                await bot.send_message(notification.user_id, notification.text)
-                sent_ids.append(notification.id)
+                await transport.send_message(user_id, text)
+                sent_ids.extend(ids)
+                stats.messages += 1
+                continue
+            except TelegramRetryAfter as exc:
+                # flood control is not the message's fault, so the attempt is not counted
+                retry_at = now + timedelta(seconds=exc.retry_after)
+                failed.extend(
+                    {
+                        "id": notification_id,
+                        "attempts": attempts[notification_id],
+                        "next_attempt_at": retry_at,
+                        "last_error": _error_text(exc),
+                    }
+                    for notification_id in ids
+                )
+                continue
             except Exception as exc:  # noqa: BLE001
+                failure = classify_error(exc)
+                error = _error_text(exc)
+                reason = unreachable_reason(exc)
                 logger.warning(
-                    "Failed to send notification id=%s user=%s: %s",
-                    notification.id,
-                    notification.user_id,
+                    "Failed to send notifications ids=%s user=%s (%s): %s",
+                    ids,
+                    user_id,
+                    failure.value,
                     exc,
                 )
-    finally:
-        await bot.session.close()
 
-    if sent_ids:
-        engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
-        Session = async_sessionmaker(engine, expire_on_commit=False)
+            if failure is Failure.unreachable:
+                # the rest of this chat's messages would fail the same way
+                unreachable[user_id] = reason
+                break
+            if len(ids) > 1:
+                # one broken part must not take the others with it: send them one by one
+                messages.extendleft((texts[notification_id], [notification_id]) for notification_id in reversed(ids))
+                continue
+
+            for notification_id in ids:
+                row_attempts = attempts[notification_id] + 1
+                failed.append(
+                    {
+                        "id": notification_id,
+                        "attempts": row_attempts,
+                        "next_attempt_at": now + retry_delay(
+                            row_attempts,
+                            base_seconds=settings.NOTIFY_RETRY_BASE_SECONDS,
+                            max_seconds=settings.NOTIFY_RETRY_MAX_SECONDS,
+                        ),
+                        "last_error": error,
+                    }
+                )
+                if failure is Failure.drop or row_attempts >= settings.NOTIFY_MAX_ATTEMPTS:
+                    if failure is not Failure.drop and notification_id in recurring:
+                        # an outage must not cost the user the rule: only this period is given up
+                        exhausted_ids.append(notification_id)
+                    else:
+                        dead_ids.append(notification_id)
+
+    if not (sent_ids or failed or unreachable or dropped_ids):
+        return
+
+    # a state rule keeps one row per user and moves it to the next period
+    await NotificationDAO.reschedule_state_rules(
+        [notification_id for notification_id in sent_ids if notification_id in recurring], now=now, session=session,
+    )
+    one_off = [notification_id for notification_id in sent_ids if notification_id not in recurring] + dropped_ids
+    if one_off:
+        await session.execute(
+            delete(Notification).where(Notification.id.in_(one_off))
+        )
+    await NotificationDAO.update_many(failed, session=session)
+    dead = await NotificationDAO.dead_letter(dead_ids, session=session)
+    dead += await NotificationDAO.dead_letter(exhausted_ids, keep=True, session=session)
+    await NotificationDAO.reschedule_state_rules(exhausted_ids, now=now, session=session)
+    if unreachable:
+        await UserDAO.mark_unreachable(unreachable, changed_at=now, session=session)
+        dead += await NotificationDAO.dead_letter_for_users(unreachable, session=session)
+        unreachable_seen.update(unreachable)
+    await NotificationPayloadDAO.delete_unreferenced(payload_ids, session=session)
+    await session.commit()
+
+    if counters is not None and campaign_of:
+        deltas = tally(
+            campaign_of,
+            sent=sent_ids,
+            failed=dead_ids,
+            dropped=dropped_ids,
+            blocked=[notification_id for user_id in unreachable for notification_id, _ in by_user[user_id]],
+        )
         try:
-            async with Session() as session:
-                await session.execute(
-                    delete(Notification).where(Notification.id.in_(sent_ids))
+            await counters.add(deltas)
+        except Exception:  # noqa: BLE001
+            # the progress is off until the next flush settles it; delivery is not
+            logger.exception("Failed to update campaign counters %s", deltas)
+
+    stats.sent += len(sent_ids)
+    stats.retrying += len(failed) - len(dead_ids) - len(exhausted_ids)
+    stats.dead += dead
+    stats.unreachable += len(unreachable)
+
+
+async def _send_due_notifications(priority: Priority | None = None) -> None:
+    """
+    Stream due notifications through a server-side cursor and send them batch by batch,
+    so memory stays flat however many are due. Each batch is committed on its own
+    (a separate session, the cursor's transaction only reads), so a crash resends one batch at most.
+    priority restricts the run to one lane; the bulk lane is paced to NOTIFY_BULK_MESSAGES_PER_SECOND.
+    """
+    now = _now_utc()
+    query = (
+        select(
+            Notification.id,
+            Notification.user_id,
+            Notification.text,
+            Notification.payload_id,
+            Notification.attempts,
+            Notification.state_rule_id,
+            Notification.campaign_id,
+        )
+        .where(
+            (Notification.scheduled_at == None) | (Notification.scheduled_at <= now),  # noqa: E711
+            (Notification.next_attempt_at == None) | (Notification.next_attempt_at <= now),  # noqa: E711
+            # probes the small partial index of unreachable users
+            ~exists().where(User.telegram_id == Notification.user_id, User.is_reachable.is_(False)),
+        )
+        # grouped by recipient for coalescing, oldest first within a chat
+        .order_by(Notification.user_id, Notification.scheduled_at.asc().nulls_first(), Notification.id)
+        .execution_options(yield_per=SEND_BATCH_SIZE)
+    )
+    if priority is not None:
+        query = query.where(Notification.priority == priority)
+    pacer = None
+    if priority is Priority.bulk and settings.NOTIFY_BULK_MESSAGES_PER_SECOND > 0:
+        pacer = _Pacer(settings.NOTIFY_BULK_MESSAGES_PER_SECOND)
+
+    stats = _SendStats()
+    payloads: dict[int, str] = {}
+    unreachable_seen: set[int] = set()
+    transport = None
+    counters = CampaignCounters.from_url(settings.REDIS_URL)
+    engine = create_async_engine(settings.DATABASE_URL, pool_pre_ping=True)
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    try:
+        async with Session() as reader, Session() as writer:
+            result = await reader.stream(query)
+            pending: list[Row] = []
+            async for partition in result.partitions():
+                batch, pending = _hold_back_last_recipient(pending + partition)
+                if not batch:
+                    continue
+                transport = transport or build_transport()
+                await _send_batch(
+                    batch, now=now, transport=transport, session=writer,
+                    payloads=payloads, unreachable_seen=unreachable_seen, stats=stats, pacer=pacer, counters=counters,
                 )
-                await session.commit()
-        finally:
-            await engine.dispose()
-        logger.info("Sent and removed %s notifications", len(sent_ids))
+            if pending:
+                transport = transport or build_transport()
+                await _send_batch(
+                    pending, now=now, transport=transport, session=writer,
+                    payloads=payloads, unreachable_seen=unreachable_seen, stats=stats, pacer=pacer, counters=counters,
+                )
+    finally:
+        if transport is not None:
+            await transport.close()
+        await counters.close()
+        await engine.dispose()
+
+    if stats.sent or stats.retrying or stats.dead or stats.unreachable:
+        logger.info(
+            "[%s] Sent and removed %s notifications in %s messages; retrying=%s dead=%s unreachable_users=%s",
+            priority.name if priority is not None else "all",
+            stats.sent,
+            stats.messages,
+            stats.retrying,
+            stats.dead,
+            stats.unreachable,
+        )
 
 
 async def _tick_notifications() -> None:
     """Single entrypoint to avoid concurrent rule/send tasks on shared pool."""
     await _generate_notifications()
-    await _send_due_notifications()
+    # transactional rows are sent by their own lane (notifications.send_transactional)
+    await _send_due_notifications(Priority.bulk)
 
 
 def _run(coro) -> None:
@@ -271,6 +410,11 @@ def send_due_notifications() -> None:
     _run(_send_due_notifications())
 
 
+@celery_app.task(name="notifications.send_transactional")
+def send_transactional_notifications() -> None:
+    _run(_send_due_notifications(Priority.transactional))
+
+
 @celery_app.task(name="notifications.tick")
 def tick_notifications() -> None:
     _run(_tick_notifications())
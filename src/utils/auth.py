@@ -1,13 +1,19 @@
 from typing import Optional
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from src.models.user import Role
 from src.dao.user import UserDAO
 
+# session.info key: roles already resolved within this session (one update in the bot)
+ROLE_CACHE_KEY = "user_roles"
 
-async def get_user_role(user_id: int) -> Optional[Role]:
-    user = await UserDAO.find_one_or_none(telegram_id=user_id)
 
-    if not user:
-        return None
+async def get_user_role(user_id: int, session: AsyncSession | None = None) -> Optional[Role]:
+    if session is None:
+        return await UserDAO.get_role(user_id)
 
-    return user.role
+    roles = session.info.setdefault(ROLE_CACHE_KEY, {})
+    if user_id not in roles:
+        roles[user_id] = await UserDAO.get_role(user_id, session=session)
+    return roles[user_id]
@@ -0,0 +1,37 @@
+from typing import Iterable
+
+# Telegram rejects sendMessage texts longer than this.
+MESSAGE_LIMIT = 4096
+SEPARATOR = "\n\n"
+
+
+def coalesce_messages(
+    items: Iterable[tuple[int, str]],
+    *,
+    limit: int = MESSAGE_LIMIT,
+    separator: str = SEPARATOR,
+) -> list[tuple[str, list[int]]]:
+    """
+    Pack (notification_id, text) pairs for one chat into as few messages as possible.
+    A text is never split, so every merged message stays valid HTML when each part is;
+    a text longer than `limit` is passed through alone. Order is preserved.
+    Returns (message_text, notification_ids) per outgoing message.
+    """
+    messages: list[tuple[str, list[int]]] = []
+    parts: list[str] = []
+    ids: list[int] = []
+    size = 0
+
+    for notification_id, text in items:
+        extra = len(text) + (len(separator) if parts else 0)
+        if parts and size + extra > limit:
+            messages.append((separator.join(parts), ids))
+            parts, ids, size = [], [], 0
+            extra = len(text)
+        parts.append(text)
+        ids.append(notification_id)
+        size += extra
+
+    if parts:
+        messages.append((separator.join(parts), ids))
+    return messages
@@ -0,0 +1,53 @@
+import enum
+from datetime import timedelta
+
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramMigrateToChat,
+    TelegramNotFound,
+    TelegramRetryAfter,
+)
+
+# error description marker -> reason stored on the user
+UNREACHABLE_REASONS = {
+    "bot was blocked": "blocked",
+    "bot was kicked": "kicked",
+    "user is deactivated": "deactivated",
+    "chat not found": "not_found",
+    "peer_id_invalid": "not_found",
+}
+
+
+class Failure(enum.Enum):
+    retry = "retry"              # transient: back off and try again
+    drop = "drop"                # this message can never be sent
+    unreachable = "unreachable"  # the chat is gone: nothing can be sent to it
+
+
+def classify_error(exc: BaseException) -> Failure:
+    if isinstance(exc, TelegramForbiddenError):
+        return Failure.unreachable
+    if isinstance(exc, TelegramRetryAfter):
+        return Failure.retry
+    if isinstance(exc, (TelegramBadRequest, TelegramNotFound)):
+        description = str(exc).lower()
+        if any(marker in description for marker in UNREACHABLE_REASONS):
+            return Failure.unreachable
+        return Failure.drop
+    if isinstance(exc, TelegramMigrateToChat):
+        return Failure.drop
+    return Failure.retry
+
+
+def retry_delay(attempts: int, *, base_seconds: int, max_seconds: int) -> timedelta:
+    """Exponential backoff: base, 2*base, 4*base, ... capped at max_seconds."""
+    return timedelta(seconds=min(base_seconds * 2 ** max(attempts - 1, 0), max_seconds))
+
+
+def unreachable_reason(exc: BaseException) -> str:
+    description = str(exc).lower()
+    for marker, reason in UNREACHABLE_REASONS.items():
+        if marker in description:
+            return reason
+    return "forbidden"
@@ -0,0 +1,96 @@
+import math
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+MINUTE = timedelta(minutes=1)
+MOSCOW_TZ = timezone(timedelta(hours=3))
+
+
+@dataclass(frozen=True)
+class Broadcast:
+    key: int
+    recipients: int
+    window: timedelta | None = None
+    # [start, end) hours, Moscow time; may wrap midnight (22, 9)
+    quiet_hours: tuple[int, int] | None = None
+
+
+@dataclass
+class Slot:
+    """
+    Recipients first..first + count - 1 (1-based, in recipient order) of a broadcast,
+    one every step_seconds from starts_at. Consecutive minutes at the same pace share a slot.
+    """
+    key: int
+    first: int
+    count: int
+    starts_at: datetime
+    step_seconds: float
+
+    @property
+    def ends_at(self) -> datetime:
+        return self.starts_at + timedelta(seconds=self.count * self.step_seconds)
+
+
+def floor_minute(moment: datetime) -> datetime:
+    return moment.replace(second=0, microsecond=0)
+
+
+def is_quiet(moment: datetime, quiet_hours: tuple[int, int] | None) -> bool:
+    if not quiet_hours:
+        return False
+    start, end = quiet_hours
+    hour = moment.astimezone(MOSCOW_TZ).hour
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def plan_broadcasts(
+    broadcasts: list[Broadcast],
+    *,
+    now: datetime,
+    per_minute: int | None,
+    booked: dict[datetime, int] | None = None,
+) -> list[Slot]:
+    """
+    Give every recipient of the broadcasts a minute to be sent in. A minute holds at most
+    per_minute messages across all broadcasts and what is already booked (None: no limit).
+    A broadcast with a window is spread evenly over the open minutes of that window; without
+    one, or once its window is used up, it takes whatever capacity is left, in order.
+    Quiet hours are skipped.
+    """
+    used: dict[datetime, int] = dict(booked or {})
+    slots: list[Slot] = []
+    first_minute = floor_minute(now)
+    for broadcast in broadcasts:
+        if broadcast.quiet_hours and broadcast.quiet_hours[0] == broadcast.quiet_hours[1]:
+            raise ValueError("Quiet hours cannot cover the whole day")
+        window_minutes = math.ceil(broadcast.window / MINUTE) if broadcast.window else 0
+        open_minutes = sum(
+            not is_quiet(first_minute + i * MINUTE, broadcast.quiet_hours) for i in range(window_minutes)
+        )
+        # even share of one open minute of the window
+        share = math.ceil(broadcast.recipients / open_minutes) if open_minutes else None
+
+        remaining, first, index = broadcast.recipients, 1, 0
+        while remaining:
+            minute = first_minute + index * MINUTE
+            in_window = index < window_minutes
+            index += 1
+            if is_quiet(minute, broadcast.quiet_hours):
+                continue
+            free = remaining if per_minute is None else per_minute - used.get(minute, 0)
+            take = min(remaining, free, share if in_window and share else remaining)
+            if take <= 0:
+                continue
+            used[minute] = used.get(minute, 0) + take
+            step = 60 / take
+            last = slots[-1] if slots else None
+            if last and last.key == broadcast.key and last.step_seconds == step and last.ends_at == minute:
+                last.count += take
+            else:
+                slots.append(Slot(broadcast.key, first, take, minute, step))
+            first += take
+            remaining -= take
+    return slots
@@ -1,18 +1,45 @@
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy import select
-from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.core.database import async_session_maker
+from src.core.database import session_scope
 from src.dao.meeting import MeetingDAO
-from src.models.notification import Notification
-from src.models.meeting import Meeting, MeetingUser
+from src.dao.notification import NotificationDAO
+from src.models.meeting import Meeting
 from src.models.user import User
 
 
 FIRST_DELAY = timedelta(days=7)
 SECOND_DELAY = timedelta(days=14)
 
+STUDENT_FIRST_TEXT = (
+    "<b>Добро пожаловать!</b>\n"
+    "Заполни, пожалуйста, форму и подготовь вопросы для созвона через неделю.\n"
+    "Мы напомним ещё раз ближе к дате."
+)
+STUDENT_SECOND_TEXT = (
+    "<b>Время созвониться с ментором.</b>\n"
+    "Пора договориться о встрече и обсудить прогресс."
+)
+# (text, delay after registration) of the notifications every new user gets
+STUDENT_ONBOARDING = (
+    (STUDENT_FIRST_TEXT, FIRST_DELAY),
+    (STUDENT_SECOND_TEXT, SECOND_DELAY),
+)
+ONBOARDING_MEETING_DESCRIPTION = "Первый созвон с ментором (онбординг)"
+# %s: student name, username, meeting time in MSK; also filled by SQL format() in the user import
+MENTOR_NOTICE_TEXT = (
+    "<b>Новый ученик на онбординге.</b>\n"
+    "%s @%s\n"
+    "Созвон запланирован на: %s"
+)
+MENTOR_REMINDER_TEXT = (
+    "<b>Напоминание о созвоне с учеником.</b>\n"
+    "%s @%s\n"
+    "Время: %s"
+)
+
 
 def _reg_time(user: User) -> datetime:
     # fallback to now if registered_at is missing
@@ -27,79 +54,95 @@ def _format_msk(dt: datetime) -> str:
     return dt.astimezone(timezone(timedelta(hours=3))).strftime("%d.%m.%Y %H:%M MSK")
 
 
-async def schedule_onboarding_notifications(user: User, *, base_time: datetime | None = None) -> None:
+def mentor_onboarding_texts(name: str, username: str | None, meeting_time: datetime) -> tuple[str, str]:
+    """Texts of the immediate notice and the reminder sent to the mentor of a new student."""
+    args = (name, username or "", _format_msk(meeting_time))
+    return MENTOR_NOTICE_TEXT % args, MENTOR_REMINDER_TEXT % args
+
+
+async def schedule_onboarding_notifications(
+    user: User,
+    *,
+    base_time: datetime | None = None,
+    session: AsyncSession | None = None,
+) -> None:
     """Schedule two onboarding notifications for the student."""
     reg_time = base_time or _reg_time(user)
-    first_at = reg_time + FIRST_DELAY
-    second_at = reg_time + SECOND_DELAY
-
-    first_text = (
-        "<b>Добро пожаловать!</b>\n"
-        "Заполни, пожалуйста, форму и подготовь вопросы для созвона через неделю.\n"
-        "Мы напомним ещё раз ближе к дате."
+    await NotificationDAO.add_many(
+        [
+            {"user_id": user.telegram_id, "text": text, "scheduled_at": reg_time + delay}
+            for text, delay in STUDENT_ONBOARDING
+        ],
+        session=session,
     )
-    second_text = (
-        "<b>Время созвониться с ментором.</b>\n"
-        "Пора договориться о встрече и обсудить прогресс."
-    )
-
-    async with async_session_maker() as session:
-        session.add(Notification(user_id=user.telegram_id, text=first_text, scheduled_at=first_at))
-        session.add(Notification(user_id=user.telegram_id, text=second_text, scheduled_at=second_at))
-        await session.commit()
 
 
-async def schedule_onboarding_for_mentor(student: User, mentor_id: int) -> None:
+async def schedule_onboarding_for_mentor(
+    student: User,
+    mentor_id: int,
+    *,
+    session: AsyncSession | None = None,
+) -> None:
     """Notify mentor about the upcoming onboarding call for a greeting student."""
-    reg_time = _reg_time(student)
-    meeting_time = reg_time + SECOND_DELAY
-    when_text = _format_msk(meeting_time)
-
-    now_text = (
-        "<b>Новый ученик на онбординге.</b>\n"
-        f"{student.name} @{student.username or ''}\n"
-        f"Созвон запланирован на: {when_text}"
-    )
-    reminder_text = (
-        "<b>Напоминание о созвоне с учеником.</b>\n"
-        f"{student.name} @{student.username or ''}\n"
-        f"Время: {when_text}"
-    )
-
-    async with async_session_maker() as session:
-        session.add(Notification(user_id=mentor_id, text=now_text, scheduled_at=None))
-        session.add(Notification(user_id=mentor_id, text=reminder_text, scheduled_at=meeting_time))
-        await session.commit()
+    meeting_time = _reg_time(student) + SECOND_DELAY
+    now_text, reminder_text = mentor_onboarding_texts(student.name, student.username, meeting_time)
+
+    async with session_scope(session, commit=True) as s:
+        await NotificationDAO.add_many(
+            [
+                {"user_id": mentor_id, "text": now_text, "scheduled_at": None},
+                {"user_id": mentor_id, "text": reminder_text, "scheduled_at": meeting_time},
+            ],
+            session=s,
+        )
 
-    # Create an onboarding meeting if it does not exist yet
-    await _ensure_onboarding_meeting(student_id=student.telegram_id, mentor_id=mentor_id, scheduled_at=meeting_time)
+        # Create an onboarding meeting if it does not exist yet
+        await _ensure_onboarding_meeting(
+            student_id=student.telegram_id,
+            mentor_id=mentor_id,
+            scheduled_at=meeting_time,
+            session=s,
+        )
 
 
-async def _ensure_onboarding_meeting(student_id: int, mentor_id: int, scheduled_at: datetime) -> None:
+async def _ensure_onboarding_meeting(
+    student_id: int,
+    mentor_id: int,
+    scheduled_at: datetime,
+    *,
+    session: AsyncSession | None = None,
+) -> None:
     """Create an onboarding meeting for mentor+student if one does not already exist."""
-    MU1 = aliased(MeetingUser)
-    MU2 = aliased(MeetingUser)
-    async with async_session_maker() as session:
-        existing = await session.execute(
-            select(Meeting)
-            .join(MU1, MU1.meeting_id == Meeting.id)
-            .join(MU2, MU2.meeting_id == Meeting.id)
-            .where(MU1.user_id == student_id, MU2.user_id == mentor_id, Meeting.scheduled_at == scheduled_at)
+    async with session_scope(session) as s:
+        existing = await s.execute(
+            select(Meeting.id)
+            .where(
+                Meeting.student_id == student_id,
+                Meeting.mentor_id == mentor_id,
+                Meeting.scheduled_at == scheduled_at,
+            )
+            .limit(1)
         )
-        meeting = existing.scalar_one_or_none()
-    if meeting:
+        meeting_id = existing.scalar_one_or_none()
+    if meeting_id:
         return
 
     await MeetingDAO.create_with_participants(
-        description="Первый созвон с ментором (онбординг)",
+        description=ONBOARDING_MEETING_DESCRIPTION,
         meeting_link=None,
         scheduled_at=scheduled_at,
         mentor_id=mentor_id,
         student_id=student_id,
+        session=session,
     )
 
 
-async def notify_student_new_mentor(student: User, mentor: User) -> None:
+async def notify_student_new_mentor(
+    student: User,
+    mentor: User,
+    *,
+    session: AsyncSession | None = None,
+) -> None:
     """Create immediate notification to student about mentor assignment."""
     mentor_username = f"@{mentor.username}" if mentor.username else ""
     text = (
@@ -107,12 +150,9 @@ async def notify_student_new_mentor(student: User, mentor: User) -> None:
         f"{mentor.name} {mentor_username}\n"
         "Напишите ему и договоритесь о созвоне."
     )
-    async with async_session_maker() as session:
-        session.add(
-            Notification(
-                user_id=student.telegram_id,
-                text=text,
-                scheduled_at=None,
-            )
-        )
-        await session.commit()
+    await NotificationDAO.add(
+        user_id=student.telegram_id,
+        text=text,
+        scheduled_at=None,
+        session=session,
+    )
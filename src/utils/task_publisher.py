@@ -0,0 +1,147 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+from celery import Celery, Task
+
+from src.celery_app import celery_app
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING = 1000
+BATCH_SIZE = 50
+LATENCY_SAMPLES = 1000
+
+
+@dataclass
+class _Publish:
+    task: Task
+    args: tuple
+    kwargs: dict[str, Any]
+    eta: datetime | None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+@dataclass
+class PublisherStats:
+    published: int = 0
+    failed: int = 0
+    batches: int = 0
+    # seconds from enqueue() to the broker accepting the message
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    def snapshot(self, pending: int) -> dict[str, float]:
+        ordered = sorted(self.latencies)
+
+        def quantile(q: float) -> float:
+            if not ordered:
+                return 0.0
+            return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+        return {
+            "pending": pending,
+            "published": self.published,
+            "failed": self.failed,
+            "batches": self.batches,
+            "latency_p50_ms": round(quantile(0.5) * 1000, 3),
+            "latency_p99_ms": round(quantile(0.99) * 1000, 3),
+        }
+
+
+class TaskPublisher:
+    """
+    Celery enqueue for async code. kombu publishes with blocking socket I/O, so messages
+    go through a bounded queue to one publisher thread, which sends whatever has piled up
+    over a single producer connection. enqueue() only waits when the queue is full.
+    """
+
+    def __init__(self, app: Celery, *, max_pending: int = MAX_PENDING, batch_size: int = BATCH_SIZE):
+        self.app = app
+        self.batch_size = batch_size
+        self.stats = PublisherStats()
+        self._queue: queue.Queue[_Publish | None] = queue.Queue(maxsize=max_pending)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    async def enqueue(
+        self,
+        task: Task,
+        *,
+        args: tuple | list = (),
+        kwargs: dict[str, Any] | None = None,
+        eta: datetime | None = None,
+    ) -> None:
+        self._ensure_started()
+        item = _Publish(task, tuple(args), kwargs or {}, eta)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # backpressure without blocking the loop
+            await asyncio.to_thread(self._queue.put, item)
+
+    def snapshot(self) -> dict[str, float]:
+        return self.stats.snapshot(self._queue.qsize())
+
+    async def close(self, timeout: float = 10.0) -> None:
+        """Publish what is still queued and stop the thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        await asyncio.to_thread(self._queue.put, None)
+        await asyncio.to_thread(thread.join, timeout)
+        self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="task-publisher", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._publish(batch)
+            if stop:
+                return
+
+    def _publish(self, batch: list[_Publish]) -> None:
+        try:
+            with self.app.producer_or_acquire() as producer:
+                for item in batch:
+                    try:
+                        item.task.apply_async(args=item.args, kwargs=item.kwargs, eta=item.eta, producer=producer)
+                    except Exception:  # noqa: BLE001
+                        self.stats.failed += 1
+                        logger.exception("Failed to enqueue %s%s", item.task.name, item.args)
+                        continue
+                    self.stats.published += 1
+                    self.stats.latencies.append(time.perf_counter() - item.enqueued_at)
+        except Exception:  # noqa: BLE001
+            # the broker connection itself failed: nothing of the batch went out
+            self.stats.failed += len(batch)
+            logger.exception("Failed to enqueue a batch of %s tasks", len(batch))
+        self.stats.batches += 1
+
+
+task_publisher = TaskPublisher(celery_app)
@@ -0,0 +1,86 @@
+from typing import Callable, Protocol
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.types import InlineKeyboardMarkup
+
+from src.core.config import settings
+
+
+class Transport(Protocol):
+    """Delivers one message to one chat; raises aiogram's Telegram* errors on failure."""
+
+    async def send_message(self, chat_id: int, text: str) -> None: ...
+
+    async def edit_message_text(
+        self, chat_id: int, message_id: int, text: str, reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class TelegramTransport:
+    """Bot API over HTTP; `api_url` points it at a local Bot API server or the fake one."""
+
+    def __init__(self, token: str | None = None, api_url: str | None = None):
+        session = AiohttpSession(api=TelegramAPIServer.from_base(api_url)) if api_url else None
+        self.bot = Bot(
+            token or settings.BOT_TOKEN,
+            session=session,
+            default=DefaultBotProperties(parse_mode="HTML"),
+        )
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        await self.bot.send_message(chat_id, text)
+
+    async def edit_message_text(
+        self, chat_id: int, message_id: int, text: str, reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> None:
+        await self.bot.edit_message_text(text=text, chat_id=chat_id, message_id=message_id, reply_markup=reply_markup)
+
+    async def close(self) -> None:
+        await self.bot.session.close()
+
+
+class RecordingTransport:
+    """Keeps messages in memory; `errors` maps chat_id -> exception to raise for that chat."""
+
+    def __init__(self, errors: dict[int, Exception] | None = None):
+        self.sent: list[tuple[int, str]] = []
+        self.edited: list[tuple[int, int, str]] = []
+        self.errors = errors or {}
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        error = self.errors.get(chat_id)
+        if error is not None:
+            raise error
+        self.sent.append((chat_id, text))
+
+    async def edit_message_text(
+        self, chat_id: int, message_id: int, text: str, reply_markup: InlineKeyboardMarkup | None = None,
+    ) -> None:
+        self.edited.append((chat_id, message_id, text))
+
+    async def close(self) -> None:
+        pass
+
+
+def _default_transport() -> Transport:
+    if settings.NOTIFY_TRANSPORT == "recording":
+        return RecordingTransport()
+    return TelegramTransport(api_url=settings.TELEGRAM_API_URL)
+
+
+transport_factory: Callable[[], Transport] = _default_transport
+
+
+def build_transport() -> Transport:
+    return transport_factory()
+
+
+def set_transport_factory(factory: Callable[[], Transport] | None) -> None:
+    """Swap the transport used by senders (benchmarks, tests); None restores the default."""
+    global transport_factory
+    transport_factory = factory or _default_transport
@@ -1,6 +1,27 @@
+import os
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+# settings are read at import time; the tests never reach these services
+os.environ.setdefault("BOT_TOKEN", "123456:test-token")
+os.environ.setdefault("DB_NAME", "test")
+os.environ.setdefault("DB_USER", "test")
+os.environ.setdefault("DB_PASS", "test")
+os.environ.setdefault("DB_HOST", "localhost")
+os.environ.setdefault("DB_PORT", "5432")
+os.environ.setdefault("REDIS_HOST", "localhost")
+os.environ.setdefault("REDIS_PORT", "6379")
+
+# exceeded query budgets fail the tests instead of logging
+os.environ.setdefault("QUERY_BUDGET_STRICT", "true")
+
+
+@pytest.fixture
+def anyio_backend() -> str:
+    return "asyncio"
@@ -0,0 +1,118 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.core import dao
+from src.core.dao import BaseDAO
+from src.models.meeting import MeetingUser
+from src.models.notification import Notification, NotificationPayload
+
+
+class _Scalars:
+    def all(self) -> list:
+        return []
+
+
+class _Result:
+    def scalars(self) -> _Scalars:
+        return _Scalars()
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    async def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+        return _Result()
+
+    def sql(self, index: int) -> str:
+        return str(self.calls[index][0].compile(dialect=postgresql.dialect()))
+
+
+class _NotificationDAO(BaseDAO):
+    model = Notification
+
+
+class _PayloadDAO(BaseDAO):
+    model = NotificationPayload
+
+
+class _MeetingUserDAO(BaseDAO):
+    model = MeetingUser
+
+
+@pytest.mark.anyio
+async def test_add_many_runs_one_executemany_per_chunk() -> None:
+    session = _Session()
+    rows = [{"user_id": user_id, "text": "hi"} for user_id in range(5)]
+
+    await _NotificationDAO.add_many(rows, chunk_size=2, session=session)
+
+    assert [len(params) for _, params in session.calls] == [2, 2, 1]
+    assert session.sql(0).startswith("INSERT INTO notifications")
+    assert await _NotificationDAO.add_many([], session=session) == []
+    assert len(session.calls) == 3
+
+
+@pytest.mark.anyio
+async def test_update_many_reselects_updated_rows_by_primary_key() -> None:
+    session = _Session()
+    rows = [{"id": notification_id, "attempts": 1} for notification_id in range(3)]
+
+    await _NotificationDAO.update_many(rows, returning=True, chunk_size=2, session=session)
+
+    assert [params for _, params in session.calls[:2]] == [rows[:2], rows[2:]]
+    select_sql = session.sql(2)
+    assert select_sql.startswith("SELECT notifications.id")
+    assert "WHERE notifications.id IN" in select_sql
+    assert len(session.calls) == 4
+
+
+@pytest.mark.anyio
+async def test_update_many_reselects_composite_keys_as_tuples() -> None:
+    session = _Session()
+
+    await _MeetingUserDAO.update_many([{"meeting_id": 1, "user_id": 2}], returning=True, session=session)
+
+    assert "WHERE (meeting_users.meeting_id, meeting_users.user_id) IN" in session.sql(1)
+
+
+@pytest.mark.anyio
+async def test_upsert_caps_chunks_by_bind_parameters(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(dao, "MAX_BIND_PARAMS", 4)
+    session = _Session()
+    rows = [{"content_hash": str(number), "text": f"text {number}"} for number in range(5)]
+
+    await _PayloadDAO.upsert(rows, conflict_cols=["content_hash"], session=session)
+
+    # two columns per row: no statement may carry more than four parameters
+    assert len(session.calls) == 3
+    sql = session.sql(0)
+    assert "ON CONFLICT (content_hash) DO UPDATE SET text = excluded.text" in sql
+
+
+@pytest.mark.anyio
+async def test_upsert_without_update_columns_does_nothing_on_conflict() -> None:
+    session = _Session()
+
+    await _PayloadDAO.upsert(
+        [{"content_hash": "a", "text": "a"}], conflict_cols=["content_hash"], update_cols=[], session=session,
+    )
+
+    assert session.sql(0).endswith("ON CONFLICT (content_hash) DO NOTHING")
+
+
+@pytest.mark.anyio
+async def test_upsert_keeps_the_last_row_of_a_repeated_key() -> None:
+    session = _Session()
+    rows = [
+        {"content_hash": "a", "text": "first"},
+        {"content_hash": "b", "text": "other"},
+        {"content_hash": "a", "text": "last"},
+    ]
+
+    await _PayloadDAO.upsert(rows, conflict_cols=["content_hash"], session=session)
+
+    (statement, _), = session.calls
+    params = statement.compile(dialect=postgresql.dialect()).params
+    assert sorted(value for key, value in params.items() if key.startswith("text")) == ["last", "other"]
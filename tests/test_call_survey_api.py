@@ -1,4 +1,3 @@
-import os
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any
@@ -7,18 +6,9 @@ import httpx
 import pytest
 from sqlalchemy.exc import SQLAlchemyError
 
-os.environ.setdefault("BOT_TOKEN", "test-token")
-os.environ.setdefault("DB_NAME", "test")
-os.environ.setdefault("DB_USER", "test")
-os.environ.setdefault("DB_PASS", "test")
-os.environ.setdefault("DB_HOST", "localhost")
-os.environ.setdefault("DB_PORT", "5432")
-os.environ.setdefault("REDIS_HOST", "localhost")
-os.environ.setdefault("REDIS_PORT", "6379")
-
 from src.api.dependencies import get_survey_service
 from src.api.main import app
-from src.api.schemas.survey import SurveyQuestion, SurveyQuestionOption, SurveyStatus, SurveySubmitRequest
+from src.api.schemas.survey import MAX_BATCH_CALL_IDS, SurveyQuestion, SurveyQuestionOption, SurveyStatus, SurveySubmitRequest
 from src.services.survey import CallNotFoundError, SurveyNotAvailableError
 
 
@@ -90,7 +80,7 @@ class FakeSurveyService:
             ),
         ]
 
-    async def get_survey_state(self, call_id: int) -> tuple[SurveyStatus, FakeSurveyResponse | None]:
+    async def get_survey_state(self, call_id: int, session=None) -> tuple[SurveyStatus, FakeSurveyResponse | None]:
         if call_id not in self.calls:
             raise CallNotFoundError
 
@@ -99,11 +89,19 @@ class FakeSurveyService:
 
         return self.calls[call_id], None
 
+    async def get_survey_statuses(self, call_ids: list[int], session=None) -> dict[int, SurveyStatus]:
+        return {
+            call_id: SurveyStatus.completed if call_id in self.responses else self.calls[call_id]
+            for call_id in call_ids
+            if call_id in self.calls
+        }
+
     async def submit_survey(
         self,
         *,
         call_id: int,
         payload: SurveySubmitRequest,
+        session=None,
     ) -> tuple[FakeSurveyResponse, bool]:
         if call_id not in self.calls:
             raise CallNotFoundError
@@ -140,11 +138,6 @@ def fake_service() -> FakeSurveyService:
     app.dependency_overrides.clear()
 
 
-@pytest.fixture
-def anyio_backend() -> str:
-    return "asyncio"
-
-
 def _payload(**overrides: Any) -> dict[str, Any]:
     payload = {
         "duration_option": "45_60",
@@ -235,6 +228,41 @@ async def test_call_id_out_of_range_returns_422(fake_service: FakeSurveyService)
     assert post_response.status_code == 422
 
 
+@pytest.mark.anyio
+async def test_batch_survey_status_returns_compact_map(fake_service: FakeSurveyService) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+        submit = await test_client.post("/calls/101/survey", json=_payload())
+        assert submit.status_code == 200
+
+        response = await test_client.post(
+            "/calls/survey-status:batch",
+            json={"call_ids": [101, 202, 303, 404, 101]},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "statuses": {"101": "completed", "202": "available", "303": "not_available"},
+        "not_found": [404],
+    }
+
+
+@pytest.mark.anyio
+async def test_batch_survey_status_validates_size(fake_service: FakeSurveyService) -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+        empty = await test_client.post("/calls/survey-status:batch", json={"call_ids": []})
+        too_many = await test_client.post(
+            "/calls/survey-status:batch",
+            json={"call_ids": list(range(1, MAX_BATCH_CALL_IDS + 2))},
+        )
+        out_of_range = await test_client.post("/calls/survey-status:batch", json={"call_ids": [0]})
+
+    assert empty.status_code == 422
+    assert too_many.status_code == 422
+    assert out_of_range.status_code == 422
+
+
 @pytest.mark.anyio
 async def test_sqlalchemy_error_mapped_to_503() -> None:
     class FailingSurveyService:
@@ -242,7 +270,7 @@ async def test_sqlalchemy_error_mapped_to_503() -> None:
         def build_questions() -> list[SurveyQuestion]:
             return []
 
-        async def get_survey_state(self, call_id: int) -> tuple[SurveyStatus, None]:
+        async def get_survey_state(self, call_id: int, session=None) -> tuple[SurveyStatus, None]:
             raise SQLAlchemyError("db unavailable")
 
         async def submit_survey(
@@ -250,6 +278,7 @@ async def test_sqlalchemy_error_mapped_to_503() -> None:
             *,
             call_id: int,
             payload: SurveySubmitRequest,
+            session=None,
         ) -> tuple[FakeSurveyResponse, bool]:
             raise SQLAlchemyError("db unavailable")
 
@@ -278,7 +307,7 @@ async def test_asyncpg_error_mapped_to_503() -> None:
         def build_questions() -> list[SurveyQuestion]:
             return []
 
-        async def get_survey_state(self, call_id: int) -> tuple[SurveyStatus, None]:
+        async def get_survey_state(self, call_id: int, session=None) -> tuple[SurveyStatus, None]:
             raise asyncpg.exceptions.InvalidCatalogNameError("database does not exist")
 
         async def submit_survey(
@@ -286,6 +315,7 @@ async def test_asyncpg_error_mapped_to_503() -> None:
             *,
             call_id: int,
             payload: SurveySubmitRequest,
+            session=None,
         ) -> tuple[FakeSurveyResponse, bool]:
             raise asyncpg.exceptions.InvalidCatalogNameError("database does not exist")
 
@@ -0,0 +1,77 @@
+import pytest
+from aiogram import F, Router
+from aiogram.filters import StateFilter
+from aiogram.filters.callback_data import CallbackData
+
+from src.bot.filters.callback_route import CallbackRouteIndex
+from src.models.user import Role
+from src.utils import auth
+
+
+class PageCB(CallbackData, prefix="page"):
+    page: int
+
+
+class DoneCB(CallbackData, prefix="done"):
+    pass
+
+
+async def _noop(*args, **kwargs) -> None:
+    pass
+
+
+def _routers() -> tuple[Router, Router, Router]:
+    menu = Router(name="menu")
+    menu.callback_query.register(_noop, F.data == "back_to_menu")
+
+    paged = Router(name="paged")
+    nested = Router(name="paged-nested")
+    nested.callback_query.register(_noop, StateFilter("*"), PageCB.filter())
+    nested.callback_query.register(_noop, DoneCB.filter())
+    paged.include_router(nested)
+
+    fallback = Router(name="fallback")
+    fallback.callback_query.register(_noop, StateFilter("*"))
+    return menu, paged, fallback
+
+
+def test_callbacks_are_routed_by_static_data_and_prefix() -> None:
+    menu, paged, fallback = _routers()
+    index = CallbackRouteIndex()
+    index.build([menu, paged, fallback])
+
+    assert index.owns(menu, "back_to_menu")
+    assert not index.owns(paged, "back_to_menu")
+    assert index.owns(paged, PageCB(page=2).pack())
+    assert index.owns(paged, DoneCB().pack())
+    assert not index.owns(menu, PageCB(page=2).pack())
+    assert not index.owns(menu, None)
+    # a handler without a data filter can take anything
+    assert index.owns(fallback, "whatever")
+
+
+def test_routers_outside_the_index_are_not_gated() -> None:
+    assert CallbackRouteIndex().owns(Router(), "anything")
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.info: dict = {}
+
+
+@pytest.mark.anyio
+async def test_role_is_looked_up_once_per_session(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = []
+
+    async def get_role(telegram_id: int, *, session=None):
+        calls.append(telegram_id)
+        return Role.admin
+
+    monkeypatch.setattr(auth.UserDAO, "get_role", get_role)
+    session = _Session()
+
+    assert await auth.get_user_role(1, session) is Role.admin
+    assert await auth.get_user_role(1, session) is Role.admin
+    assert await auth.get_user_role(1, _Session()) is Role.admin
+
+    assert calls == [1, 1]
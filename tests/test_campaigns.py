@@ -0,0 +1,241 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.bot.keyboards.mailings import campaign_progress_keyboard
+from src.dao import campaign as campaign_dao
+from src.dao.campaign import CampaignDAO
+from src.models.campaign import Campaign, CampaignStatus
+from src.services import campaign as campaign_service
+from src.services.campaign import CampaignCounters, refresh_progress, render_progress, tally
+from src.tasks import campaign as campaign_task
+from src.utils.transport import RecordingTransport
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+
+class _Pipeline:
+    def __init__(self, redis: "_Redis") -> None:
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self) -> "_Pipeline":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        pass
+
+    def hset(self, key, mapping):
+        self.calls.append(lambda: self.redis.hashes.setdefault(key, {}).update(
+            {name: str(value) for name, value in mapping.items()}
+        ))
+
+    def hincrby(self, key, name, amount):
+        def run():
+            values = self.redis.hashes.setdefault(key, {})
+            values[name] = str(int(values.get(name, 0)) + amount)
+        self.calls.append(run)
+
+    def hgetall(self, key):
+        self.calls.append(lambda: dict(self.redis.hashes.get(key, {})))
+
+    def expire(self, key, seconds):
+        self.calls.append(lambda: True)
+
+    async def execute(self) -> list:
+        return [call() for call in self.calls]
+
+
+class _Redis:
+    """The hash commands CampaignCounters pipelines, kept in a dict."""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, str]] = {}
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+
+class _Result:
+    def __init__(self, row, rows) -> None:
+        self.row = row
+        self.rows = rows
+
+    def one(self):
+        return self.row
+
+    def all(self) -> list:
+        return self.rows
+
+
+class _Session:
+    def __init__(self, row=None) -> None:
+        self.row = row
+        self.rows: list = []
+        self.sql: list[str] = []
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.sql.append(str(statement.compile(dialect=postgresql.dialect())))
+        return _Result(self.row, self.rows)
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+def _campaign(campaign_id: int, **counts) -> Campaign:
+    values = {"queued": 0, "sent": 0, "failed": 0, "blocked": 0, "dropped": 0, **counts}
+    return Campaign(
+        id=campaign_id,
+        name=f"Campaign {campaign_id}",
+        text="Hello",
+        status=CampaignStatus.running,
+        recipients=10,
+        progress_chat_id=1,
+        progress_message_id=100 + campaign_id,
+        **values,
+    )
+
+
+def test_tally_counts_each_outcome_against_its_campaign() -> None:
+    campaign_of = {1: 10, 2: 10, 3: 20, 4: 20}
+
+    deltas = tally(campaign_of, sent=[1, 3, 99], failed=[2], blocked=[4])
+
+    assert deltas == {
+        10: {"queued": -2, "sent": 1, "failed": 1, "blocked": 0, "dropped": 0},
+        20: {"queued": -2, "sent": 1, "failed": 0, "blocked": 1, "dropped": 0},
+    }
+
+
+@pytest.mark.anyio
+async def test_counters_round_trip() -> None:
+    counters = CampaignCounters(_Redis())
+
+    await counters.start(5, 10)
+    await counters.add({5: {"queued": -3, "sent": 2, "blocked": 1}})
+
+    assert await counters.read([5, 6]) == {5: {"queued": 7, "sent": 2, "failed": 0, "blocked": 1, "dropped": 0}}
+
+
+@pytest.mark.anyio
+async def test_cancel_drops_queued_rows_in_one_statement(monkeypatch: pytest.MonkeyPatch) -> None:
+    collected = []
+
+    async def delete_unreferenced(ids, *, session=None):
+        collected.extend(ids)
+        return 1
+
+    monkeypatch.setattr(campaign_dao.NotificationPayloadDAO, "delete_unreferenced", delete_unreferenced)
+    session = _Session(row=(1, 5, 3))
+
+    assert await CampaignDAO.cancel(7, now=NOW, session=session) == 5
+
+    (sql,) = session.sql
+    assert sql.startswith("WITH cancelled_campaign AS \n(UPDATE campaigns SET status=")
+    # rows a sender holds are skipped, not waited for
+    assert "DELETE FROM notifications WHERE notifications.id IN (SELECT notifications.id" in sql
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert collected == [3]
+
+
+@pytest.mark.anyio
+async def test_cancel_of_an_ended_campaign_is_a_no_op() -> None:
+    assert await CampaignDAO.cancel(7, now=NOW, session=_Session(row=(0, 0, None))) is None
+
+
+def test_progress_shows_counts_and_escapes_the_name() -> None:
+    campaign = _campaign(1, queued=4, sent=5, blocked=1)
+    campaign.name = "<b>Launch</b>"
+
+    text = render_progress(campaign, {"queued": 4, "sent": 5, "failed": 0, "blocked": 1, "dropped": 0})
+
+    assert text.splitlines()[:2] == ["📣 <b>&lt;b&gt;Launch&lt;/b&gt;</b>", "Статус: идёт (60%)"]
+    assert "Отменено" not in text
+
+
+@pytest.mark.anyio
+async def test_refresh_saves_counters_closes_drained_campaigns_and_edits_changed_messages(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    moving = _campaign(1, queued=10)
+    drained = _campaign(2, queued=3)
+    drained.recipients = 3
+    idle = _campaign(3, queued=10)
+    saved = {}
+
+    async def get_for_progress(*, now, settle, session=None):
+        return [(moving, True), (drained, False), (idle, True)]
+
+    async def get_final_counts(campaign_ids, *, session=None):
+        assert list(campaign_ids) == [2]
+        return {2: {"queued": 0, "sent": 2, "failed": 0, "blocked": 1}}
+
+    async def save_progress(counters, finished_ids, *, now, session=None):
+        saved.update(counters=counters, finished=list(finished_ids))
+
+    monkeypatch.setattr(campaign_service.CampaignDAO, "get_for_progress", get_for_progress)
+    monkeypatch.setattr(campaign_service.CampaignDAO, "get_final_counts", get_final_counts)
+    monkeypatch.setattr(campaign_service.CampaignDAO, "save_progress", save_progress)
+    counters = CampaignCounters(_Redis())
+    await counters.start(1, 10)
+    await counters.add({1: {"queued": -4, "sent": 4}})
+    # the sender committed the drained campaign's last batch but has not counted it yet
+    await counters.start(2, 3)
+    await counters.add({2: {"queued": -1, "sent": 1}})
+    transport = RecordingTransport()
+    session = _Session()
+
+    edited = await refresh_progress(
+        now=NOW, counters=counters, transport=transport, session=session, cancel_keyboard=campaign_progress_keyboard,
+    )
+
+    assert edited == 2
+    assert saved["finished"] == [2]
+    assert saved["counters"] == [
+        {"id": 1, "queued": 6, "sent": 4, "failed": 0, "blocked": 0, "dropped": 0},
+        {"id": 2, "queued": 0, "sent": 2, "failed": 0, "blocked": 1, "dropped": 0},
+    ]
+    assert session.commits == 1
+    assert [message_id for _, message_id, _ in transport.edited] == [101, 102]
+    assert "Статус: завершена (100%)" in transport.edited[1][2]
+
+
+@pytest.mark.anyio
+async def test_final_counts_come_from_dead_letters() -> None:
+    session = _Session()
+    session.rows = [(2, 7, 2, 1)]
+
+    final = await CampaignDAO.get_final_counts([2], session=session)
+
+    assert final == {2: {"queued": 0, "sent": 7, "failed": 2, "blocked": 1}}
+    (sql,) = session.sql
+    assert "FROM notification_dead_letters LEFT OUTER JOIN users" in sql
+    assert "campaigns.recipients - campaigns.dropped" in sql
+
+
+@pytest.mark.anyio
+async def test_idle_refresh_stops_after_one_probe(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _Clients:
+        transport = None
+        counters = CampaignCounters(_Redis())
+
+        @staticmethod
+        @asynccontextmanager
+        async def Session():
+            yield _Session()
+
+    async def has_in_progress(*, now, settle, session=None):
+        return False
+
+    def build_transport():
+        raise AssertionError("no transport is needed without a campaign in progress")
+
+    monkeypatch.setattr(campaign_task.CampaignDAO, "has_in_progress", has_in_progress)
+    monkeypatch.setattr(campaign_task, "build_transport", build_transport)
+
+    await campaign_task._refresh_campaign_progress(_Clients())
+
+    assert _Clients.transport is None
@@ -0,0 +1,19 @@
+from src.utils.coalesce import SEPARATOR, coalesce_messages
+
+
+def test_texts_for_one_chat_are_merged_in_order() -> None:
+    messages = coalesce_messages([(1, "<b>a</b>"), (2, "b"), (3, "c")])
+
+    assert messages == [(SEPARATOR.join(["<b>a</b>", "b", "c"]), [1, 2, 3])]
+
+
+def test_messages_respect_limit_and_never_split_a_text() -> None:
+    items = [(1, "x" * 6), (2, "y" * 6), (3, "z" * 20)]
+
+    messages = coalesce_messages(items, limit=14)
+
+    assert messages == [
+        ("x" * 6 + SEPARATOR + "y" * 6, [1, 2]),
+        ("z" * 20, [3]),
+    ]
+    assert all(len(text) <= 14 for text, ids in messages if len(ids) > 1)
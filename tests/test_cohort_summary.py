@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.dao.cohort import CohortDAO, CohortSummary
+
+
+class _Result:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+
+    def all(self) -> list[tuple]:
+        return self.rows
+
+
+class _Session:
+    def __init__(self, rows: list[tuple]) -> None:
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result(self.rows)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    CohortDAO.invalidate_summaries()
+    yield
+    CohortDAO.invalidate_summaries()
+
+
+@pytest.mark.anyio
+async def test_summaries_are_aggregated_in_one_query_and_cached() -> None:
+    session = _Session([(1, "A", 10, 4), (2, "B", 0, 0)])
+
+    first = await CohortDAO.get_summaries(session=session)
+    second = await CohortDAO.get_summaries(session=session)
+
+    assert first == [CohortSummary(1, "A", 10, 4), CohortSummary(2, "B", 0, 0)]
+    assert second is first
+    assert len(session.statements) == 1
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert "GROUP BY cohorts.id" in sql
+    assert "LEFT OUTER JOIN users" in sql
+    assert "FILTER (WHERE" in sql
+
+
+@pytest.mark.anyio
+async def test_invalidation_forces_a_fresh_query() -> None:
+    session = _Session([(1, "A", 1, 1)])
+
+    await CohortDAO.get_summaries(session=session)
+    CohortDAO.invalidate_summaries()
+    await CohortDAO.get_summaries(session=session)
+
+    assert len(session.statements) == 2
+
+
+@pytest.mark.anyio
+async def test_writes_drop_the_cache_only_when_they_commit() -> None:
+    await CohortDAO.get_summaries(session=_Session([(1, "A", 1, 1)]))
+    session = AsyncSession()
+
+    CohortDAO.invalidate_summaries_on_commit(session)
+    await session.rollback()
+    assert CohortDAO._summary_cache is not None
+
+    await session.commit()
+    assert CohortDAO._summary_cache is None
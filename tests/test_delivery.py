@@ -0,0 +1,38 @@
+from datetime import timedelta
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramNetworkError, TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from src.utils.delivery import Failure, classify_error, retry_delay, unreachable_reason
+
+METHOD = SendMessage(chat_id=1, text="hi")
+
+
+def test_blocked_and_missing_chats_are_unreachable() -> None:
+    blocked = TelegramForbiddenError(METHOD, "Forbidden: bot was blocked by the user")
+    missing = TelegramBadRequest(METHOD, "Bad Request: chat not found")
+
+    assert classify_error(blocked) is Failure.unreachable
+    assert classify_error(missing) is Failure.unreachable
+
+
+def test_bad_markup_is_dropped_and_transport_errors_are_retried() -> None:
+    bad_markup = TelegramBadRequest(METHOD, "Bad Request: can't parse entities")
+
+    assert classify_error(bad_markup) is Failure.drop
+    assert classify_error(TelegramNetworkError(METHOD, "timeout")) is Failure.retry
+    assert classify_error(TelegramRetryAfter(METHOD, "Flood control", retry_after=5)) is Failure.retry
+
+
+def test_retry_delay_doubles_up_to_cap() -> None:
+    delays = [retry_delay(attempt, base_seconds=60, max_seconds=300) for attempt in range(1, 6)]
+
+    assert delays == [timedelta(seconds=s) for s in (60, 120, 240, 300, 300)]
+
+
+def test_unreachable_reason_is_read_from_description() -> None:
+    blocked = TelegramForbiddenError(METHOD, "Forbidden: bot was blocked by the user")
+    deactivated = TelegramForbiddenError(METHOD, "Forbidden: user is deactivated")
+
+    assert unreachable_reason(blocked) == "blocked"
+    assert unreachable_reason(deactivated) == "deactivated"
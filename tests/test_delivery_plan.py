@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from src.utils.delivery_plan import Broadcast, floor_minute, is_quiet, plan_broadcasts
+
+# 12:00 Moscow time
+NOW = datetime(2026, 10, 19, 9, 0, 30, tzinfo=timezone.utc)
+MINUTE = timedelta(minutes=1)
+
+
+def _per_minute(slots, key=None) -> dict[datetime, int]:
+    load: dict[datetime, int] = {}
+    for slot in slots:
+        if key is not None and slot.key != key:
+            continue
+        for i in range(slot.count):
+            moment = floor_minute(slot.starts_at + timedelta(seconds=i * slot.step_seconds))
+            load[moment] = load.get(moment, 0) + 1
+    return load
+
+
+def test_broadcasts_share_the_per_minute_budget() -> None:
+    slots = plan_broadcasts(
+        [Broadcast(1, recipients=2500), Broadcast(2, recipients=1000)],
+        now=NOW,
+        per_minute=1500,
+    )
+
+    load = _per_minute(slots)
+    assert max(load.values()) == 1500
+    assert sum(load.values()) == 3500
+    # recipients are numbered without gaps within a broadcast
+    first = [slot for slot in slots if slot.key == 1]
+    assert [(slot.first, slot.count) for slot in first] == [(1, 1500), (1501, 1000)]
+    assert _per_minute(slots, key=2) == {floor_minute(NOW) + MINUTE: 500, floor_minute(NOW) + 2 * MINUTE: 500}
+
+
+def test_window_spreads_evenly_and_merges_minutes() -> None:
+    slots = plan_broadcasts([Broadcast(1, recipients=1200, window=timedelta(hours=2))], now=NOW, per_minute=1500)
+
+    assert len(slots) == 1
+    [slot] = slots
+    assert (slot.count, slot.step_seconds) == (1200, 6.0)
+    assert slot.ends_at == floor_minute(NOW) + 120 * MINUTE
+
+
+def test_booked_minutes_are_respected() -> None:
+    booked = {floor_minute(NOW): 1450}
+    slots = plan_broadcasts([Broadcast(1, recipients=100)], now=NOW, per_minute=1500, booked=booked)
+
+    assert _per_minute(slots) == {floor_minute(NOW): 50, floor_minute(NOW) + MINUTE: 50}
+
+
+def test_quiet_hours_are_skipped() -> None:
+    late = datetime(2026, 10, 19, 18, 58, tzinfo=timezone.utc)  # 21:58 Moscow time
+
+    # the two open minutes of the window take everything
+    slots = plan_broadcasts(
+        [Broadcast(1, recipients=300, window=timedelta(minutes=10), quiet_hours=(22, 9))],
+        now=late,
+        per_minute=None,
+    )
+    assert _per_minute(slots) == {late: 150, late + MINUTE: 150}
+
+    # over budget: what doesn't fit before 22:00 waits for 09:00
+    slots = plan_broadcasts([Broadcast(1, recipients=300, quiet_hours=(22, 9))], now=late, per_minute=100)
+    assert _per_minute(slots) == {
+        late: 100,
+        late + MINUTE: 100,
+        datetime(2026, 10, 20, 6, 0, tzinfo=timezone.utc): 100,
+    }
+
+
+def test_quiet_hours_wrap_midnight() -> None:
+    assert is_quiet(datetime(2026, 10, 19, 20, 0, tzinfo=timezone.utc), (22, 9))  # 23:00 MSK
+    assert is_quiet(datetime(2026, 10, 19, 5, 0, tzinfo=timezone.utc), (22, 9))   # 08:00 MSK
+    assert not is_quiet(datetime(2026, 10, 19, 6, 0, tzinfo=timezone.utc), (22, 9))
+    with pytest.raises(ValueError):
+        plan_broadcasts([Broadcast(1, recipients=1, quiet_hours=(5, 5))], now=NOW, per_minute=None)
@@ -0,0 +1,35 @@
+import httpx
+import pytest
+
+from src.api.main import app
+from src.core.config import settings
+
+
+@pytest.mark.anyio
+async def test_pool_stats_reports_configured_limits() -> None:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+        response = await test_client.get("/health/pool")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["size"] == settings.DB_POOL_SIZE
+    assert body["max_overflow"] == settings.DB_MAX_OVERFLOW
+    assert body["checked_out"] == 0
+
+
+@pytest.mark.anyio
+async def test_readiness_waits_for_warm_pool() -> None:
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as test_client:
+            live = await test_client.get("/health/live")
+            not_ready = await test_client.get("/health/ready")
+            app.state.db_ready = True
+            ready = await test_client.get("/health/ready")
+    finally:
+        app.state.db_ready = False
+
+    assert live.status_code == 200
+    assert not_ready.status_code == 503
+    assert ready.status_code == 200
@@ -0,0 +1,102 @@
+import logging
+
+import pytest
+from aiogram import Bot, Dispatcher, Router
+from aiogram.methods import SendMessage
+from aiogram.types import Chat, Message, Update, User
+from sqlalchemy import create_engine, text
+
+from src.bot.middlewares.metrics import (
+    TelegramApiMetricsMiddleware,
+    handler_seconds,
+    setup_metrics,
+    telegram_api_errors,
+    telegram_api_seconds,
+    update_db_queries,
+)
+from src.core.metrics import Counter, Histogram, Registry
+
+
+def test_exposition_format() -> None:
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requests.", ["path"]))
+    latency = registry.register(Histogram("latency_seconds", "Latency.", buckets=(0.1, 1.0)))
+    requests.inc(path='a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{path="a\\"b"} 1',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="1.0"} 2',
+        'latency_seconds_bucket{le="+Inf"} 3',
+        "latency_seconds_sum 5.55",
+        "latency_seconds_count 3",
+    ]
+    with pytest.raises(ValueError):
+        registry.register(Counter("requests_total", "Again."))
+
+
+@pytest.mark.anyio
+async def test_update_is_traced_with_its_queries(caplog: pytest.LogCaptureFixture) -> None:
+    engine = create_engine("sqlite://")
+    router = Router(name="metrics_test")
+
+    @router.message()
+    async def echo(message: Message) -> None:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+    bot = Bot("123456:test-token")
+    dp = Dispatcher()
+    setup_metrics(dp, bot, slow_seconds=0)
+    dp.include_router(router)
+
+    update = Update(
+        update_id=1,
+        message=Message(
+            message_id=1,
+            date=0,
+            chat=Chat(id=1, type="private"),
+            from_user=User(id=1, is_bot=False, first_name="x"),
+            text="hi",
+        ),
+    )
+    with caplog.at_level(logging.WARNING):
+        await dp.feed_update(bot, update)
+    await bot.session.close()
+
+    assert handler_seconds.count(router="metrics_test", handler=echo.__qualname__) == 1
+    assert update_db_queries.count(event_type="message") >= 1
+    [record] = [r for r in caplog.records if r.getMessage().startswith("Slow update 1")]
+    message = record.getMessage()
+    assert f"metrics_test:{echo.__qualname__}" in message
+    assert "in 3 queries" in message
+    assert "x2: SELECT 1" in message
+
+
+@pytest.mark.anyio
+async def test_telegram_api_calls_are_timed() -> None:
+    middleware = TelegramApiMetricsMiddleware()
+    method = SendMessage(chat_id=1, text="x")
+
+    async def ok(bot, method):
+        return "response"
+
+    async def fail(bot, method):
+        raise RuntimeError("network")
+
+    before = telegram_api_seconds.count(method="sendMessage")
+    assert await middleware(ok, None, method) == "response"
+    with pytest.raises(RuntimeError):
+        await middleware(fail, None, method)
+
+    assert telegram_api_seconds.count(method="sendMessage") == before + 2
+    assert telegram_api_errors.value(method="sendMessage") >= 1
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.celery_app import DEFAULT_QUEUE, PROGRESS_QUEUE, TRANSACTIONAL_QUEUE, celery_app
+from src.dao.notification import NotificationDAO
+from src.tasks import campaign, meeting, notification
+from src.tasks.notification import _Pacer
+
+
+class _Result:
+    rowcount = 1
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.sql: list[str] = []
+
+    async def execute(self, statement):
+        self.sql.append(str(statement.compile(dialect=postgresql.dialect())))
+        return _Result()
+
+
+def _queue(task) -> str:
+    return celery_app.amqp.router.route({}, task.name)["queue"].name
+
+
+def test_user_facing_tasks_are_routed_to_the_reserved_queue() -> None:
+    for task in (
+        meeting.notify_meeting_created,
+        meeting.notify_meeting_reminder,
+        meeting.complete_meeting,
+        notification.send_transactional_notifications,
+    ):
+        assert _queue(task) == TRANSACTIONAL_QUEUE
+
+    assert _queue(notification.tick_notifications) == DEFAULT_QUEUE
+    assert _queue(meeting.cleanup_stale_meetings) == DEFAULT_QUEUE
+    # neither a bulk send nor the transactional lane holds up the progress messages
+    assert _queue(campaign.refresh_campaign_progress) == PROGRESS_QUEUE
+
+
+@pytest.mark.anyio
+async def test_pacer_spaces_sends() -> None:
+    pacer = _Pacer(rate=50)
+    started = time.monotonic()
+    for _ in range(6):
+        await pacer.wait()
+
+    # the first send goes at once, the other five wait 20 ms each
+    assert time.monotonic() - started >= 0.09
+
+
+@pytest.mark.anyio
+async def test_dead_letters_keep_the_lane() -> None:
+    session = _Session()
+
+    await NotificationDAO.dead_letter([1], session=session)
+
+    move, _ = session.sql
+    assert "scheduled_at, priority, attempts" in move
+    assert "notifications.priority" in move
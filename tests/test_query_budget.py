@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.core.config import settings
+from src.core.query_stats import QueryBudgetExceeded, query_budget, track_queries
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE t (x integer)"))
+        yield connection
+
+
+def test_within_budget(conn) -> None:
+    with query_budget(2) as stats:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("INSERT INTO t VALUES (:x)"), [{"x": 1}, {"x": 2}])
+
+    assert stats.queries == 2
+
+
+def test_too_many_statements_fail(conn) -> None:
+    with pytest.raises(QueryBudgetExceeded, match="3 statements, budget 2"):
+        with query_budget(2, max_repeats=5, name="listing"):
+            for x in range(3):
+                conn.execute(text(f"SELECT {x}"))
+
+
+def test_repeated_statement_is_flagged(conn) -> None:
+    with pytest.raises(QueryBudgetExceeded, match="3x: SELECT x FROM t WHERE x = \\?"):
+        with query_budget(10):
+            for x in range(3):
+                conn.execute(text("SELECT x FROM t WHERE x = :x"), {"x": x})
+
+
+def test_outside_strict_mode_only_warns(conn, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", False)
+    with caplog.at_level(logging.WARNING):
+        with query_budget(0, name="lenient"):
+            conn.execute(text("SELECT 1"))
+
+    assert "Query budget of lenient exceeded: 1 statements, budget 0" in caplog.text
+
+
+@pytest.mark.anyio
+async def test_decorator_and_nested_tracking(conn) -> None:
+    @query_budget(1)
+    async def load() -> None:
+        conn.execute(text("SELECT 1"))
+
+    @query_budget(1)
+    async def load_twice() -> None:
+        conn.execute(text("SELECT 1"))
+        conn.execute(text("SELECT 2"))
+
+    with track_queries() as outer:
+        await load()
+        with pytest.raises(QueryBudgetExceeded, match="load_twice"):
+            await load_twice()
+
+    # the enclosing block still sees the statements of the budgeted calls
+    assert outer.queries == 3
@@ -0,0 +1,28 @@
+from sqlalchemy import create_engine, text
+
+from src.bench.runner import percentile, summarize
+from src.core.query_stats import track_queries
+
+
+def test_queries_are_counted_only_inside_the_block() -> None:
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with track_queries() as stats:
+            conn.execute(text("CREATE TABLE t (x integer)"))
+            conn.execute(text("INSERT INTO t VALUES (:x)"), [{"x": 1}, {"x": 2}])
+        conn.execute(text("SELECT 2"))
+
+    assert stats.queries == 2
+    assert stats.seconds >= 0
+
+
+def test_percentile_and_summary() -> None:
+    durations = [i / 1000 for i in range(1, 101)]
+
+    assert percentile(durations, 50) == 0.05
+    assert percentile(durations, 99) == 0.099
+    assert percentile([], 50) == 0.0
+
+    summary = summarize("x", [0.5, 0.5], queries=[3, 5], rows=[10, 10])
+    assert (summary["queries"], summary["rows"], summary["rows_per_sec"]) == (4, 20, 20.0)
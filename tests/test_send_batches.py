@@ -0,0 +1,218 @@
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest, TelegramNetworkError, TelegramRetryAfter
+
+from src.core.config import settings
+from src.tasks import notification as notification_task
+from src.tasks.notification import _hold_back_last_recipient, _send_batch, _SendStats
+from src.utils.delivery import retry_delay
+from src.utils.transport import RecordingTransport
+
+DueRow = namedtuple("DueRow", "id user_id")
+SendRow = namedtuple("SendRow", "id user_id text payload_id attempts state_rule_id campaign_id")
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+
+class _BrokenHtmlTransport(RecordingTransport):
+    """Telegram refuses any message that contains an unclosed tag."""
+
+    async def send_message(self, chat_id: int, text: str) -> None:
+        if "<b>" in text and "</b>" not in text:
+            raise TelegramBadRequest(None, "Bad Request: can't parse entities")
+        await super().send_message(chat_id, text)
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.executed = 0
+        self.commits = 0
+
+    async def execute(self, statement):
+        self.executed += 1
+
+    async def commit(self) -> None:
+        self.commits += 1
+
+
+@pytest.fixture
+def outcome(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """What _send_batch hands to the DAOs, instead of writing it."""
+    recorded: dict = {}
+
+    async def update_many(rows, *, session=None):
+        recorded["failed"] = list(rows)
+
+    async def dead_letter(ids, *, keep=False, session=None):
+        recorded["kept" if keep else "dead"] = list(ids)
+        return len(ids)
+
+    async def reschedule_state_rules(ids, *, now, session=None):
+        recorded.setdefault("rescheduled", []).extend(ids)
+        return len(ids)
+
+    async def no_rows(*args, **kwargs):
+        return {}
+
+    async def claim(ids, *, session=None):
+        return set(ids) - recorded.get("cancelled", set())
+
+    async def get_ended_ids(campaign_ids, *, session=None):
+        return set(campaign_ids) & recorded.get("ended", set())
+
+    monkeypatch.setattr(notification_task.CampaignDAO, "get_ended_ids", get_ended_ids)
+    monkeypatch.setattr(notification_task.NotificationDAO, "claim", claim)
+    monkeypatch.setattr(notification_task.NotificationDAO, "update_many", update_many)
+    monkeypatch.setattr(notification_task.NotificationDAO, "dead_letter", dead_letter)
+    monkeypatch.setattr(notification_task.NotificationDAO, "reschedule_state_rules", reschedule_state_rules)
+    monkeypatch.setattr(notification_task.NotificationPayloadDAO, "get_texts", no_rows)
+    monkeypatch.setattr(notification_task.NotificationPayloadDAO, "delete_unreferenced", no_rows)
+    return recorded
+
+
+def test_last_recipient_is_held_back_for_the_next_partition() -> None:
+    rows = [DueRow(1, 10), DueRow(2, 10), DueRow(3, 20), DueRow(4, 20)]
+
+    batch, pending = _hold_back_last_recipient(rows)
+
+    assert batch == rows[:2]
+    assert pending == rows[2:]
+
+
+def test_single_recipient_partition_is_held_back_entirely() -> None:
+    rows = [DueRow(1, 10), DueRow(2, 10)]
+
+    assert _hold_back_last_recipient(rows) == ([], rows)
+    assert _hold_back_last_recipient([]) == ([], [])
+
+
+@pytest.mark.anyio
+async def test_a_broken_part_of_a_merged_message_does_not_drop_the_others(outcome: dict) -> None:
+    rows = [
+        SendRow(1, 10, "Первое", None, 0, None, None),
+        SendRow(2, 10, "<b>Сломанное", None, 0, None, None),
+        SendRow(3, 10, "Третье", None, 0, None, None),
+    ]
+    transport = _BrokenHtmlTransport()
+    stats = _SendStats()
+
+    await _send_batch(
+        rows, now=NOW, transport=transport, session=_Session(), payloads={}, unreachable_seen=set(), stats=stats,
+    )
+
+    assert transport.sent == [(10, "Первое"), (10, "Третье")]
+    assert [row["id"] for row in outcome["failed"]] == [2]
+    assert outcome["failed"][0]["attempts"] == 1
+    assert outcome["dead"] == [2]
+    assert (stats.sent, stats.dead) == (2, 1)
+
+
+@pytest.mark.anyio
+async def test_transient_failure_is_retried_until_the_last_attempt(outcome: dict) -> None:
+    last = settings.NOTIFY_MAX_ATTEMPTS - 1
+    rows = [SendRow(1, 10, "Первое", None, 0, None, None), SendRow(2, 20, "Второе", None, last, None, None)]
+    error = TelegramNetworkError(None, "Connection reset")
+    stats = _SendStats()
+
+    await _send_batch(
+        rows,
+        now=NOW,
+        transport=RecordingTransport(errors={10: error, 20: error}),
+        session=_Session(),
+        payloads={},
+        unreachable_seen=set(),
+        stats=stats,
+    )
+
+    first, second = outcome["failed"]
+    assert first["attempts"] == 1
+    assert first["next_attempt_at"] == NOW + retry_delay(
+        1, base_seconds=settings.NOTIFY_RETRY_BASE_SECONDS, max_seconds=settings.NOTIFY_RETRY_MAX_SECONDS,
+    )
+    assert second["attempts"] == settings.NOTIFY_MAX_ATTEMPTS
+    assert outcome["dead"] == [2]
+    assert (stats.retrying, stats.dead) == (1, 1)
+
+
+@pytest.mark.anyio
+async def test_flood_control_postpones_without_charging_an_attempt(outcome: dict) -> None:
+    rows = [SendRow(1, 10, "Первое", None, 2, None, None), SendRow(2, 10, "Второе", None, 0, None, None)]
+    flood = TelegramRetryAfter(None, "Flood control", retry_after=30)
+    session = _Session()
+
+    await _send_batch(
+        rows,
+        now=NOW,
+        transport=RecordingTransport(errors={10: flood}),
+        session=session,
+        payloads={},
+        unreachable_seen=set(),
+        stats=_SendStats(),
+    )
+
+    assert [(row["id"], row["attempts"]) for row in outcome["failed"]] == [(1, 2), (2, 0)]
+    assert {row["next_attempt_at"] for row in outcome["failed"]} == {NOW + timedelta(seconds=30)}
+    assert outcome["dead"] == []
+    assert session.commits == 1
+
+
+@pytest.mark.anyio
+async def test_rows_cancelled_after_the_read_are_not_sent(outcome: dict) -> None:
+    rows = [SendRow(1, 10, "Первое", None, 0, None, None), SendRow(2, 20, "Рассылка", 5, 0, None, 7)]
+    outcome["cancelled"] = {2}
+    transport = RecordingTransport()
+    session = _Session()
+
+    await _send_batch(
+        rows, now=NOW, transport=transport, session=session, payloads={}, unreachable_seen=set(), stats=_SendStats(),
+    )
+
+    assert transport.sent == [(10, "Первое")]
+    assert session.commits == 1
+
+
+@pytest.mark.anyio
+async def test_state_rule_out_of_attempts_keeps_its_row_for_the_next_period(outcome: dict) -> None:
+    last = settings.NOTIFY_MAX_ATTEMPTS - 1
+    rows = [SendRow(1, 10, "Правило", None, last, 3, None), SendRow(2, 20, "<b>Правило", None, 0, 3, None)]
+    error = TelegramNetworkError(None, "Connection reset")
+    stats = _SendStats()
+
+    await _send_batch(
+        rows,
+        now=NOW,
+        transport=_BrokenHtmlTransport(errors={10: error}),
+        session=_Session(),
+        payloads={},
+        unreachable_seen=set(),
+        stats=stats,
+    )
+
+    # the outage costs one period; a message that can never be sent is still dropped
+    assert outcome["kept"] == [1]
+    assert outcome["rescheduled"] == [1]
+    assert outcome["dead"] == [2]
+    assert (stats.retrying, stats.dead) == (0, 2)
+
+
+@pytest.mark.anyio
+async def test_held_rows_of_a_campaign_cancelled_mid_batch_are_dropped(outcome: dict) -> None:
+    rows = [
+        SendRow(1, 10, "Напоминание", None, 0, None, None),
+        SendRow(2, 10, "Рассылка", None, 0, None, 7),
+        SendRow(3, 20, "Рассылка", None, 0, None, 7),
+    ]
+    outcome["ended"] = {7}
+    transport = RecordingTransport()
+    session = _Session()
+
+    await _send_batch(
+        rows, now=NOW, transport=transport, session=session, payloads={}, unreachable_seen=set(), stats=_SendStats(),
+    )
+
+    # the other notification of the chat still goes out, without the cancelled part
+    assert transport.sent == [(10, "Напоминание")]
+    assert session.executed == 1
+    assert session.commits == 1
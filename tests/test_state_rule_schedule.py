@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.dao import notification as notification_dao
+from src.dao.notification import NotificationDAO
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+
+class _Result:
+    rowcount = 3
+
+    def all(self) -> list[tuple]:
+        return [(7, "Keep going")]
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.sql: list[str] = []
+
+    async def execute(self, statement):
+        self.sql.append(str(statement.compile(dialect=postgresql.dialect())))
+        return _Result()
+
+
+@pytest.fixture(autouse=True)
+def _payloads(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def get_or_create_ids(texts, *, session=None):
+        return {text: 1 for text in texts}
+
+    monkeypatch.setattr(notification_dao.NotificationPayloadDAO, "get_or_create_ids", get_or_create_ids)
+
+
+@pytest.mark.anyio
+async def test_transition_cancels_pending_then_schedules_matching_rules() -> None:
+    session = _Session()
+
+    created = await NotificationDAO.schedule_state_rules(now=NOW, user_ids=[42], session=session)
+
+    assert created == 3
+    cancel, rules, schedule = session.sql
+    assert cancel.startswith("DELETE FROM notifications")
+    assert "state_rule_id IS NOT NULL" in cancel
+    assert rules.startswith("SELECT state_rules.id, state_rules.text")
+    assert schedule.startswith("INSERT INTO notifications (user_id, payload_id, state_rule_id, scheduled_at")
+    assert "state_rules.user_state = users.state" in schedule
+    assert "greatest(users.state_changed_at + make_interval(" in schedule
+
+
+@pytest.mark.anyio
+async def test_new_rules_do_not_cancel_anything() -> None:
+    session = _Session()
+
+    await NotificationDAO.schedule_state_rules(now=NOW, rule_ids=[7], session=session)
+
+    assert not any(sql.startswith("DELETE") for sql in session.sql)
+    assert await NotificationDAO.schedule_state_rules(now=NOW, user_ids=[], session=session) == 0
+
+
+@pytest.mark.anyio
+async def test_delivered_rows_move_to_the_next_period() -> None:
+    session = _Session()
+
+    await NotificationDAO.reschedule_state_rules([1, 2], now=NOW, session=session)
+
+    (sql,) = session.sql
+    assert sql.startswith("UPDATE notifications SET scheduled_at=")
+    assert "CASE state_rules.regularity" in sql
+    assert "attempts=" in sql
@@ -0,0 +1,91 @@
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+
+from src.utils.task_publisher import TaskPublisher
+
+
+class FakeApp:
+    def __init__(self) -> None:
+        self.producers = 0
+
+    @contextmanager
+    def producer_or_acquire(self):
+        self.producers += 1
+        yield f"producer-{self.producers}"
+
+
+class FakeTask:
+    name = "fake"
+
+    def __init__(self, release: threading.Event, fail_on: set[int] = frozenset()) -> None:
+        self.release = release
+        self.fail_on = fail_on
+        self.calls: list[tuple] = []
+
+    def apply_async(self, *, args, kwargs, eta, producer):
+        self.release.wait(5)
+        if args[0] in self.fail_on:
+            raise ConnectionError("broker down")
+        self.calls.append((args, eta, producer))
+
+
+@pytest.mark.anyio
+async def test_enqueue_does_not_wait_for_the_broker() -> None:
+    release = threading.Event()
+    task = FakeTask(release)
+    publisher = TaskPublisher(FakeApp(), batch_size=50)
+
+    started = time.perf_counter()
+    for i in range(10):
+        await publisher.enqueue(task, args=[i])
+    assert time.perf_counter() - started < 1
+    assert task.calls == []
+
+    release.set()
+    await publisher.close()
+    assert [call[0] for call in task.calls] == [(i,) for i in range(10)]
+    assert publisher.snapshot()["published"] == 10
+    assert publisher.snapshot()["pending"] == 0
+
+
+@pytest.mark.anyio
+async def test_queued_messages_share_a_producer() -> None:
+    release = threading.Event()
+    app = FakeApp()
+    task = FakeTask(release, fail_on={3})
+    publisher = TaskPublisher(app, batch_size=4)
+
+    for i in range(9):
+        await publisher.enqueue(task, args=[i])
+    release.set()
+    await publisher.close()
+
+    # the first message is picked up alone while the rest pile up behind it
+    producers = [call[2] for call in task.calls]
+    assert app.producers < 9
+    assert len(set(producers)) == app.producers
+    stats = publisher.snapshot()
+    assert stats["published"] == 8
+    assert stats["failed"] == 1
+    assert stats["latency_p99_ms"] >= stats["latency_p50_ms"] > 0
+
+
+@pytest.mark.anyio
+async def test_full_queue_applies_backpressure() -> None:
+    release = threading.Event()
+    task = FakeTask(release)
+    publisher = TaskPublisher(FakeApp(), max_pending=2, batch_size=1)
+
+    for i in range(2):
+        await publisher.enqueue(task, args=[i])
+    threading.Timer(0.2, release.set).start()
+    started = time.perf_counter()
+    for i in range(2, 6):
+        await publisher.enqueue(task, args=[i])
+    assert time.perf_counter() - started >= 0.1
+
+    await publisher.close()
+    assert publisher.snapshot()["published"] == 6
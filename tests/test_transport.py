@@ -0,0 +1,42 @@
+import pytest
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from aiohttp.test_utils import TestServer
+
+from src.scripts.fake_telegram import STATS_KEY, FakeTelegramConfig, build_app
+from src.utils.transport import RecordingTransport, TelegramTransport
+
+TOKEN = "123456:test-token"
+
+
+@pytest.mark.anyio
+async def test_telegram_transport_against_fake_server() -> None:
+    config = FakeTelegramConfig(latency_ms=0, jitter_ms=0, blocked_ids={2})
+    app = build_app(config)
+    async with TestServer(app) as server:
+        transport = TelegramTransport(token=TOKEN, api_url=str(server.make_url("")).rstrip("/"))
+        try:
+            await transport.send_message(1, "<b>hi</b>")
+            with pytest.raises(TelegramForbiddenError):
+                await transport.send_message(2, "hi")
+
+            config.retry_after_rate = 1.0
+            with pytest.raises(TelegramRetryAfter) as exc_info:
+                await transport.send_message(1, "hi")
+        finally:
+            await transport.close()
+
+    assert exc_info.value.retry_after == config.retry_after
+    stats = app[STATS_KEY]
+    assert (stats.sent, stats.blocked, stats.retry_after) == (1, 1, 1)
+
+
+@pytest.mark.anyio
+async def test_recording_transport_keeps_messages_and_raises_configured_errors() -> None:
+    error = RuntimeError("down")
+    transport = RecordingTransport(errors={2: error})
+
+    await transport.send_message(1, "a")
+    with pytest.raises(RuntimeError):
+        await transport.send_message(2, "b")
+
+    assert transport.sent == [(1, "a")]
@@ -0,0 +1,78 @@
+import pytest
+
+from src.services.user_import import (
+    STAGING_COLUMNS,
+    ImportResult,
+    UserImportError,
+    _schedule_onboarding,
+    iter_records,
+)
+from src.utils.onboarding import MENTOR_NOTICE_TEXT, STUDENT_ONBOARDING
+
+
+class _Result:
+    def __init__(self, count: int) -> None:
+        self.count = count
+
+    def scalar_one(self) -> int:
+        return self.count
+
+
+class _Session:
+    def __init__(self, *counts: int) -> None:
+        self.counts = list(counts)
+        self.calls: list[tuple[str, dict]] = []
+
+    async def execute(self, statement, params):
+        self.calls.append((str(statement), params))
+        return _Result(self.counts.pop(0))
+
+
+def test_csv_rows_become_staging_records(tmp_path) -> None:
+    path = tmp_path / "users.csv"
+    path.write_text(
+        "telegram_id,username,name,role,state,cohort,mentor\n"
+        "1,@mentor,Mentor,mentor,,,\n"
+        "2,student,,Студент,greeting,Spring,@mentor\n"
+        "3,other,Other,,,Spring,1\n",
+        encoding="utf-8",
+    )
+
+    records = list(iter_records(path))
+
+    assert all(len(record) == len(STAGING_COLUMNS) for record in records)
+    assert records[0] == (2, 1, "mentor", "Mentor", "mentor", None, None, None, None)
+    assert records[1] == (3, 2, "student", "student", "student", "greeting", "Spring", None, "mentor")
+    assert records[2] == (4, 3, "other", "Other", None, None, "Spring", 1, None)
+
+
+def test_jsonl_reports_line_of_invalid_row(tmp_path) -> None:
+    path = tmp_path / "users.jsonl"
+    path.write_text(
+        '{"telegram_id": 1, "username": "a"}\n'
+        '{"telegram_id": 2, "username": "b", "state": "unknown"}\n',
+        encoding="utf-8",
+    )
+
+    with pytest.raises(UserImportError) as exc_info:
+        list(iter_records(path))
+
+    assert exc_info.value.line == 2
+
+
+@pytest.mark.anyio
+async def test_onboarding_is_scheduled_with_two_statements() -> None:
+    session = _Session(6, 1)
+    result = ImportResult()
+
+    await _schedule_onboarding(session, [2, 3], result)
+
+    (notifications, notification_params), (meetings, meeting_params) = session.calls
+    assert "INSERT INTO notifications (user_id, text, scheduled_at)" in notifications
+    assert "JOIN import_users t ON t.telegram_id = u.telegram_id" in notifications
+    assert notification_params["ids"] == meeting_params["ids"] == [2, 3]
+    assert notification_params["texts"] == [text for text, _ in STUDENT_ONBOARDING]
+    # SQL format() fills the same %s placeholders as mentor_onboarding_texts()
+    assert notification_params["notice"] == MENTOR_NOTICE_TEXT
+    assert "INSERT INTO meeting_users (meeting_id, user_id)" in meetings
+    assert (result.notifications, result.meetings) == (6, 1)